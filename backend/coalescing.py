@@ -0,0 +1,93 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+
+import httpx
+
+class CapturedResponse:
+    """Raw upstream response read once so several callers can each get their own copy"""
+    __slots__ = ("status_code", "headers", "content")
+
+    def __init__(self, status_code: int, headers: httpx.Headers, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @classmethod
+    async def capture(cls, response: httpx.Response) -> "CapturedResponse":
+        try:
+            # Raw bytes keep the content-encoding header valid for every copy
+            content = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+        return cls(response.status_code, response.headers, content)
+
+    def build(self, request: httpx.Request) -> httpx.Response:
+        # A raw stream (rather than content=) leaves decoding to the client, exactly
+        # as for a response that came straight off the wire
+        return httpx.Response(self.status_code, headers=self.headers, stream=httpx.ByteStream(self.content), request=request)
+
+class SingleFlightGroup:
+    """Collapses concurrent calls that share a key into one execution.
+
+    The first caller for a key becomes the leader and starts the work; callers
+    arriving while it is in flight wait on the same task and share its result
+    (or exception). The work runs in its own task so a cancelled leader does not
+    fail the other waiters.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved even if every waiter went away
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable]):
+        task = self._in_flight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.create_task(work())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "inFlight": len(self._in_flight),
+            "leaderCalls": self.leaders,
+            "coalescedCalls": self.coalesced,
+        }
+
+class SingleFlightTransport(httpx.AsyncBaseTransport):
+    """httpx transport that shares one upstream call among identical concurrent GETs.
+
+    Requests are keyed by method, full URL and Authorization header, so two
+    agents never see each other's responses, plus the `generation` request
+    extension when a cache layer above sets one, so a call in flight across
+    an invalidation isn't shared with requests made after it.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, group: SingleFlightGroup):
+        self._transport = transport
+        self._group = group
+
+    async def _fetch(self, request: httpx.Request) -> CapturedResponse:
+        response = await self._transport.handle_async_request(request)
+        return await CapturedResponse.capture(response)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in ("GET", "HEAD"):
+            return await self._transport.handle_async_request(request)
+
+        key = (request.method, str(request.url), request.headers.get("authorization", ""), request.extensions.get("generation"))
+        shared = await self._group.do(key, lambda: self._fetch(request))
+        return shared.build(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -17,4 +17,69 @@ SHIP_COLORS = ["red", "blue", "green", "gold", "silver", "black", "white", "purp
 SHIP_DECALS = ["flames", "stars", "stripes", "dragon", "eagle", "skull", "lightning", "geometric"]
 
 # CORS configuration
-CORS_ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000"]
\ No newline at end of file
+CORS_ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000"]
+
+# Upstream HTTP client pool configuration (shared by every router)
+UPSTREAM_HTTP2 = os.getenv("UPSTREAM_HTTP2", "true").lower() in ("1", "true", "yes")
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "20"))
+UPSTREAM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30"))  # Seconds an idle connection is kept
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", "10"))  # Seconds for read/write/pool waits
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "5"))
+
+# Upstream rate limiting (SpaceTraders allows 2 requests per second by default)
+UPSTREAM_RATE_LIMIT_PER_SECOND = float(os.getenv("UPSTREAM_RATE_LIMIT_PER_SECOND", "2"))
+UPSTREAM_RATE_LIMIT_BURST = float(os.getenv("UPSTREAM_RATE_LIMIT_BURST", "2"))
+UPSTREAM_MAX_429_RETRIES = int(os.getenv("UPSTREAM_MAX_429_RETRIES", "3"))
+
+# Upstream response cache: per-resource TTLs in seconds, LRU size, optional SQLite tier
+CACHE_TTL_SYSTEMS = float(os.getenv("CACHE_TTL_SYSTEMS", "3600"))
+CACHE_TTL_WAYPOINTS = float(os.getenv("CACHE_TTL_WAYPOINTS", "3600"))
+CACHE_TTL_FACTIONS = float(os.getenv("CACHE_TTL_FACTIONS", "3600"))
+CACHE_TTL_SHIPS = float(os.getenv("CACHE_TTL_SHIPS", "10"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_DB = os.getenv("RESPONSE_CACHE_DB")  # e.g. "response_cache.sqlite3"; unset keeps the cache in memory only
+
+# Proxy and list endpoints send the upstream `data` bytes (or orjson-encoded store contents) as they are,
+# skipping response model validation; false validates and re-encodes them through the response models
+RESPONSE_PASSTHROUGH = os.getenv("RESPONSE_PASSTHROUGH", "true").lower() in ("1", "true", "yes")
+
+# Request tracing: TRACING_ENABLED traces every request, otherwise only those sending `X-Trace: 1`
+# (`X-Profile: 1` also samples the event loop's stack); the slowest recent ones are kept for /api/debug/traces
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() in ("1", "true", "yes")
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "50"))
+TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "250"))  # Always-on tracing keeps only requests at least this slow
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+
+# Cooldown scheduler: timer wheel resolution (actions fire up to one tick after a cooldown ends) and size
+SCHEDULER_TICK_SECONDS = float(os.getenv("SCHEDULER_TICK_SECONDS", "0.1"))
+SCHEDULER_WHEEL_SLOTS = int(os.getenv("SCHEDULER_WHEEL_SLOTS", "512"))
+
+# Surveys are dropped this many seconds before they expire, so a picked survey is still valid upstream
+SURVEY_EXPIRY_MARGIN = float(os.getenv("SURVEY_EXPIRY_MARGIN", "30"))
+
+# Market price history: polled from every known marketplace at most MARKET_POLL_RATE requests per second,
+# a round at most every MARKET_POLL_INTERVAL seconds; MARKET_HISTORY_PATH (e.g. "market_history.npz") keeps it across restarts
+MARKET_POLL_INTERVAL = float(os.getenv("MARKET_POLL_INTERVAL", "300"))
+MARKET_POLL_RATE = float(os.getenv("MARKET_POLL_RATE", "0.5"))
+MARKET_POLL_ON_STARTUP = os.getenv("MARKET_POLL_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+MARKET_HISTORY_PATH = os.getenv("MARKET_HISTORY_PATH")
+
+# Local galaxy copy filled by the paginated /systems crawler
+GALAXY_DB_PATH = os.getenv("GALAXY_DB_PATH", "galaxy.sqlite3")
+GALAXY_CRAWL_CONCURRENCY = int(os.getenv("GALAXY_CRAWL_CONCURRENCY", "4"))
+GALAXY_CRAWL_PAGE_LIMIT = int(os.getenv("GALAXY_CRAWL_PAGE_LIMIT", "20"))  # SpaceTraders caps page size at 20
+GALAXY_CRAWL_ON_STARTUP = os.getenv("GALAXY_CRAWL_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+GALAXY_CRAWL_WAYPOINTS = os.getenv("GALAXY_CRAWL_WAYPOINTS", "false").lower() in ("1", "true", "yes")
+
+# Fleet store: seconds between full re-reads of /my/ships
+FLEET_SYNC_INTERVAL = float(os.getenv("FLEET_SYNC_INTERVAL", "60"))
+
+# Demo mode's procedural galaxy (X1-DF55 and DEMO_SHIP_1 always come first); raise these to scale-test
+MOCK_GALAXY_SEED = int(os.getenv("MOCK_GALAXY_SEED", "1"))
+MOCK_GALAXY_SYSTEMS = int(os.getenv("MOCK_GALAXY_SYSTEMS", "3"))
+MOCK_GALAXY_WAYPOINTS_PER_SYSTEM = int(os.getenv("MOCK_GALAXY_WAYPOINTS_PER_SYSTEM", "12"))
+MOCK_GALAXY_SHIPS = int(os.getenv("MOCK_GALAXY_SHIPS", "1"))
+MOCK_GALAXY_MARKET_SHARE = float(os.getenv("MOCK_GALAXY_MARKET_SHARE", "0.2"))  # Fraction of waypoints with a marketplace
+MOCK_GALAXY_CREW = int(os.getenv("MOCK_GALAXY_CREW", "4"))  # Size of the hireable crew pool
+MOCK_GALAXY_CONTRACTS = int(os.getenv("MOCK_GALAXY_CONTRACTS", "3"))  # Contract offers, in the first few systems
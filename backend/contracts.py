@@ -0,0 +1,318 @@
+import math
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import httpx
+import numpy as np
+
+from .fleet_store import FleetStore
+from .galaxy_store import GalaxyStore
+from .market_history import MarketHistory
+from .rate_limiter import Lane
+from .route_planner import FLIGHT_MODES, RoutePlanner, best_hops, summarize_route
+from .trade_routes import FUEL_PER_UNIT
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds of an upstream ISO timestamp"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+def open_deliveries(contract: dict) -> List[dict]:
+    """A contract's delivery terms with units still to deliver"""
+    return [term for term in contract["terms"].get("deliver") or []
+            if term["unitsFulfilled"] < term["unitsRequired"]]
+
+class ContractStore:
+    """Server-side copy of the agent's contracts, by id.
+
+    Accept, deliver and fulfill responses carry the contract's new state and
+    are applied in place; a full read of `/my/contracts` picks up new offers.
+    """
+
+    def __init__(self, api_url: str, token: str, page_limit: int = 20):
+        self.api_url = api_url
+        self.token = token
+        self.page_limit = page_limit
+        self.contracts: Dict[str, dict] = {}
+        self.synced_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.contracts)
+
+    def get(self, contract_id: str) -> Optional[dict]:
+        return self.contracts.get(contract_id)
+
+    def all(self) -> List[dict]:
+        return list(self.contracts.values())
+
+    def open(self) -> List[dict]:
+        """Contracts not yet fulfilled, whose deadline (or offer) hasn't passed"""
+        now = time.time()
+        found = []
+        for contract in self.contracts.values():
+            if contract.get("fulfilled"):
+                continue
+            limit = contract["terms"].get("deadline") if contract.get("accepted") else \
+                contract.get("deadlineToAccept") or contract.get("expiration")
+            if (parse_time(limit) or math.inf) > now:
+                found.append(contract)
+        return found
+
+    def apply(self, contract: dict) -> dict:
+        """Store a contract read or returned by an action, keeping the held dict"""
+        held = self.contracts.get(contract["id"])
+        if held is None:
+            held = self.contracts[contract["id"]] = contract
+        elif held is not contract:
+            held.update(contract)
+        return held
+
+    def replace(self, contracts: Iterable[dict]) -> None:
+        """Take a full contract listing as the new state"""
+        contracts = list(contracts)
+        for contract in contracts:
+            self.apply(contract)
+        listed = {contract["id"] for contract in contracts}
+        for contract_id in [contract_id for contract_id in self.contracts if contract_id not in listed]:
+            del self.contracts[contract_id]
+        self.synced_at = time.time()
+
+    async def sync(self, client: httpx.AsyncClient) -> None:
+        """Read every page of `/my/contracts` and replace the held contracts with it"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        contracts, page = [], 1
+        while True:
+            response = await client.get(
+                f"{self.api_url}/my/contracts",
+                params={"page": page, "limit": self.page_limit},
+                headers=headers,
+                extensions={"cache": False, "lane": Lane.BACKGROUND},
+            )
+            response.raise_for_status()
+            body = response.json()
+            contracts.extend(body["data"])
+            if page * self.page_limit >= body.get("meta", {}).get("total", 0):
+                break
+            page += 1
+        self.replace(contracts)
+
+class ContractPlanner:
+    """Cheapest way to source every open delivery of a set of contracts.
+
+    A delivery is sourced by one hauling ship buying the good at one market
+    in the destination's system: the ship flies to the market, then shuttles
+    full holds to the destination and back until the units are delivered
+    (what it already carries counts towards them). Its cost is the goods at
+    the market's latest recorded price, the fuel burned at the system's
+    median FUEL price and the flight time at `time_value` credits an hour.
+    Hops are direct, in the fastest mode the tank allows, filling up at the
+    market each trip.
+
+    Every delivery in a system is costed against every ship and market at
+    once: one (ship × delivery × market) array per system, over all the
+    contracts asked about, so scoring the whole offer board is one batched
+    pass rather than a search per contract. Deliveries are sourced
+    independently, so two may pick the same ship.
+    """
+
+    def __init__(self, history: MarketHistory, galaxy: GalaxyStore, fleet: FleetStore, route_planner: RoutePlanner):
+        self.history = history
+        self.galaxy = galaxy
+        self.fleet = fleet
+        self.route_planner = route_planner
+        self._market_arrays: Dict[str, tuple] = {}
+
+    def plan(self, contracts: Sequence[dict], ship_symbols: Optional[Sequence[str]] = None,
+             time_value: float = 0.0, modes: Optional[Sequence[str]] = None) -> List[dict]:
+        """A sourcing plan per contract, most profitable first"""
+        modes = list(modes or FLIGHT_MODES)
+        ships = [self.fleet.get(symbol) for symbol in ship_symbols] if ship_symbols is not None else self.fleet.all()
+        ships = [ship for ship in ships if ship and ship["cargo"]["capacity"] > 0]
+        snapshot = self.history.snapshot()
+
+        # Open deliveries of every contract, grouped by the destination's system
+        by_system: Dict[str, List[dict]] = defaultdict(list)
+        plans = []
+        for contract in contracts:
+            deliveries = []
+            for term in open_deliveries(contract):
+                delivery = {
+                    "tradeSymbol": term["tradeSymbol"],
+                    "destinationSymbol": term["destinationSymbol"],
+                    "units": term["unitsRequired"] - term["unitsFulfilled"],
+                }
+                deliveries.append(delivery)
+                by_system[term["destinationSymbol"].rsplit("-", 1)[0]].append(delivery)
+            plans.append((contract, deliveries))
+        for system_symbol, deliveries in by_system.items():
+            self._source(system_symbol, deliveries, ships, snapshot, max(time_value, 0.0), modes)
+
+        return sorted((self._summarize(contract, deliveries) for contract, deliveries in plans),
+                      key=lambda plan: plan["profit"] if plan["feasible"] else -math.inf, reverse=True)
+
+    def _source(self, system_symbol: str, deliveries: List[dict], ships: List[dict], snapshot: dict,
+                time_value: float, modes: List[str]) -> None:
+        """Fill in the cheapest ship and market for each of a system's deliveries"""
+        destinations = [self.galaxy.get_waypoint(delivery["destinationSymbol"]) for delivery in deliveries]
+        ships = [ship for ship in ships if ship["nav"]["systemSymbol"] == system_symbol]
+        positions = [self.galaxy.get_waypoint(ship["nav"]["waypointSymbol"]) for ship in ships]
+        ships = [ship for ship, position in zip(ships, positions) if position is not None]
+        positions = [position for position in positions if position is not None]
+        symbols, mx, my = self._markets(system_symbol)
+        rows = self.history.market_index(symbols)
+        priced = rows >= 0
+        markets = [symbol for symbol, known in zip(symbols, priced) if known]
+        rows, mx, my = rows[priced], mx[priced], my[priced]
+        for delivery, destination in zip(deliveries, destinations):
+            delivery.update(shipSymbol=None, buyMarket=None)
+            if destination is None:
+                delivery["reason"] = "Destination waypoint is unknown"
+            elif not ships:
+                delivery["reason"] = f"No ship with a cargo hold in {system_symbol}"
+        if not ships or not any(destinations):
+            return
+
+        # Latest purchase price of each delivery's good at each market (deliveries × markets)
+        goods = snapshot["goods"]
+        price = np.full((len(deliveries), len(markets)), np.inf)
+        fuel_price = 0.0
+        if len(markets):
+            columns = np.array([goods.index(d["tradeSymbol"]) if d["tradeSymbol"] in goods else -1 for d in deliveries])
+            times = snapshot["time"][rows][:, columns]
+            purchase = snapshot["purchasePrice"][rows][:, columns]
+            price = np.where((times == times) & (purchase > 0) & (columns >= 0), purchase, np.inf).T
+            fuel_prices = snapshot["purchasePrice"][rows, goods.index("FUEL")] if "FUEL" in goods else np.zeros(0)
+            fuel_prices = fuel_prices[fuel_prices > 0]
+            fuel_price = float(np.median(fuel_prices)) / FUEL_PER_UNIT if len(fuel_prices) else 0.0
+
+        dx = np.array([d["x"] if d else np.nan for d in destinations], dtype=np.float64)
+        dy = np.array([d["y"] if d else np.nan for d in destinations], dtype=np.float64)
+        sx = np.array([p["x"] for p in positions], dtype=np.float64)
+        sy = np.array([p["y"] for p in positions], dtype=np.float64)
+        speed = np.array([ship["engine"].get("speed") or 30 for ship in ships], dtype=np.float64)
+        tank = np.array([(ship.get("fuel") or {}).get("capacity", 0) for ship in ships], dtype=np.float64)
+        fuel = np.array([(ship.get("fuel") or {}).get("current", 0) for ship in ships], dtype=np.float64)
+        hold = np.array([ship["cargo"]["capacity"] for ship in ships])
+        loaded = np.array([ship["cargo"]["units"] for ship in ships])
+        units = np.array([delivery["units"] for delivery in deliveries])
+        held = np.array([[sum(item["units"] for item in ship["cargo"]["inventory"] if item["symbol"] == d["tradeSymbol"])
+                          for d in deliveries] for ship in ships])
+
+        # Ships × markets: flying out to buy; ships × deliveries: delivering what's already aboard
+        approach_seconds, _, approach_fuel = best_hops(
+            np.hypot(sx[:, None] - mx, sy[:, None] - my), fuel[:, None], tank[:, None], speed[:, None], modes)
+        direct_seconds, _, direct_fuel = best_hops(
+            np.hypot(sx[:, None] - dx, sy[:, None] - dy), fuel[:, None], tank[:, None], speed[:, None], modes)
+        # Ships × deliveries × markets: the haul between market and destination on a full tank, costed
+        # once per distinct (tank, speed) profile since a fleet has far fewer profiles than ships
+        profiles, profile = np.unique(np.stack([tank, speed], axis=1), axis=0, return_inverse=True)
+        haul_seconds, _, haul_fuel = best_hops(
+            np.hypot(dx[:, None] - mx, dy[:, None] - my)[None], profiles[:, 0, None, None], profiles[:, 0, None, None],
+            profiles[:, 1, None, None], modes)
+        haul_seconds, haul_fuel = haul_seconds[profile.ravel()], haul_fuel[profile.ravel()]
+        to_buy = np.maximum(units - held, 0)
+        # Other goods aboard stay there, so each trip carries what the rest of the hold fits
+        room = hold[:, None] - loaded[:, None] + held
+        trips = np.where(room > 0, -(-to_buy // np.maximum(room, 1)), 0)
+        legs = np.maximum(2 * trips - 1, 0)[:, :, None]
+        seconds = approach_seconds[:, None, :] + legs * haul_seconds
+        burned = approach_fuel[:, None, :] + legs * haul_fuel
+        with np.errstate(invalid="ignore"):
+            cost = to_buy[:, :, None] * price[None] + burned * fuel_price + seconds * (time_value / 3600)
+            direct = direct_fuel * fuel_price + direct_seconds * (time_value / 3600)
+        # Ships already holding every unit go straight to the destination, whatever the market
+        aboard = (to_buy == 0)[:, :, None]
+        cost = np.where(aboard, direct[:, :, None], cost)
+        seconds = np.where(aboard, direct_seconds[:, :, None], seconds)
+        burned = np.where(aboard, direct_fuel[:, :, None], burned)
+        cost[~np.isfinite(seconds) | ((room <= 0) & (to_buy > 0))[:, :, None]] = np.inf
+
+        # Cheapest (ship, market) per delivery
+        flat = cost.transpose(1, 0, 2).reshape(len(deliveries), -1)
+        best = np.argmin(flat, axis=1) if flat.shape[1] else np.zeros(len(deliveries), dtype=np.int64)
+        for d, (delivery, index) in enumerate(zip(deliveries, best)):
+            if destinations[d] is None:
+                continue
+            if not flat.shape[1] or not np.isfinite(flat[d, index]):
+                delivery["reason"] = f"No known market in {system_symbol} sells {delivery['tradeSymbol']} within reach"
+                continue
+            s, m = divmod(int(index), len(markets))
+            buying = int(to_buy[s, d]) > 0
+            purchase_cost = int(to_buy[s, d] * price[d, m]) if buying else 0
+            hours = float(seconds[s, d, m]) / 3600
+            delivery.pop("reason", None)
+            delivery.update({
+                "shipSymbol": ships[s]["symbol"],
+                "unitsAboard": int(min(held[s, d], units[d])),
+                "unitsToBuy": int(to_buy[s, d]),
+                "buyMarket": markets[m] if buying else None,
+                "buyPrice": int(price[d, m]) if buying else None,
+                "trips": int(trips[s, d]) if buying else 1,
+                "fuel": int(burned[s, d, m]),
+                "durationSeconds": int(seconds[s, d, m]),
+                "purchaseCost": purchase_cost,
+                "fuelCost": round(float(burned[s, d, m]) * fuel_price),
+                "timeCost": round(hours * time_value),
+                "cost": round(float(cost[s, d, m])),
+            })
+
+    def _markets(self, system_symbol: str):
+        """Symbols and coordinates of a system's marketplaces, rebuilt when its MARKETPLACE index changes"""
+        index = self.galaxy.waypoint_index(system_symbol, "MARKETPLACE")
+        cached = self._market_arrays.get(system_symbol)
+        if cached is None or cached[0] != index.version:
+            markets = sorted((waypoint.data for waypoint in index.items()), key=lambda market: market["symbol"])
+            cached = self._market_arrays[system_symbol] = (
+                index.version,
+                [market["symbol"] for market in markets],
+                np.array([market["x"] for market in markets], dtype=np.float64),
+                np.array([market["y"] for market in markets], dtype=np.float64),
+            )
+        return cached[1:]
+
+    @staticmethod
+    def _summarize(contract: dict, deliveries: List[dict]) -> dict:
+        terms = contract["terms"]
+        payment = terms["payment"]["onFulfilled"] + (0 if contract.get("accepted") else terms["payment"]["onAccepted"])
+        feasible = all(delivery.get("shipSymbol") for delivery in deliveries)
+        cost = sum(delivery.get("cost", 0) for delivery in deliveries)
+        seconds = sum(delivery.get("durationSeconds", 0) for delivery in deliveries)
+        deadline = parse_time(terms.get("deadline"))
+        return {
+            "contractId": contract["id"],
+            "type": contract.get("type"),
+            "factionSymbol": contract.get("factionSymbol"),
+            "accepted": contract.get("accepted", False),
+            "deadline": terms.get("deadline"),
+            "payment": payment,
+            "cost": cost if feasible else None,
+            "profit": payment - cost if feasible else None,
+            "durationSeconds": seconds if feasible else None,
+            "profitPerHour": round((payment - cost) / (seconds / 3600)) if feasible and seconds > 0 else None,
+            "meetsDeadline": feasible and (deadline is None or time.time() + seconds <= deadline),
+            "feasible": feasible,
+            "deliveries": deliveries,
+        }
+
+    def routes(self, delivery: dict) -> dict:
+        """Waypoint-by-waypoint routes (refuelling at markets) for a planned delivery"""
+        ship = self.fleet.get(delivery["shipSymbol"])
+        position = self.galaxy.get_waypoint(ship["nav"]["waypointSymbol"])
+        destination = self.galaxy.get_waypoint(delivery["destinationSymbol"])
+        fuel = ship.get("fuel") or {}
+        capacity, speed = fuel.get("capacity", 0), ship["engine"].get("speed") or 30
+        legs = {}
+        if delivery.get("buyMarket"):
+            market = self.galaxy.get_waypoint(delivery["buyMarket"])
+            legs["toMarket"] = self._route(position, market, fuel.get("current", 0), capacity, speed)
+            legs["toDestination"] = self._route(market, destination, capacity, capacity, speed)
+        else:
+            legs["toDestination"] = self._route(position, destination, fuel.get("current", 0), capacity, speed)
+        return legs
+
+    def _route(self, origin: dict, destination: dict, fuel: int, capacity: int, speed: float) -> Optional[dict]:
+        hops = self.route_planner.plan(origin, destination, fuel, capacity, speed)
+        return summarize_route(hops) if hops is not None else None
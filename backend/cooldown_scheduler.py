@@ -0,0 +1,254 @@
+import asyncio
+import itertools
+import json
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Deque, Dict, Optional, Set
+
+from fastapi import HTTPException
+
+from .fleet_store import FleetStore
+from .timer_wheel import Timer, TimerWheel
+
+# (ship symbol, payload) -> the action's response body, raising HTTPException on failure
+Runner = Callable[[str, dict], Awaitable[dict]]
+
+def cooldown_deadline(cooldown: Optional[dict]) -> float:
+    """`time.monotonic()` at which a SpaceTraders cooldown object expires"""
+    now = time.monotonic()
+    if not cooldown:
+        return now
+    expiration = cooldown.get("expiration")
+    if expiration:
+        try:
+            expires = datetime.fromisoformat(expiration.replace("Z", "+00:00"))
+        except ValueError:
+            expires = None
+        if expires is not None:
+            if expires.tzinfo is None:
+                # Upstream timestamps are UTC; one sent without an offset is read as UTC too
+                expires = expires.replace(tzinfo=timezone.utc)
+            return now + (expires - datetime.now(timezone.utc)).total_seconds()
+    return now + (cooldown.get("remainingSeconds") or 0)
+
+def error_data(detail) -> dict:
+    """The `error.data` object of a SpaceTraders error body passed on as an HTTPException detail"""
+    try:
+        data = json.loads(detail)["error"]["data"]
+    except (TypeError, ValueError, KeyError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def error_code(detail) -> Optional[int]:
+    """The `error.code` of a SpaceTraders error body passed on as an HTTPException detail"""
+    try:
+        return json.loads(detail)["error"].get("code")
+    except (TypeError, ValueError, KeyError, AttributeError):
+        return None
+
+def _conflict_cooldown(detail) -> Optional[dict]:
+    """The cooldown carried by a SpaceTraders 409 cooldown-conflict error body, if that's what this is"""
+    return error_data(detail).get("cooldown")
+
+class ScheduledAction:
+    __slots__ = ("id", "ship_symbol", "action", "payload", "status", "created_at", "started_at",
+                 "finished_at", "result", "error", "conflicts")
+
+    def __init__(self, id: str, ship_symbol: str, action: str, payload: dict):
+        self.id = id
+        self.ship_symbol = ship_symbol
+        self.action = action
+        self.payload = payload
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[dict] = None
+        self.error: Optional[dict] = None
+        self.conflicts = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "shipSymbol": self.ship_symbol,
+            "action": self.action,
+            "payload": self.payload,
+            "status": self.status,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+class _ShipQueue:
+    __slots__ = ("pending", "history", "ready_at", "cooldown", "timer", "running")
+
+    def __init__(self, history: int):
+        self.pending: Deque[ScheduledAction] = deque()
+        self.history: Deque[ScheduledAction] = deque(maxlen=history)
+        self.ready_at = 0.0
+        self.cooldown: Optional[dict] = None
+        self.timer: Optional[Timer] = None
+        self.running = False
+
+class CooldownScheduler:
+    """Per-ship queues of cooldown-bound actions (scans, surveys, ...) fired as each cooldown expires.
+
+    Every ship's cooldown is tracked from the `FleetStore`: action responses
+    and cooldown reads applied there carry the new `cooldown`, so no ship is
+    ever polled. A ship with queued actions holds at most one timer on the
+    shared `TimerWheel`, set for its expiry; the head action then runs, its
+    response sets the next cooldown and the timer is re-armed for the next
+    action. A 409 cooldown conflict (the server's clock or another client
+    disagreeing) takes the cooldown from the error body and retries.
+    """
+
+    def __init__(self, store: FleetStore, wheel: TimerWheel, history: int = 20, max_conflicts: int = 3,
+                 conflict_backoff: float = 1.0):
+        self.wheel = wheel
+        self.history = history
+        self.max_conflicts = max_conflicts
+        self.conflict_backoff = conflict_backoff
+        self.actions: Dict[str, Runner] = {}
+        self._ships: Dict[str, _ShipQueue] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._ids = itertools.count(1)
+        self.completed = 0
+        self.failed = 0
+        self.conflicts = 0
+        store.listeners.append(self._on_change)
+
+    def register(self, action: str, runner: Runner) -> None:
+        self.actions[action] = runner
+
+    def _ship(self, ship_symbol: str) -> _ShipQueue:
+        ship = self._ships.get(ship_symbol)
+        if ship is None:
+            ship = self._ships[ship_symbol] = _ShipQueue(self.history)
+        return ship
+
+    def _on_change(self, ship_symbol: str, changes: Optional[dict], version: int) -> None:
+        if changes is not None and "cooldown" in changes:
+            self.note_cooldown(ship_symbol, changes["cooldown"])
+
+    def note_cooldown(self, ship_symbol: str, cooldown: Optional[dict]) -> None:
+        """Record a ship's cooldown and move its next action to the new expiry"""
+        ship = self._ship(ship_symbol)
+        ship.cooldown = cooldown
+        ship.ready_at = cooldown_deadline(cooldown)
+        self._arm(ship_symbol, ship)
+
+    def submit(self, ship_symbol: str, action: str, payload: Optional[dict] = None) -> ScheduledAction:
+        """Queue an action to run once the ship's cooldown (and every action queued before it) is done"""
+        if action not in self.actions:
+            raise KeyError(action)
+        scheduled = ScheduledAction(f"{next(self._ids):x}", ship_symbol, action, payload or {})
+        ship = self._ship(ship_symbol)
+        ship.pending.append(scheduled)
+        self._arm(ship_symbol, ship)
+        return scheduled
+
+    def cancel(self, ship_symbol: str, action_id: str) -> Optional[ScheduledAction]:
+        """Drop a queued action; one already running can't be cancelled"""
+        ship = self._ships.get(ship_symbol)
+        if ship is None:
+            return None
+        for scheduled in ship.pending:
+            if scheduled.id == action_id and scheduled.status == "queued":
+                ship.pending.remove(scheduled)
+                scheduled.status = "cancelled"
+                ship.history.append(scheduled)
+                self._arm(ship_symbol, ship)
+                return scheduled
+        return None
+
+    def _arm(self, ship_symbol: str, ship: _ShipQueue) -> None:
+        if ship.timer is not None:
+            self.wheel.cancel(ship.timer)
+            ship.timer = None
+        if ship.running or not ship.pending:
+            return
+        if ship.ready_at <= time.monotonic():
+            self._start(ship_symbol, ship)
+        else:
+            ship.timer = self.wheel.call_at(ship.ready_at, lambda: self._fire(ship_symbol))
+
+    def _fire(self, ship_symbol: str) -> None:
+        ship = self._ships[ship_symbol]
+        ship.timer = None
+        if not ship.running and ship.pending:
+            self._start(ship_symbol, ship)
+
+    def _start(self, ship_symbol: str, ship: _ShipQueue) -> None:
+        ship.running = True
+        task = asyncio.create_task(self._run(ship_symbol, ship))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, ship_symbol: str, ship: _ShipQueue) -> None:
+        scheduled = ship.pending[0]
+        scheduled.status = "running"
+        scheduled.started_at = time.time()
+        finished = True
+        try:
+            scheduled.result = await self.actions[scheduled.action](ship_symbol, scheduled.payload)
+            scheduled.status = "done"
+            self.completed += 1
+        except HTTPException as e:
+            if e.status_code == 409 and scheduled.conflicts < self.max_conflicts:
+                # Still cooling down: wait for the cooldown the error reports and try again
+                scheduled.conflicts += 1
+                self.conflicts += 1
+                scheduled.status = "queued"
+                finished = False
+                cooldown = _conflict_cooldown(e.detail)
+                ship.ready_at = cooldown_deadline(cooldown) if cooldown else time.monotonic() + self.conflict_backoff
+            else:
+                scheduled.status = "failed"
+                scheduled.error = {"status": e.status_code, "detail": e.detail}
+                self.failed += 1
+        except Exception as e:
+            scheduled.status = "failed"
+            scheduled.error = {"status": 500, "detail": str(e)}
+            self.failed += 1
+        finally:
+            ship.running = False
+            if finished:
+                scheduled.finished_at = time.time()
+                ship.pending.popleft()
+                ship.history.append(scheduled)
+            self._arm(ship_symbol, ship)
+
+    def ship_status(self, ship_symbol: str) -> dict:
+        ship = self._ships.get(ship_symbol)
+        if ship is None:
+            return {"shipSymbol": ship_symbol, "cooldown": None, "readyInSeconds": 0.0, "queued": [], "recent": []}
+        return {
+            "shipSymbol": ship_symbol,
+            "cooldown": ship.cooldown,
+            "readyInSeconds": round(max(0.0, ship.ready_at - time.monotonic()), 3),
+            "queued": [scheduled.to_dict() for scheduled in ship.pending],
+            "recent": [scheduled.to_dict() for scheduled in reversed(ship.history)],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "ships": len(self._ships),
+            "queued": sum(len(ship.pending) for ship in self._ships.values()),
+            "running": len(self._tasks),
+            "timers": len(self.wheel),
+            "completed": self.completed,
+            "failed": self.failed,
+            "cooldownConflicts": self.conflicts,
+            "actions": sorted(self.actions),
+            "wheel": {"tickSeconds": self.wheel.tick, "slots": self.wheel.slots,
+                      "fired": self.wheel.fired, "wakeups": self.wheel.wakeups},
+        }
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.wheel.stop()
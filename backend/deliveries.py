@@ -0,0 +1,258 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+from .contracts import ContractPlanner, ContractStore, open_deliveries
+from .cooldown_scheduler import Runner, cooldown_deadline, error_data
+from .fleet_store import FleetStore
+
+class DeliveryStopped(Exception):
+    """A condition the delivery loop can't work its way out of"""
+
+class DeliveryJob:
+    __slots__ = ("contract_id", "ship_symbol", "state", "started_at", "started", "stopped", "markets",
+                 "units_bought", "units_delivered", "credits_spent", "credits_earned", "trips",
+                 "errors", "last_error", "task")
+
+    def __init__(self, contract_id: str, ship_symbol: str):
+        self.contract_id = contract_id
+        self.ship_symbol = ship_symbol
+        self.state = "starting"
+        self.started_at = time.time()
+        self.started = time.monotonic()
+        self.stopped: Optional[float] = None
+        # Where each good is bought, planned the first time the ship needs it
+        self.markets: Dict[str, str] = {}
+        self.units_bought = 0
+        self.units_delivered = 0
+        self.credits_spent = 0
+        self.credits_earned = 0
+        self.trips = 0
+        self.errors = 0
+        self.last_error: Optional[dict] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def to_dict(self) -> dict:
+        return {
+            "contractId": self.contract_id,
+            "shipSymbol": self.ship_symbol,
+            "state": self.state,
+            "startedAt": self.started_at,
+            "runningSeconds": round((self.stopped or time.monotonic()) - self.started, 1),
+            "buyMarkets": dict(self.markets),
+            "unitsBought": self.units_bought,
+            "unitsDelivered": self.units_delivered,
+            "trips": self.trips,
+            "creditsSpent": self.credits_spent,
+            "creditsEarned": self.credits_earned,
+            "errors": self.errors,
+            "lastError": self.last_error,
+        }
+
+class DeliveryEngine:
+    """Buy → haul → deliver automation for contracts, one asyncio task per contract.
+
+    Like the mining engine, each step is an ordinary action registered by the
+    routers (accept, purchase, navigate, deliver, ...), so every call shares
+    the upstream client and its rate limiter and lands in the fleet and
+    contract stores. The loop accepts the contract if it isn't yet, then
+    works through its open deliveries one good at a time: buy at the market
+    the `ContractPlanner` picks for the ship (refuelling while docked there),
+    fly the hold to the destination, deliver, and repeat until the contract
+    can be fulfilled.
+    """
+
+    def __init__(self, contracts: ContractStore, fleet: FleetStore, planner: ContractPlanner,
+                 max_errors: int = 5, error_backoff: float = 5.0):
+        self.contracts = contracts
+        self.fleet = fleet
+        self.planner = planner
+        self.max_errors = max_errors
+        self.error_backoff = error_backoff
+        self.actions: Dict[str, Runner] = {}
+        self.jobs: Dict[str, DeliveryJob] = {}
+        # Per-transaction limits learned from the markets' errors, by (waypoint, good)
+        self.trade_volumes: Dict[Tuple[str, str], int] = {}
+
+    def register(self, action: str, runner: Runner) -> None:
+        self.actions[action] = runner
+
+    def start(self, contract_id: str, ship_symbol: str) -> DeliveryJob:
+        """Start delivering a contract with a ship; raises ValueError if either is already busy with a delivery"""
+        if self.contracts.get(contract_id) is None:
+            raise KeyError(contract_id)
+        if self.fleet.get(ship_symbol) is None:
+            raise KeyError(ship_symbol)
+        job = self.jobs.get(contract_id)
+        if job is not None and job.active:
+            raise ValueError(f"{contract_id} is already being delivered by {job.ship_symbol}")
+        busy = next((job for job in self.jobs.values() if job.active and job.ship_symbol == ship_symbol), None)
+        if busy is not None:
+            raise ValueError(f"{ship_symbol} is already delivering {busy.contract_id}")
+        job = self.jobs[contract_id] = DeliveryJob(contract_id, ship_symbol)
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    async def stop_contract(self, contract_id: str) -> Optional[DeliveryJob]:
+        job = self.jobs.get(contract_id)
+        if job is None:
+            return None
+        if job.active:
+            job.task.cancel()
+            await asyncio.gather(job.task, return_exceptions=True)
+        return job
+
+    def stats(self) -> dict:
+        return {
+            "contracts": len(self.jobs),
+            "active": sum(1 for job in self.jobs.values() if job.active),
+            "jobs": [job.to_dict() for job in self.jobs.values()],
+        }
+
+    async def stop(self) -> None:
+        for contract_id in list(self.jobs):
+            await self.stop_contract(contract_id)
+
+    async def _run(self, job: DeliveryJob) -> None:
+        failures = 0
+        try:
+            while job.state != "fulfilled":
+                try:
+                    await self._step(job)
+                    failures = 0
+                except DeliveryStopped as e:
+                    job.state = "failed"
+                    job.last_error = {"status": None, "detail": str(e), "at": time.time()}
+                    return
+                except Exception as e:
+                    status, detail = (e.status_code, e.detail) if isinstance(e, HTTPException) else (500, str(e))
+                    job.errors += 1
+                    job.last_error = {"status": status, "detail": detail, "at": time.time()}
+                    failures += 1
+                    if failures >= self.max_errors:
+                        job.state = "failed"
+                        return
+                    job.state = "backoff"
+                    await self._sleep_until(time.monotonic() + self.error_backoff * failures)
+        except asyncio.CancelledError:
+            job.state = "stopped"
+            raise
+        finally:
+            job.stopped = time.monotonic()
+
+    async def _step(self, job: DeliveryJob) -> None:
+        contract = self.contracts.get(job.contract_id)
+        if contract is None:
+            raise DeliveryStopped("Contract is no longer listed")
+        if contract.get("fulfilled"):
+            job.state = "fulfilled"
+            return
+        if not contract.get("accepted"):
+            job.state = "accepting"
+            await self.actions["accept"](job.contract_id, {})
+            job.credits_earned += contract["terms"]["payment"]["onAccepted"]
+            return
+        terms = open_deliveries(contract)
+        if not terms:
+            await self._fulfill(job, contract)
+            return
+
+        ship = self.fleet.get(job.ship_symbol)
+        if ship is None:
+            raise DeliveryStopped("Ship is no longer in the fleet")
+        nav, cargo = ship["nav"], ship["cargo"]
+        if nav["status"] == "IN_TRANSIT":
+            job.state = "traveling"
+            await self._sleep_until(cooldown_deadline({"expiration": nav.get("route", {}).get("arrival")}))
+            # The held nav still says IN_TRANSIT; orbiting on arrival refreshes it
+            await self.actions["orbit"](job.ship_symbol, {})
+            return
+
+        term = terms[0]
+        symbol, destination = term["tradeSymbol"], term["destinationSymbol"]
+        remaining = term["unitsRequired"] - term["unitsFulfilled"]
+        held = sum(item["units"] for item in cargo["inventory"] if item["symbol"] == symbol)
+        space = cargo["capacity"] - cargo["units"]
+        if held >= remaining or (held > 0 and space == 0):
+            if nav["waypointSymbol"] != destination:
+                await self._travel(job, destination)
+            else:
+                await self._deliver(job, ship, symbol, min(held, remaining))
+            return
+        if space == 0:
+            raise DeliveryStopped(f"Cargo hold is full of goods other than {symbol}")
+
+        market = job.markets.get(symbol) or self._pick_market(job, contract, term)
+        if nav["waypointSymbol"] != market:
+            await self._travel(job, market)
+        else:
+            await self._buy(job, ship, symbol, min(space, remaining - held))
+
+    def _pick_market(self, job: DeliveryJob, contract: dict, term: dict) -> str:
+        plan = self.planner.plan([contract], [job.ship_symbol])[0]
+        delivery = next(delivery for delivery in plan["deliveries"] if delivery["tradeSymbol"] == term["tradeSymbol"]
+                        and delivery["destinationSymbol"] == term["destinationSymbol"])
+        if not delivery.get("buyMarket"):
+            raise DeliveryStopped(delivery.get("reason") or f"No market to buy {term['tradeSymbol']} at")
+        job.markets[term["tradeSymbol"]] = delivery["buyMarket"]
+        return delivery["buyMarket"]
+
+    async def _travel(self, job: DeliveryJob, waypoint_symbol: str) -> None:
+        if self.fleet.get(job.ship_symbol)["nav"]["status"] == "DOCKED":
+            await self.actions["orbit"](job.ship_symbol, {})
+        job.state = "traveling"
+        await self.actions["navigate"](job.ship_symbol, {"waypointSymbol": waypoint_symbol})
+
+    async def _dock(self, job: DeliveryJob, ship: dict) -> None:
+        if ship["nav"]["status"] != "DOCKED":
+            await self.actions["dock"](job.ship_symbol, {})
+
+    async def _buy(self, job: DeliveryJob, ship: dict, symbol: str, units: int) -> None:
+        await self._dock(job, ship)
+        job.state = "buying"
+        fuel = ship.get("fuel") or {}
+        if fuel.get("current", 0) < fuel.get("capacity", 0):
+            # Planned hauls leave the market on a full tank
+            await self.actions["refuel"](job.ship_symbol, {})
+        waypoint_symbol = ship["nav"]["waypointSymbol"]
+        while units > 0:
+            batch = min(units, self.trade_volumes.get((waypoint_symbol, symbol), units))
+            try:
+                body = await self.actions["purchase"](job.ship_symbol, {"symbol": symbol, "units": batch})
+            except HTTPException as e:
+                volume = error_data(e.detail).get("tradeVolume")
+                if volume and volume < batch:
+                    # Over the market's per-transaction limit: buy in batches of it
+                    self.trade_volumes[(waypoint_symbol, symbol)] = volume
+                    continue
+                raise
+            transaction = body["data"]["transaction"]
+            job.units_bought += transaction["units"]
+            job.credits_spent += transaction["totalPrice"]
+            units -= batch
+
+    async def _deliver(self, job: DeliveryJob, ship: dict, symbol: str, units: int) -> None:
+        await self._dock(job, ship)
+        job.state = "delivering"
+        # The deliver handler applies the new contract and cargo to the stores
+        await self.actions["deliver"](job.contract_id, {"shipSymbol": job.ship_symbol, "tradeSymbol": symbol, "units": units})
+        job.units_delivered += units
+        job.trips += 1
+
+    async def _fulfill(self, job: DeliveryJob, contract: dict) -> None:
+        job.state = "fulfilling"
+        await self.actions["fulfill"](job.contract_id, {})
+        job.credits_earned += contract["terms"]["payment"]["onFulfilled"]
+        job.state = "fulfilled"
+
+    @staticmethod
+    async def _sleep_until(deadline: float) -> None:
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,94 @@
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+from fastapi import HTTPException
+
+from .fleet_store import FleetStore
+
+class FleetRepository:
+    """Ships keyed by symbol with per-ship locks, shared by mock and live modes.
+
+    Lookups are O(1) reads of the `FleetStore`, which holds the mock fleet in
+    demo mode and the synced fleet otherwise; `fetch` falls back to the live
+    API for a ship the store hasn't seen yet. Handlers that change a ship hold
+    its lock (see `locked`) so concurrent actions on one ship, e.g. a navigate
+    and an install, run one after the other instead of interleaving. A ship's
+    lock exists only while some caller holds or waits for it, so symbols of
+    ships that are gone (or never existed) don't pile up.
+    """
+
+    def __init__(self, store: FleetStore, live: bool, api_url: str, token: str):
+        self.store = store
+        self.live = live
+        self.api_url = api_url
+        self.token = token
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+
+    def get(self, ship_symbol: str) -> Optional[dict]:
+        return self.store.get(ship_symbol)
+
+    async def fetch(self, ship_symbol: str, client: httpx.AsyncClient) -> dict:
+        """Get a ship, reading it upstream (in live mode) only if the store doesn't have it"""
+        ship = self.store.get(ship_symbol)
+        if ship is not None:
+            return ship
+        if not self.live:
+            raise HTTPException(status_code=404, detail="Ship not found")
+
+        headers = {"Authorization": f"Bearer {self.token}"}
+        response = await client.get(f"{self.api_url}/my/ships/{ship_symbol}", headers=headers)
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        ship = response.json()["data"]
+        self.store.upsert(ship)
+        return ship
+
+    @asynccontextmanager
+    async def lock(self, *ship_symbols: str) -> AsyncIterator[None]:
+        """Hold the locks of one or more ships, taken in sorted order so two callers can't deadlock"""
+        symbols = sorted(set(ship_symbols))
+        locks = [self._checkout(symbol) for symbol in symbols]
+        for i, lock in enumerate(locks):
+            try:
+                await lock.acquire()
+            except BaseException:
+                for held in locks[:i]:
+                    held.release()
+                self._checkin(symbols)
+                raise
+        try:
+            yield
+        finally:
+            for lock in locks:
+                lock.release()
+            self._checkin(symbols)
+
+    def _checkout(self, ship_symbol: str) -> asyncio.Lock:
+        """A ship's lock, created for its first holder or waiter"""
+        lock = self._locks.get(ship_symbol)
+        if lock is None:
+            lock = self._locks[ship_symbol] = asyncio.Lock()
+        self._lock_users[ship_symbol] = self._lock_users.get(ship_symbol, 0) + 1
+        return lock
+
+    def _checkin(self, ship_symbols) -> None:
+        """Drop each ship's lock once its last holder or waiter is done with it"""
+        for symbol in ship_symbols:
+            users = self._lock_users[symbol] - 1
+            if users:
+                self._lock_users[symbol] = users
+            else:
+                del self._lock_users[symbol]
+                del self._locks[symbol]
+
+    def locked(self, handler):
+        """Decorate a handler whose first argument is a ship symbol to run under that ship's lock"""
+        @functools.wraps(handler)
+        async def wrapper(ship_symbol: str, *args, **kwargs):
+            async with self.lock(ship_symbol):
+                return await handler(ship_symbol, *args, **kwargs)
+        return wrapper
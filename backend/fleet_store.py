@@ -0,0 +1,170 @@
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from .rate_limiter import Lane
+
+# Top-level ship fields an action response can carry a new value for
+SHIP_FIELDS = ("nav", "fuel", "cargo", "cooldown", "crew", "frame", "reactor", "engine",
+               "modules", "mounts", "registration", "customization")
+
+# Called with a ship's symbol, its changed fields (None once it has left the fleet) and its new version
+Listener = Callable[[str, Optional[dict], int], None]
+
+def _same(field: str, held, value) -> bool:
+    """Whether a new field value leaves the held one as it is"""
+    if held is value:
+        # Likely the held object patched in place by a handler, so it can't be compared
+        return False
+    if field == "cooldown" and isinstance(held, dict) and isinstance(value, dict) \
+            and held.get("expiration") and value.get("expiration"):
+        # remainingSeconds counts down on every poll of a cooldown whose expiration hasn't moved
+        return {**held, "remainingSeconds": None} == {**value, "remainingSeconds": None}
+    return held == value
+
+class FleetStore:
+    """Server-side copy of the fleet, kept current without re-reading it upstream.
+
+    Action responses already carry the ship's new state (navigate returns
+    `nav` and `fuel`, refuel `fuel`, transfer `cargo`, ...), so they are
+    applied to the held ship in place, and the agent they carry (refuel,
+    sell and purchase return its new credits) is kept as `agent`. A periodic
+    full sync of `/my/ships` catches anything changed elsewhere, leaving
+    alone ships that an action changed while its pages were being read.
+    Every change that alters a held ship, and every ship a sync finds gone,
+    bumps that ship's version and is passed to the listeners (the SSE stream
+    is one).
+    """
+
+    def __init__(self, api_url: str, token: str, page_limit: int = 20):
+        self.api_url = api_url
+        self.token = token
+        self.page_limit = page_limit
+        self.ships: Dict[str, dict] = {}
+        self.versions: Dict[str, int] = {}
+        self.agent: Optional[dict] = None
+        self.synced_at: Optional[float] = None
+        self.sync_error: Optional[str] = None
+        self.listeners: List[Listener] = []
+        self.task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.ships)
+
+    def get(self, ship_symbol: str) -> Optional[dict]:
+        return self.ships.get(ship_symbol)
+
+    def version(self, ship_symbol: str) -> int:
+        return self.versions.get(ship_symbol, 0)
+
+    def all(self) -> List[dict]:
+        return list(self.ships.values())
+
+    def _changed(self, ship_symbol: str, changes: Optional[dict]) -> int:
+        version = self.versions.get(ship_symbol, 0) + 1
+        self.versions[ship_symbol] = version
+        for listener in self.listeners:
+            listener(ship_symbol, changes, version)
+        return version
+
+    def apply(self, ship_symbol: str, changes: dict) -> Optional[int]:
+        """Merge changed top-level fields into a held ship; returns its new version, or None if nothing changed"""
+        ship = self.ships.get(ship_symbol)
+        if ship is None or not changes:
+            return None
+        changes = {field: value for field, value in changes.items()
+                   if field not in ship or not _same(field, ship[field], value)}
+        if not changes:
+            return None
+        ship.update(changes)
+        return self._changed(ship_symbol, changes)
+
+    def apply_response(self, ship_symbol: str, response: dict) -> Optional[int]:
+        """Apply the ship fields found in an action response (`data.ship` or top-level fields of `data`)"""
+        data = response.get("data", {})
+        if isinstance(data.get("agent"), dict):
+            self.agent = {**(self.agent or {}), **data["agent"]}
+        source = data["ship"] if isinstance(data.get("ship"), dict) else data
+        return self.apply(ship_symbol, {field: source[field] for field in SHIP_FIELDS if field in source})
+
+    def upsert(self, ship: dict) -> int:
+        """Store a full ship read, bumping its version only if it differs from the held copy"""
+        symbol = ship["symbol"]
+        current = self.ships.get(symbol)
+        if current is not None and current == ship:
+            return self.versions[symbol]
+        self.ships[symbol] = ship
+        return self._changed(symbol, ship)
+
+    def replace(self, ships: Iterable[dict], since: Optional[Dict[str, int]] = None) -> None:
+        """Take a full fleet listing as the new state.
+
+        `since` is the ship versions when the listing was requested; ships
+        changed after that keep their held state, which is newer than the listing.
+        """
+        ships = list(ships)
+        changed = set() if since is None else {
+            symbol for symbol, version in self.versions.items() if version != since.get(symbol, 0)
+        }
+        for ship in ships:
+            if ship["symbol"] not in changed:
+                self.upsert(ship)
+        listed = {ship["symbol"] for ship in ships}
+        for symbol in [symbol for symbol in self.ships if symbol not in listed and symbol not in changed]:
+            del self.ships[symbol]
+            self._changed(symbol, None)
+        self.synced_at = time.time()
+
+    async def sync(self, client: httpx.AsyncClient) -> None:
+        """Read every page of `/my/ships` and replace the held fleet with it"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        since = dict(self.versions)
+        ships, page = [], 1
+        while True:
+            response = await client.get(
+                f"{self.api_url}/my/ships",
+                params={"page": page, "limit": self.page_limit},
+                headers=headers,
+                # A full sync exists to see fresh state, and it isn't urgent
+                extensions={"cache": False, "lane": Lane.BACKGROUND},
+            )
+            response.raise_for_status()
+            body = response.json()
+            ships.extend(body["data"])
+            if page * self.page_limit >= body.get("meta", {}).get("total", 0):
+                break
+            page += 1
+        self.replace(ships, since)
+
+    async def _run(self, client: httpx.AsyncClient, interval: float) -> None:
+        while True:
+            try:
+                await self.sync(client)
+                self.sync_error = None
+            except Exception as e:
+                self.sync_error = str(e) or type(e).__name__
+            await asyncio.sleep(interval)
+
+    def start(self, client: httpx.AsyncClient, interval: float) -> None:
+        """Sync now and then every `interval` seconds in the background"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(client, interval))
+
+    async def stop(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> dict:
+        return {
+            "ships": len(self.ships),
+            "agentCredits": self.agent.get("credits") if self.agent else None,
+            "syncedAt": self.synced_at,
+            "syncError": self.sync_error,
+            "syncing": self.task is not None and not self.task.done(),
+        }
@@ -0,0 +1,74 @@
+import asyncio
+import json
+from typing import AsyncIterator, Optional, Set
+
+from .fleet_store import FleetStore
+
+class FleetStream:
+    """Fans `FleetStore` changes out to subscribers of the `/api/ships/stream` SSE feed.
+
+    Every change the store records (an applied action response or a ship that
+    differs after a full sync) is queued for each subscriber with the ship's
+    new version, as is a ship a full sync no longer finds (a `removed` event). A subscriber that falls `queue_size` events behind is resynced
+    with a fresh snapshot instead of buffering without bound.
+    """
+
+    def __init__(self, store: FleetStore, queue_size: int = 256, keepalive: float = 15.0):
+        self.store = store
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self.sequence = 0
+        self._subscribers: Set[asyncio.Queue] = set()
+        store.listeners.append(self.publish)
+
+    def publish(self, ship_symbol: str, changes: Optional[dict], version: int) -> None:
+        self.sequence += 1
+        event = {"id": self.sequence, "symbol": ship_symbol, "version": version}
+        if changes is None:
+            event["removed"] = True
+        else:
+            event["changes"] = changes
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind to catch up event by event; replace the backlog with a resync marker
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _snapshot(self) -> str:
+        ships = [dict(ship, version=self.store.version(ship["symbol"])) for ship in self.store.all()]
+        return _sse("snapshot", {"ships": ships}, self.sequence)
+
+    async def events(self, queue: asyncio.Queue) -> AsyncIterator[str]:
+        """Server-sent events for one subscriber: a snapshot, then ship changes"""
+        try:
+            yield self._snapshot()
+            while True:
+                try:
+                    event: Optional[dict] = await asyncio.wait_for(queue.get(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    yield self._snapshot()
+                else:
+                    yield _sse("removed" if event.get("removed") else "ship", event, event["id"])
+        finally:
+            self.unsubscribe(queue)
+
+def _sse(event: str, data: dict, event_id: int) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
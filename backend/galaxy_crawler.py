@@ -0,0 +1,137 @@
+import asyncio
+import math
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from .galaxy_store import GalaxyStore
+
+class GalaxyCrawler:
+    """Fetches every page of upstream `/systems` concurrently into a `GalaxyStore`.
+
+    With `waypoints=True` the crawl continues into `/systems/{symbol}/waypoints`
+    for every stored system, which brings in waypoint traits for the spatial
+    queries. Pages go through the shared upstream client, so they are paced by
+    the rate limiter (in its background lane) like any other galaxy read. Each
+    finished page is committed immediately; a crawl that is cancelled or fails
+    resumes from the pages still missing the next time it runs.
+    """
+
+    def __init__(self, store: GalaxyStore, api_url: str, token: str, concurrency: int = 4, page_limit: int = 20):
+        self.store = store
+        self.api_url = api_url
+        self.token = token
+        self.concurrency = concurrency
+        self.page_limit = page_limit
+        self.task: Optional[asyncio.Task] = None
+        self.state = "idle"
+        self.error: Optional[str] = None
+        self.pages_fetched = 0
+        self._page_totals: Dict[str, int] = {}
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    async def _fetch_page(self, client: httpx.AsyncClient, path: str, page: int) -> dict:
+        response = await client.get(
+            f"{self.api_url}{path}",
+            params={"page": page, "limit": self.page_limit},
+            headers={"Authorization": f"Bearer {self.token}"},
+            # Pages land in the galaxy store, so keep them out of the response cache
+            extensions={"cache": False},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _crawl_resource(self, client: httpx.AsyncClient, resource: str, path: str,
+                              save: Callable[[List[dict], str, int], None], semaphore: asyncio.Semaphore) -> None:
+        """Fetch the missing pages of one paginated upstream collection"""
+        meta = self.store.crawl_meta(resource)
+        if meta is not None and meta["limit"] != self.page_limit:
+            # Page numbers from a different page size don't line up; start over
+            self.store.reset_crawl(resource)
+            meta = None
+        if meta is not None and meta["complete"]:
+            return
+
+        if meta is None:
+            async with semaphore:
+                first = await self._fetch_page(client, path, 1)
+            total = first["meta"]["total"]
+            self.store.set_crawl_meta(resource, total, self.page_limit)
+            save(first["data"], resource, 1)
+            self.pages_fetched += 1
+        else:
+            total = meta["total"]
+
+        page_count = max(1, math.ceil(total / self.page_limit))
+        self._page_totals[resource] = page_count
+        done = self.store.completed_pages(resource)
+
+        async def fetch(page: int):
+            async with semaphore:
+                body = await self._fetch_page(client, path, page)
+            save(body["data"], resource, page)
+            self.pages_fetched += 1
+
+        await asyncio.gather(*(fetch(page) for page in range(1, page_count + 1) if page not in done))
+        self.store.set_crawl_meta(resource, total, self.page_limit, complete=True)
+
+    async def crawl(self, client: httpx.AsyncClient, waypoints: bool = False) -> None:
+        """Fetch all missing pages; safe to call again after an interruption"""
+        self.state = "running"
+        self.error = None
+        self.pages_fetched = 0
+        self._page_totals = {}
+        self._started = time.perf_counter()
+        self._finished = None
+        semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            await self._crawl_resource(client, "systems", "/systems", self.store.save_systems, semaphore)
+            if waypoints:
+                await asyncio.gather(*(
+                    self._crawl_resource(client, f"waypoints:{symbol}", f"/systems/{symbol}/waypoints",
+                                         self.store.save_waypoints, semaphore)
+                    for symbol in self.store.system_symbols()
+                ))
+            self.state = "completed"
+        except asyncio.CancelledError:
+            self.state = "interrupted"
+            raise
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e) or type(e).__name__
+        finally:
+            self._finished = time.perf_counter()
+
+    def start(self, client: httpx.AsyncClient, restart: bool = False, waypoints: bool = False) -> None:
+        """Run a crawl in the background unless one is already running"""
+        if self.task is not None and not self.task.done():
+            return
+        if restart:
+            self.store.reset_crawl()
+        self.task = asyncio.create_task(self.crawl(client, waypoints=waypoints))
+
+    async def stop(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> dict:
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        return {
+            "state": self.state,
+            "error": self.error,
+            "pagesTotal": sum(self._page_totals.values()),
+            "pagesCompleted": self.store.completed_page_count(),
+            "pagesFetched": self.pages_fetched,
+            "systemsStored": self.store.system_count(),
+            "waypointsStored": self.store.waypoint_count(),
+            "elapsedSeconds": round(elapsed, 3),
+            "pagesPerSecond": round(self.pages_fetched / elapsed, 2) if elapsed > 0 else 0.0,
+        }
@@ -0,0 +1,271 @@
+import json
+import math
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .spatial_index import GridIndex
+
+def _build_index(entries) -> GridIndex:
+    """Grid index over (key, x, y, item) entries with cells sized to hold about one point each"""
+    entries = list(entries)
+    if entries:
+        xs = [entry[1] for entry in entries]
+        ys = [entry[2] for entry in entries]
+        extent = max(max(xs) - min(xs), max(ys) - min(ys), 1)
+        cell_size = max(extent / math.sqrt(len(entries)), 1.0)
+    else:
+        cell_size = 50.0
+    index = GridIndex(cell_size)
+    for key, x, y, item in entries:
+        index.insert(key, x, y, item)
+    return index
+
+def _trait_rows(waypoint: dict) -> List[Tuple[str, str]]:
+    """(trait, waypoint symbol) rows for the waypoint_traits table"""
+    return [(trait["symbol"], waypoint["symbol"]) for trait in waypoint.get("traits", [])]
+
+class IndexedWaypoint:
+    """Waypoint as held in the spatial index, with its traits pre-split into a set"""
+    __slots__ = ("symbol", "type", "x", "y", "traits", "data")
+
+    def __init__(self, data: dict):
+        self.symbol = data["symbol"]
+        self.type = data.get("type")
+        self.x = data["x"]
+        self.y = data["y"]
+        self.traits = frozenset(trait["symbol"] for trait in data.get("traits", []))
+        self.data = data
+
+class GalaxyStore:
+    """Local SQLite copy of galaxy data fetched from SpaceTraders.
+
+    Systems and waypoints are stored as their raw JSON alongside crawl
+    bookkeeping (which pages are done and the advertised total), so an
+    interrupted crawl resumes where it stopped; each waypoint's traits also go
+    in a (trait, symbol) table for galaxy-wide trait lookups. The database is opened lazily
+    on first use. Reads are served from memory: a decoded snapshot of all
+    systems, a grid index over system coordinates and one grid index per
+    system over its waypoints (plus per-trait sub-indexes, so a sparse trait
+    such as MARKETPLACE is searched without walking every other waypoint), each
+    built on first use and kept current by later writes (a write to a system
+    drops its trait indexes, which are rebuilt on the next read), so spatial
+    queries never touch SQLite or the upstream API.
+
+    An optional `source` (demo mode's `MockGalaxy`) fills the store on demand:
+    a system and its waypoints are copied in the first time anything reads
+    them, and every other system's header (without its waypoint list, so no
+    waypoints are generated) on the first galaxy-wide read.
+    """
+
+    def __init__(self, path: str, source=None):
+        self.path = path
+        self.source = source
+        self._sourced: Set[str] = set()
+        self._sourced_all = False
+        self._db: Optional[sqlite3.Connection] = None
+        self._systems: Optional[List[dict]] = None
+        self._systems_json: Optional[bytes] = None
+        self._system_index: Optional[GridIndex] = None
+        self._waypoint_indexes: Dict[str, GridIndex] = {}
+        self._trait_indexes: Dict[str, Dict[str, GridIndex]] = {}
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            had_traits = self._db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'waypoint_traits'"
+            ).fetchone() is not None
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS systems (
+                    symbol TEXT PRIMARY KEY, sectorSymbol TEXT, type TEXT, x INTEGER, y INTEGER, data TEXT
+                );
+                CREATE TABLE IF NOT EXISTS waypoints (
+                    symbol TEXT PRIMARY KEY, systemSymbol TEXT, type TEXT, x INTEGER, y INTEGER, data TEXT
+                );
+                CREATE INDEX IF NOT EXISTS waypoints_by_system ON waypoints (systemSymbol);
+                CREATE TABLE IF NOT EXISTS waypoint_traits (trait TEXT, symbol TEXT, PRIMARY KEY (trait, symbol));
+                CREATE INDEX IF NOT EXISTS waypoint_traits_by_symbol ON waypoint_traits (symbol);
+                CREATE TABLE IF NOT EXISTS crawl_pages (resource TEXT, page INTEGER, PRIMARY KEY (resource, page));
+                CREATE TABLE IF NOT EXISTS crawl_meta (resource TEXT PRIMARY KEY, total INTEGER, page_limit INTEGER, complete INTEGER);
+                """
+            )
+            if not had_traits:
+                # A database from before the traits table: index the waypoints it already holds
+                with self._db:
+                    rows = self._db.execute("SELECT data FROM waypoints")
+                    self._db.executemany("INSERT OR IGNORE INTO waypoint_traits VALUES (?, ?)",
+                                         [row for (data,) in rows for row in _trait_rows(json.loads(data))])
+        return self._db
+
+    def _mark_page(self, resource: Optional[str], page: Optional[int]) -> None:
+        if resource is not None and page is not None:
+            self.db.execute("INSERT OR IGNORE INTO crawl_pages VALUES (?, ?)", (resource, page))
+
+    def save_systems(self, systems: Iterable[dict], resource: Optional[str] = None, page: Optional[int] = None) -> None:
+        """Upsert systems, marking a crawl page done in the same transaction when given"""
+        systems = list(systems)
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO systems VALUES (?, ?, ?, ?, ?, ?)",
+                [(s["symbol"], s.get("sectorSymbol"), s.get("type"), s.get("x"), s.get("y"), json.dumps(s)) for s in systems],
+            )
+            self._mark_page(resource, page)
+        self._systems = None
+        self._systems_json = None
+        if self._system_index is not None:
+            for system in systems:
+                self._system_index.insert(system["symbol"], system["x"], system["y"], system)
+
+    def save_waypoints(self, waypoints: Iterable[dict], resource: Optional[str] = None, page: Optional[int] = None) -> None:
+        """Upsert waypoints, marking a crawl page done in the same transaction when given"""
+        waypoints = list(waypoints)
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO waypoints VALUES (?, ?, ?, ?, ?, ?)",
+                [(w["symbol"], w["systemSymbol"], w.get("type"), w["x"], w["y"], json.dumps(w)) for w in waypoints],
+            )
+            self.db.executemany("DELETE FROM waypoint_traits WHERE symbol = ?", [(w["symbol"],) for w in waypoints])
+            self.db.executemany("INSERT OR IGNORE INTO waypoint_traits VALUES (?, ?)",
+                                [row for w in waypoints for row in _trait_rows(w)])
+            self._mark_page(resource, page)
+        for data in waypoints:
+            system_symbol = data["systemSymbol"]
+            # Trait indexes are rebuilt from the system's index on their next read
+            self._trait_indexes.pop(system_symbol, None)
+            index = self._waypoint_indexes.get(system_symbol)
+            if index is not None:
+                waypoint = IndexedWaypoint(data)
+                index.insert(waypoint.symbol, waypoint.x, waypoint.y, waypoint)
+
+    def _from_source(self, system_symbol: str) -> None:
+        """Copy a system and its waypoints in from the source the first time they are read"""
+        if self.source is None or system_symbol in self._sourced:
+            return
+        self._sourced.add(system_symbol)
+        system = self.source.system(system_symbol)
+        if system is not None:
+            self.save_systems([system])
+            self.save_waypoints(self.source.waypoints(system_symbol))
+
+    def _all_from_source(self) -> None:
+        """Copy in every system's header (no waypoint list), skipping systems already copied in full"""
+        if self.source is not None and not self._sourced_all:
+            self._sourced_all = True
+            self.save_systems(h for h in self.source.headers() if h["symbol"] not in self._sourced)
+
+    def completed_pages(self, resource: str) -> Set[int]:
+        rows = self.db.execute("SELECT page FROM crawl_pages WHERE resource = ?", (resource,))
+        return {page for (page,) in rows}
+
+    def completed_page_count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM crawl_pages").fetchone()[0]
+
+    def crawl_meta(self, resource: str) -> Optional[dict]:
+        row = self.db.execute(
+            "SELECT total, page_limit, complete FROM crawl_meta WHERE resource = ?", (resource,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"total": row[0], "limit": row[1], "complete": bool(row[2])}
+
+    def set_crawl_meta(self, resource: str, total: int, limit: int, complete: bool = False) -> None:
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO crawl_meta VALUES (?, ?, ?, ?)", (resource, total, limit, int(complete)))
+
+    def reset_crawl(self, resource: Optional[str] = None) -> None:
+        """Forget crawl progress (for one resource, or all) so the next crawl refetches every page"""
+        with self.db:
+            if resource is None:
+                self.db.execute("DELETE FROM crawl_pages")
+                self.db.execute("DELETE FROM crawl_meta")
+            else:
+                self.db.execute("DELETE FROM crawl_pages WHERE resource = ?", (resource,))
+                self.db.execute("DELETE FROM crawl_meta WHERE resource = ?", (resource,))
+
+    def system_count(self) -> int:
+        self._all_from_source()
+        return self.db.execute("SELECT COUNT(*) FROM systems").fetchone()[0]
+
+    def waypoint_count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM waypoints").fetchone()[0]
+
+    def trait_waypoints(self, trait: str) -> List[str]:
+        """Symbols of every stored waypoint with `trait`, across all systems"""
+        rows = self.db.execute("SELECT symbol FROM waypoint_traits WHERE trait = ? ORDER BY symbol", (trait,))
+        return [symbol for (symbol,) in rows]
+
+    def system_symbols(self) -> List[str]:
+        return [symbol for (symbol,) in self.db.execute("SELECT symbol FROM systems ORDER BY symbol")]
+
+    def systems(self) -> List[dict]:
+        """All stored systems, decoded once and reused until the next write"""
+        self._all_from_source()
+        if self._systems is None:
+            rows = self.db.execute("SELECT data FROM systems ORDER BY symbol")
+            self._systems = [json.loads(data) for (data,) in rows]
+        return self._systems
+
+    def systems_json(self) -> bytes:
+        """All stored systems as one encoded JSON array, joined from the stored rows without decoding them"""
+        self._all_from_source()
+        if self._systems_json is None:
+            rows = self.db.execute("SELECT data FROM systems ORDER BY symbol")
+            self._systems_json = b"[" + b",".join(data.encode() for (data,) in rows) + b"]"
+        return self._systems_json
+
+    def system_index(self) -> GridIndex:
+        if self._system_index is None:
+            self._system_index = _build_index((s["symbol"], s["x"], s["y"], s) for s in self.systems())
+        return self._system_index
+
+    def waypoint_index(self, system_symbol: str, trait: Optional[str] = None) -> GridIndex:
+        """Spatial index over a system's waypoints, or only those with `trait`"""
+        index = self._waypoint_indexes.get(system_symbol)
+        if index is None:
+            self._from_source(system_symbol)
+            rows = self.db.execute("SELECT data FROM waypoints WHERE systemSymbol = ?", (system_symbol,))
+            waypoints = [IndexedWaypoint(json.loads(data)) for (data,) in rows]
+            index = _build_index((w.symbol, w.x, w.y, w) for w in waypoints)
+            if waypoints:
+                # An empty system is left unindexed so its cell size is picked once data arrives
+                self._waypoint_indexes[system_symbol] = index
+        if trait is None:
+            return index
+
+        trait_indexes = self._trait_indexes.get(system_symbol)
+        trait_index = trait_indexes.get(trait) if trait_indexes else None
+        if trait_index is None:
+            trait_index = _build_index(
+                (w.symbol, w.x, w.y, w) for w in index.items() if trait in w.traits
+            )
+            # Never written to after this, so the system index's version (which every write to
+            # the system bumps) keeps versions unique across rebuilds for callers' caches
+            trait_index.version = index.version
+            if system_symbol in self._waypoint_indexes:
+                # Not cached while the system has no waypoints, so their arrival is seen
+                self._trait_indexes.setdefault(system_symbol, {})[trait] = trait_index
+        return trait_index
+
+    def get_system(self, system_symbol: str) -> Optional[dict]:
+        self._from_source(system_symbol)
+        row = self.db.execute("SELECT data FROM systems WHERE symbol = ?", (system_symbol,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_waypoint(self, waypoint_symbol: str) -> Optional[dict]:
+        self._from_source(waypoint_symbol.rsplit("-", 1)[0])
+        row = self.db.execute("SELECT data FROM waypoints WHERE symbol = ?", (waypoint_symbol,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def nearest_waypoints(self, system_symbol: str, x: float, y: float, limit: int = 5,
+                          trait: Optional[str] = None, waypoint_type: Optional[str] = None) -> List[Tuple[float, dict]]:
+        """Closest waypoints in a system to (x, y), optionally filtered by trait and type"""
+        predicate = None
+        if waypoint_type is not None:
+            predicate = lambda waypoint: waypoint.type == waypoint_type
+        found = self.waypoint_index(system_symbol, trait).nearest(x, y, limit, predicate)
+        return [(distance, waypoint.data) for distance, waypoint in found]
+
+    def nearest_systems(self, x: float, y: float, limit: int = 5) -> List[Tuple[float, dict]]:
+        return self.system_index().nearest(x, y, limit)
@@ -1,10 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .config import CORS_ORIGINS
-from .routers import core, ships, security, scanning, resources, crew, combat, modifications
+from .config import CORS_ORIGINS, HAS_VALID_TOKEN, GALAXY_CRAWL_ON_STARTUP, GALAXY_CRAWL_WAYPOINTS, FLEET_SYNC_INTERVAL, MARKET_POLL_ON_STARTUP, TRACING_ENABLED, PROFILE_INTERVAL_MS
+from .routers import core, ships, security, scanning, resources, crew, combat, modifications, upstream, galaxy, route, metrics as metrics_router, debug, scheduler, mining, surveys, markets, trade, contracts
+from .metrics import MetricsMiddleware, metrics
+from .tracing import TracingMiddleware, traces
+from .upstream import get_upstream_client, close_upstream_client
+from .utilities import galaxy_crawler, fleet_store, cooldown_scheduler, mining_engine, delivery_engine, market_history, market_ingester
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared upstream client on startup and close it on shutdown"""
+    client = get_upstream_client()
+    if HAS_VALID_TOKEN:
+        fleet_store.start(client, FLEET_SYNC_INTERVAL)
+    if HAS_VALID_TOKEN and GALAXY_CRAWL_ON_STARTUP:
+        galaxy_crawler.start(client, waypoints=GALAXY_CRAWL_WAYPOINTS)
+    market_history.load()
+    if MARKET_POLL_ON_STARTUP:
+        market_ingester.start(client)
+    yield
+    await market_ingester.stop()
+    await mining_engine.stop()
+    await delivery_engine.stop()
+    await cooldown_scheduler.stop()
+    await galaxy_crawler.stop()
+    await fleet_store.stop()
+    await close_upstream_client()
 
-app = FastAPI(title="SpaceTraders GUI Backend", version="1.0.0")
+app = FastAPI(title="SpaceTraders GUI Backend", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware for frontend communication
 app.add_middleware(
@@ -15,6 +41,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in per request (X-Trace / X-Profile headers) unless TRACING_ENABLED; kept traces at /api/debug/traces
+app.add_middleware(TracingMiddleware, buffer=traces, always=TRACING_ENABLED, profile_interval=PROFILE_INTERVAL_MS / 1000)
+
+# Added last so it is outermost and times the whole request; served at /metrics
+app.add_middleware(MetricsMiddleware, registry=metrics)
+
 # Include all routers
 app.include_router(core.router)
 app.include_router(ships.router)
@@ -24,6 +56,17 @@ app.include_router(resources.router)
 app.include_router(crew.router)
 app.include_router(combat.router)
 app.include_router(modifications.router)
+app.include_router(upstream.router)
+app.include_router(galaxy.router)
+app.include_router(route.router)
+app.include_router(metrics_router.router)
+app.include_router(debug.router)
+app.include_router(scheduler.router)
+app.include_router(mining.router)
+app.include_router(surveys.router)
+app.include_router(markets.router)
+app.include_router(trade.router)
+app.include_router(contracts.router)
 
 @app.get("/")
 async def root():
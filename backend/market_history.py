@@ -0,0 +1,305 @@
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Market supply levels, scarcest first
+SUPPLY_LEVELS = ["SCARCE", "LIMITED", "MODERATE", "HIGH", "ABUNDANT"]
+_SUPPLY_CODES = {level: code for code, level in enumerate(SUPPLY_LEVELS)}
+# One observation of one good at one market: 21 bytes
+COLUMNS = {
+    "time": np.float64,
+    "purchasePrice": np.int32,
+    "sellPrice": np.int32,
+    "tradeVolume": np.int32,
+    "supply": np.int8,  # Index into SUPPLY_LEVELS, -1 when not reported
+}
+
+def write_history(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """Write `MarketHistory.arrays()` to `path` as one `.npz`, replacing the file atomically"""
+    temp = f"{path}.tmp"
+    with open(temp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(temp, path)
+
+class _Series:
+    """One good's observations at one market, a column per field, in time order"""
+    __slots__ = ("columns", "size")
+
+    def __init__(self, capacity: int = 16):
+        self.columns = {name: np.empty(capacity, dtype) for name, dtype in COLUMNS.items()}
+        self.size = 0
+
+    def _reserve(self, extra: int) -> None:
+        capacity = len(self.columns["time"])
+        if self.size + extra <= capacity:
+            return
+        capacity = max(self.size + extra, capacity * 2)
+        for name, column in self.columns.items():
+            grown = np.empty(capacity, column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+
+    def append(self, row: Tuple) -> None:
+        self._reserve(1)
+        for column, value in zip(self.columns.values(), row):
+            column[self.size] = value
+        self.size += 1
+
+    def extend(self, values: Dict[str, np.ndarray]) -> None:
+        count = len(values["time"])
+        if self.size and count and values["time"][0] < self.view("time")[-1]:
+            # Older than what's held: merge, keeping the series in time order
+            merged = {name: np.concatenate((self.view(name), values[name])) for name in COLUMNS}
+            order = np.argsort(merged["time"], kind="stable")
+            self.size = 0
+            values, count = {name: column[order] for name, column in merged.items()}, len(order)
+        self._reserve(count)
+        for name, column in self.columns.items():
+            column[self.size:self.size + count] = values[name]
+        self.size += count
+
+    def view(self, name: str) -> np.ndarray:
+        return self.columns[name][:self.size]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+class MarketHistory:
+    """Price and supply observations of every good at every polled market.
+
+    Each (market, good) series is its own set of NumPy columns — time,
+    purchase and sell price, trade volume and supply level — grown by
+    doubling, so appends are amortized O(1) and a series stays contiguous and
+    in time order. A history query binary-searches its time range and
+    downsamples it to at most `points` buckets with `ufunc.reduceat`, so its
+    cost follows the rows in range rather than the size of the store. The
+    latest observation of every good is also kept in market × good matrices
+    for galaxy-wide price reads. With a `path`, `save()` writes the store
+    there as one `.npz` of concatenated columns and `load()` reads it back.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.market_symbols: List[str] = []
+        self.good_symbols: List[str] = []
+        self._market_ids: Dict[str, int] = {}
+        self._good_ids: Dict[str, int] = {}
+        self._series: Dict[Tuple[int, int], _Series] = {}
+        # Latest observation per (market, good); a NaN time means never observed
+        self._latest = {name: np.zeros((0, 0), dtype) for name, dtype in COLUMNS.items()}
+        self._latest["time"] = np.full((0, 0), np.nan)
+        self.rows = 0
+        self.saved_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _grow_latest(self) -> None:
+        rows, cols = self._latest["time"].shape
+        if len(self.market_symbols) <= rows and len(self.good_symbols) <= cols:
+            return
+        shape = (max(len(self.market_symbols), rows * 2, 16), max(len(self.good_symbols), cols * 2, 16))
+        for name, matrix in self._latest.items():
+            grown = np.full(shape, np.nan) if name == "time" else np.zeros(shape, matrix.dtype)
+            grown[:rows, :cols] = matrix
+            self._latest[name] = grown
+
+    def _intern(self, symbol: str, ids: Dict[str, int], symbols: List[str]) -> int:
+        index = ids.get(symbol)
+        if index is None:
+            index = ids[symbol] = len(symbols)
+            symbols.append(symbol)
+            self._grow_latest()
+        return index
+
+    def _market_id(self, symbol: str) -> int:
+        return self._intern(symbol, self._market_ids, self.market_symbols)
+
+    def _good_id(self, symbol: str) -> int:
+        return self._intern(symbol, self._good_ids, self.good_symbols)
+
+    def _set_latest(self, market_id: int, good_id: int, row: Tuple) -> None:
+        held = self._latest["time"][market_id, good_id]
+        if held == held and held > row[0]:
+            return
+        for matrix, value in zip(self._latest.values(), row):
+            matrix[market_id, good_id] = value
+
+    def record(self, market: dict, at: Optional[float] = None) -> int:
+        """Append the trade goods of a `/market` response; returns how many observations it held"""
+        trade_goods = market.get("tradeGoods") or []
+        if not trade_goods:
+            # Upstream only reports prices to a ship at the market
+            return 0
+        at = time.time() if at is None else at
+        market_id = self._market_id(market["symbol"])
+        for good in trade_goods:
+            good_id = self._good_id(good["symbol"])
+            series = self._series.get((market_id, good_id))
+            if series is None:
+                series = self._series[(market_id, good_id)] = _Series()
+            # The wall clock can step back; keep the series in order
+            t = max(at, series.view("time")[-1]) if series.size else at
+            row = (t, good.get("purchasePrice", 0), good.get("sellPrice", 0), good.get("tradeVolume", 0),
+                   _SUPPLY_CODES.get(good.get("supply"), -1))
+            series.append(row)
+            self._set_latest(market_id, good_id, row)
+        self.rows += len(trade_goods)
+        return len(trade_goods)
+
+    def extend(self, market_symbols: Sequence[str], good_symbols: Sequence[str],
+               markets: np.ndarray, goods: np.ndarray, values: Dict[str, np.ndarray]) -> int:
+        """Bulk-append rows whose market and good are indexes into `market_symbols` and `good_symbols`"""
+        if not len(markets):
+            return 0
+        market_ids = np.array([self._market_id(symbol) for symbol in market_symbols], dtype=np.int64)[markets]
+        good_ids = np.array([self._good_id(symbol) for symbol in good_symbols], dtype=np.int64)[goods]
+        values = {name: np.asarray(values[name], dtype) for name, dtype in COLUMNS.items()}
+        keys = market_ids << 16 | good_ids
+        order = np.lexsort((values["time"], keys))
+        keys = keys[order]
+        values = {name: column[order] for name, column in values.items()}
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1, [len(keys)]))
+        for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            key = (int(keys[lo]) >> 16, int(keys[lo]) & 0xFFFF)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(hi - lo)
+            series.extend({name: column[lo:hi] for name, column in values.items()})
+            self._set_latest(*key, tuple(column[hi - 1] for column in values.values()))
+        self.rows += len(keys)
+        return len(keys)
+
+    def _get_series(self, market_symbol: str, good_symbol: str) -> Optional[_Series]:
+        market_id = self._market_ids.get(market_symbol)
+        good_id = self._good_ids.get(good_symbol)
+        if market_id is None or good_id is None:
+            return None
+        return self._series.get((market_id, good_id))
+
+    def history(self, market_symbol: str, good_symbol: str, start: Optional[float] = None,
+                end: Optional[float] = None, points: int = 200) -> Optional[List[dict]]:
+        """A good's observations at a market between `start` and `end`, averaged into at most
+        `points` equal-time buckets (with each bucket's price range); None if never observed"""
+        series = self._get_series(market_symbol, good_symbol)
+        if series is None:
+            return None
+        times = series.view("time")
+        lo = 0 if start is None else int(np.searchsorted(times, start, "left"))
+        hi = len(times) if end is None else int(np.searchsorted(times, end, "right"))
+        if hi <= lo:
+            return []
+        t = times[lo:hi]
+        count = hi - lo
+        if count <= points:
+            starts = np.arange(count)
+        else:
+            edges = np.linspace(t[0], t[-1], max(points, 1) + 1)[1:-1]
+            # Empty buckets collapse into their neighbour's start and are dropped
+            starts = np.unique(np.concatenate(([0], np.searchsorted(t, edges, "left"))))
+        counts = np.diff(np.append(starts, count))
+        lasts = starts + counts - 1
+        out = {"time": np.add.reduceat(t, starts) / counts, "observations": counts}
+        for name, field in (("purchasePrice", "purchase"), ("sellPrice", "sell")):
+            column = series.view(name)[lo:hi]
+            out[name] = np.round(np.add.reduceat(column, starts, dtype=np.float64) / counts, 1)
+            out[field + "Low"] = np.minimum.reduceat(column, starts)
+            out[field + "High"] = np.maximum.reduceat(column, starts)
+        out["tradeVolume"] = series.view("tradeVolume")[lo:hi][lasts]
+        supply = series.view("supply")[lo:hi][lasts]
+        columns = {name: column.tolist() for name, column in out.items()}
+        columns["supply"] = [SUPPLY_LEVELS[code] if code >= 0 else None for code in supply.tolist()]
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+    def latest(self, market_symbol: str) -> Optional[List[dict]]:
+        """The most recent observation of every good seen at a market; None if never polled"""
+        market_id = self._market_ids.get(market_symbol)
+        if market_id is None:
+            return None
+        goods = []
+        for good_id, good_symbol in enumerate(self.good_symbols):
+            at = self._latest["time"][market_id, good_id]
+            if at != at:
+                continue
+            supply = int(self._latest["supply"][market_id, good_id])
+            goods.append({
+                "symbol": good_symbol,
+                "purchasePrice": int(self._latest["purchasePrice"][market_id, good_id]),
+                "sellPrice": int(self._latest["sellPrice"][market_id, good_id]),
+                "tradeVolume": int(self._latest["tradeVolume"][market_id, good_id]),
+                "supply": SUPPLY_LEVELS[supply] if supply >= 0 else None,
+                "time": float(at),
+            })
+        return goods
+
+    def market_index(self, market_symbols: Sequence[str]) -> np.ndarray:
+        """Rows of `snapshot()` matrices for each market symbol, -1 for markets never observed"""
+        ids = self._market_ids
+        return np.array([ids.get(symbol, -1) for symbol in market_symbols], dtype=np.int64)
+
+    def snapshot(self) -> Dict[str, object]:
+        """Latest-observation matrices (market × good, NaN time where never seen) with their symbols"""
+        shape = (slice(len(self.market_symbols)), slice(len(self.good_symbols)))
+        return dict({name: matrix[shape] for name, matrix in self._latest.items()},
+                    markets=list(self.market_symbols), goods=list(self.good_symbols))
+
+    def markets(self) -> List[dict]:
+        """Every market with observations: goods seen, observations and when it was last polled"""
+        per_market: Dict[int, List[_Series]] = {}
+        for (market_id, _), series in self._series.items():
+            per_market.setdefault(market_id, []).append(series)
+        return [
+            {
+                "symbol": self.market_symbols[market_id],
+                "goods": len(held),
+                "observations": sum(series.size for series in held),
+                "lastSeen": float(np.nanmax(self._latest["time"][market_id])),
+            }
+            for market_id, held in sorted(per_market.items(), key=lambda item: self.market_symbols[item[0]])
+        ]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Every observation as the flat arrays `save` writes, all copies of the store's own"""
+        keys = list(self._series)
+        sizes = np.array([self._series[key].size for key in keys], dtype=np.int64)
+        columns = {name: np.concatenate([self._series[key].view(name) for key in keys] or [np.empty(0, dtype)])
+                   for name, dtype in COLUMNS.items()}
+        return dict(
+            market=np.repeat(np.array([key[0] for key in keys], dtype=np.int32), sizes),
+            good=np.repeat(np.array([key[1] for key in keys], dtype=np.int16), sizes),
+            market_symbols=np.array(self.market_symbols, dtype=str),
+            good_symbols=np.array(self.good_symbols, dtype=str),
+            **columns,
+        )
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write every observation to `path` (default: the store's), replacing the file atomically"""
+        path = path or self.path
+        if not path:
+            return
+        write_history(path, self.arrays())
+        self.saved_at = time.time()
+
+    def load(self, path: Optional[str] = None) -> int:
+        """Append the observations saved at `path` (default: the store's); returns how many, 0 if none"""
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return 0
+        with np.load(path) as saved:
+            return self.extend(saved["market_symbols"].tolist(), saved["good_symbols"].tolist(),
+                               saved["market"], saved["good"], {name: saved[name] for name in COLUMNS})
+
+    def stats(self) -> dict:
+        return {
+            "observations": self.rows,
+            "markets": len(self.market_symbols),
+            "goods": len(self.good_symbols),
+            "series": len(self._series),
+            "bytes": sum(series.nbytes for series in self._series.values()),
+            "path": self.path,
+            "savedAt": self.saved_at,
+        }
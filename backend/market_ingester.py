@@ -0,0 +1,155 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Set
+
+import httpx
+
+from .fleet_store import FleetStore
+from .galaxy_store import GalaxyStore
+from .market_history import MarketHistory, write_history
+from .rate_limiter import Lane
+
+class MarketIngester:
+    """Polls every known marketplace's `/market` into a `MarketHistory`.
+
+    Known marketplaces are the stored waypoints with the MARKETPLACE trait,
+    which the galaxy crawler's waypoint pass and waypoint reads fill in (in
+    demo mode, every system of the mock galaxy, listed once). The list is
+    re-read only when the stored waypoint count changes. Upstream only shows prices
+    to a ship at the market, so each round polls the markets with a ship
+    present first, then the rest, least recently polled first. Polls are
+    spaced to at most `rate` per second and go through the shared upstream
+    client in its background lane, so ship commands never queue behind
+    them; a round starts at most every `interval` seconds. Demo mode reads
+    `source` (the mock galaxy) instead.
+    """
+
+    def __init__(self, history: MarketHistory, galaxy: GalaxyStore, fleet: FleetStore, api_url: str, token: str,
+                 interval: float = 300.0, rate: float = 0.5, source=None):
+        self.history = history
+        self.galaxy = galaxy
+        self.fleet = fleet
+        self.api_url = api_url
+        self.token = token
+        self.interval = interval
+        self.rate = rate
+        self.source = source
+        self.task: Optional[asyncio.Task] = None
+        self.state = "idle"
+        self.rounds = 0
+        self.polls = 0
+        self.observations = 0
+        self.errors = 0
+        self.last_error: Optional[dict] = None
+        self._polled: Dict[str, float] = {}
+        self._targets = 0
+        self._markets: Set[str] = set()
+        self._markets_waypoints: Optional[int] = None
+
+    async def refresh_markets(self) -> None:
+        """Re-list the known marketplaces if waypoints were stored since the last listing"""
+        if self.source is not None:
+            if self._markets_waypoints is None:
+                # The whole mock galaxy is known and never changes; generate it a system at a time
+                for system_symbol in self.source.system_symbols:
+                    self._markets.update(
+                        waypoint["symbol"] for waypoint in self.source.waypoints(system_symbol)
+                        if any(trait["symbol"] == "MARKETPLACE" for trait in waypoint["traits"])
+                    )
+                    await asyncio.sleep(0)
+                self._markets_waypoints = self.source.waypoint_total
+            return
+        count = self.galaxy.waypoint_count()
+        if count != self._markets_waypoints:
+            self._markets = set(self.galaxy.trait_waypoints("MARKETPLACE"))
+            self._markets_waypoints = count
+
+    def targets(self) -> List[str]:
+        """Marketplaces to poll this round, those with a ship present first"""
+        markets = self._markets
+        present = {ship["nav"]["waypointSymbol"] for ship in self.fleet.all()} & markets
+        others = markets - present
+        return sorted(present) + sorted(others, key=lambda symbol: self._polled.get(symbol, 0.0))
+
+    async def _fetch(self, client: httpx.AsyncClient, waypoint_symbol: str) -> Optional[dict]:
+        if self.source is not None:
+            return self.source.market(waypoint_symbol)
+        system_symbol = waypoint_symbol.rsplit("-", 1)[0]
+        response = await client.get(
+            f"{self.api_url}/systems/{system_symbol}/waypoints/{waypoint_symbol}/market",
+            headers={"Authorization": f"Bearer {self.token}"},
+            # Prices are the point, so never a cached copy
+            extensions={"cache": False, "lane": Lane.BACKGROUND},
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()["data"]
+
+    async def poll(self, client: httpx.AsyncClient, waypoint_symbol: str) -> int:
+        """Fetch one market and record its prices; returns the observations added"""
+        market = await self._fetch(client, waypoint_symbol)
+        self._polled[waypoint_symbol] = time.monotonic()
+        self.polls += 1
+        added = self.history.record(market) if market else 0
+        self.observations += added
+        return added
+
+    async def _run(self, client: httpx.AsyncClient) -> None:
+        try:
+            while True:
+                started = time.monotonic()
+                self.state = "polling"
+                await self.refresh_markets()
+                targets = self.targets()
+                self._targets = len(targets)
+                for waypoint_symbol in targets:
+                    try:
+                        await self.poll(client, waypoint_symbol)
+                    except Exception as e:
+                        self.errors += 1
+                        self.last_error = {"market": waypoint_symbol, "detail": str(e) or type(e).__name__, "at": time.time()}
+                    if self.rate > 0:
+                        await asyncio.sleep(1 / self.rate)
+                self.rounds += 1
+                if self.history.path:
+                    # Copied here, since polls keep appending on the loop, then written off it:
+                    # millions of rows take a moment to write
+                    arrays = self.history.arrays()
+                    await asyncio.to_thread(write_history, self.history.path, arrays)
+                    self.history.saved_at = time.time()
+                self.state = "waiting"
+                await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        except asyncio.CancelledError:
+            self.state = "stopped"
+            raise
+
+    def start(self, client: httpx.AsyncClient) -> None:
+        """Start polling in the background unless already running"""
+        if self.task is not None and not self.task.done():
+            return
+        self.task = asyncio.create_task(self._run(client))
+
+    async def stop(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.history.save()
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "running": self.task is not None and not self.task.done(),
+            "markets": self._targets,
+            "rounds": self.rounds,
+            "polls": self.polls,
+            "observations": self.observations,
+            "errors": self.errors,
+            "lastError": self.last_error,
+            "intervalSeconds": self.interval,
+            "ratePerSecond": self.rate,
+            "history": self.history.stats(),
+        }
@@ -0,0 +1,177 @@
+import re
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+# Seconds; spans cache hits (sub-millisecond) through slow upstream calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Upstream path segments that name a resource, and the placeholder the spec uses for them
+_SYMBOL_SEGMENT = re.compile(r"/(ships|systems|waypoints|factions|agents|contracts|crew)/(?!hire(?:/|$))([^/]+)")
+_PLACEHOLDERS = {
+    "ships": "{shipSymbol}", "systems": "{systemSymbol}", "waypoints": "{waypointSymbol}",
+    "factions": "{factionSymbol}", "agents": "{agentSymbol}", "contracts": "{contractId}", "crew": "{crewSymbol}",
+}
+
+@lru_cache(maxsize=4096)
+def upstream_path_template(path: str, base_path: str = "") -> str:
+    """Collapse an upstream path to its spec template, e.g. /v2/my/ships/X-1/dock -> /my/ships/{shipSymbol}/dock"""
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    return _SYMBOL_SEGMENT.sub(lambda m: f"/{m.group(1)}/{_PLACEHOLDERS[m.group(1)]}", path) or "/"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names: Sequence[str], values: Sequence) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    """Prometheus-style histogram family: one set of bucket counters per label combination.
+
+    `observe` is a dict lookup, a bisect and three additions; buckets are made
+    cumulative only when rendered.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._children: Dict[Tuple, list] = {}
+
+    def observe(self, labels: Tuple, value: float) -> None:
+        child = self._children.get(labels)
+        if child is None:
+            # [per-bucket counts..., +Inf count, sum, count]
+            child = self._children[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        child[bisect_left(self.buckets, value)] += 1
+        child[-2] += value
+        child[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        bounds = [_number(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, child in sorted(self._children.items(), key=lambda item: tuple(map(str, item[0]))):
+            prefix = _labels(self.labelnames, labels)
+            cumulative = 0
+            for bound, count in zip(bounds, child):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{prefix}}} {child[-2]!r}")
+            lines.append(f"{self.name}_count{{{prefix}}} {child[-1]}")
+        return lines
+
+def render_samples(name: str, kind: str, help: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """Text-format lines for a gauge or counter given (labels, value) samples"""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        suffix = "{" + _labels(list(labels), list(labels.values())) + "}" if labels else ""
+        lines.append(f"{name}{suffix} {_number(value)}")
+    return lines
+
+class MetricsRegistry:
+    """Request and upstream latency histograms shared by the middleware and the upstream transport"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.requests = Histogram(
+            "http_request_duration_seconds", "Backend request latency by route template and status code.",
+            ("method", "route", "status"), buckets,
+        )
+        self.upstream = Histogram(
+            "upstream_request_duration_seconds",
+            "SpaceTraders call latency (to response headers) by path template and status code, excluding cache hits.",
+            ("method", "path", "status"), buckets,
+        )
+
+    def render(self) -> List[str]:
+        return self.requests.render() + self.upstream.render()
+
+class MetricsMiddleware:
+    """Pure ASGI middleware that times every HTTP request into `registry.requests`.
+
+    Requests are labelled with their route template (`/api/ships/{ship_symbol}`)
+    rather than the concrete path so ship symbols don't multiply the series;
+    paths that match no route share one label. Streaming responses are timed
+    until the stream ends.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+        self._routes: Dict[object, str] = {}
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        route = self._routes.get(endpoint)
+        if route is None:
+            # Routing stores the matched endpoint in the scope; map endpoints to their path templates once
+            self._routes = {
+                getattr(r, "endpoint", None): r.path for r in scope["app"].routes if hasattr(r, "path")
+            }
+            route = self._routes.get(endpoint, UNMATCHED_ROUTE)
+        return route
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.requests.observe(
+                (scope["method"], self._route(scope), status), time.perf_counter() - start
+            )
+
+class MetricsTransport(httpx.AsyncBaseTransport):
+    """httpx transport that times each call reaching the network into `registry.upstream`.
+
+    It sits innermost in the upstream chain, so cache hits and coalesced
+    waiters are not counted but every 429 retry is. `base_url` is stripped
+    from paths (e.g. the `/v2` prefix) before they are templated.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, registry: MetricsRegistry, base_url: str = ""):
+        self._transport = transport
+        self._registry = registry
+        self._base_path = urlsplit(base_url).path.rstrip("/")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        status = "error"  # No response: connect failure, timeout, ...
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = response.status_code
+            return response
+        finally:
+            self._registry.upstream.observe(
+                (request.method, upstream_path_template(request.url.path, self._base_path), status),
+                time.perf_counter() - start,
+            )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+# Process-wide registry fed by the middleware in main.py and the upstream client
+metrics = MetricsRegistry()
@@ -0,0 +1,260 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, Optional, Set, Tuple
+
+from fastapi import HTTPException
+
+from .cooldown_scheduler import Runner, cooldown_deadline, error_code, error_data
+from .fleet_store import FleetStore
+from .survey_store import SurveyStore, dead_survey_error
+
+# Sell error meaning the market doesn't buy the good (marketTradeNotSoldError)
+NOT_SOLD_CODE = 4602
+
+class MiningStopped(Exception):
+    """A condition the mining loop can't work its way out of"""
+
+class MiningJob:
+    __slots__ = ("ship_symbol", "mine_waypoint", "market_waypoint", "state", "started_at", "started",
+                 "stopped", "extractions", "yields", "units_sold", "credits", "surveys", "jettisoned",
+                 "errors", "last_error", "task")
+
+    def __init__(self, ship_symbol: str, mine_waypoint: str, market_waypoint: str):
+        self.ship_symbol = ship_symbol
+        self.mine_waypoint = mine_waypoint
+        self.market_waypoint = market_waypoint
+        self.state = "starting"
+        self.started_at = time.time()
+        self.started = time.monotonic()
+        self.stopped: Optional[float] = None
+        self.extractions = 0
+        self.yields: Counter = Counter()
+        self.units_sold = 0
+        self.credits = 0
+        self.surveys = 0
+        self.jettisoned = 0
+        self.errors = 0
+        self.last_error: Optional[dict] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def to_dict(self) -> dict:
+        seconds = (self.stopped or time.monotonic()) - self.started
+        hours = seconds / 3600 or 1e-9
+        units = sum(self.yields.values())
+        return {
+            "shipSymbol": self.ship_symbol,
+            "state": self.state,
+            "mineWaypoint": self.mine_waypoint,
+            "marketWaypoint": self.market_waypoint,
+            "startedAt": self.started_at,
+            "runningSeconds": round(seconds, 1),
+            "extractions": self.extractions,
+            "unitsExtracted": units,
+            "yields": dict(self.yields),
+            "unitsSold": self.units_sold,
+            "creditsEarned": self.credits,
+            "unitsJettisoned": self.jettisoned,
+            "surveys": self.surveys,
+            "unitsPerHour": round(units / hours, 1),
+            "creditsPerHour": round(self.credits / hours, 1),
+            "errors": self.errors,
+            "lastError": self.last_error,
+        }
+
+class MiningEngine:
+    """Survey → extract → sell automation, one asyncio task per assigned ship.
+
+    Each step is an ordinary ship action registered by the routers (survey,
+    extract, sell, ...), so every call goes through the shared upstream
+    client and its rate limiter and every response lands in the `FleetStore`.
+    The loop reads the ship's cargo, nav and cooldown from the store and
+    sleeps out each cooldown instead of retrying into it. Ships with a
+    surveyor mount survey their waypoint whenever the `SurveyStore` has no
+    live survey of it and extract with its most valuable one; when the hold is full the ship flies to its
+    market (if that isn't where it mines), sells what it extracted, jettisons
+    what the market won't buy and goes back to mining.
+    """
+
+    def __init__(self, store: FleetStore, surveys: SurveyStore, max_errors: int = 5, error_backoff: float = 5.0):
+        self.store = store
+        self.surveys = surveys
+        self.max_errors = max_errors
+        self.error_backoff = error_backoff
+        self.actions: Dict[str, Runner] = {}
+        self.jobs: Dict[str, MiningJob] = {}
+        # Per-transaction limits learned from the markets' errors, by (waypoint, good)
+        self.trade_volumes: Dict[Tuple[str, str], int] = {}
+        self._extracted: Dict[str, Set[str]] = {}
+
+    def register(self, action: str, runner: Runner) -> None:
+        self.actions[action] = runner
+
+    def start(self, ship_symbol: str, market_waypoint: Optional[str] = None) -> MiningJob:
+        """Start mining at the ship's current waypoint; raises ValueError if it already is"""
+        job = self.jobs.get(ship_symbol)
+        if job is not None and job.active:
+            raise ValueError(f"{ship_symbol} is already mining")
+        ship = self.store.get(ship_symbol)
+        if ship is None:
+            raise KeyError(ship_symbol)
+        waypoint = ship["nav"]["waypointSymbol"]
+        job = self.jobs[ship_symbol] = MiningJob(ship_symbol, waypoint, market_waypoint or waypoint)
+        self._extracted.setdefault(ship_symbol, set())
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    async def stop_ship(self, ship_symbol: str) -> Optional[MiningJob]:
+        job = self.jobs.get(ship_symbol)
+        if job is None:
+            return None
+        if job.active:
+            job.task.cancel()
+            await asyncio.gather(job.task, return_exceptions=True)
+        return job
+
+    def stats(self) -> dict:
+        jobs = [job.to_dict() for job in self.jobs.values()]
+        return {
+            "ships": len(jobs),
+            "active": sum(1 for job in self.jobs.values() if job.active),
+            "unitsPerHour": round(sum(job["unitsPerHour"] for job in jobs if job["state"] != "stopped"), 1),
+            "creditsPerHour": round(sum(job["creditsPerHour"] for job in jobs if job["state"] != "stopped"), 1),
+            "jobs": jobs,
+        }
+
+    async def stop(self) -> None:
+        for ship_symbol in list(self.jobs):
+            await self.stop_ship(ship_symbol)
+
+    async def _run(self, job: MiningJob) -> None:
+        failures = 0
+        try:
+            while True:
+                try:
+                    await self._step(job)
+                    failures = 0
+                except MiningStopped as e:
+                    job.state = "failed"
+                    job.last_error = {"status": None, "detail": str(e), "at": time.time()}
+                    return
+                except Exception as e:
+                    status, detail = (e.status_code, e.detail) if isinstance(e, HTTPException) else (500, str(e))
+                    job.errors += 1
+                    job.last_error = {"status": status, "detail": detail, "at": time.time()}
+                    failures += 1
+                    if failures >= self.max_errors:
+                        job.state = "failed"
+                        return
+                    # A cooldown conflict reports when to try again; anything else backs off
+                    job.state = "backoff"
+                    cooldown = error_data(detail).get("cooldown")
+                    await self._sleep_until(cooldown_deadline(cooldown) if cooldown
+                                            else time.monotonic() + self.error_backoff * failures)
+        except asyncio.CancelledError:
+            job.state = "stopped"
+            raise
+        finally:
+            job.stopped = time.monotonic()
+
+    async def _step(self, job: MiningJob) -> None:
+        ship = self.store.get(job.ship_symbol)
+        if ship is None:
+            raise MiningStopped("Ship is no longer in the fleet")
+        nav, cargo = ship["nav"], ship["cargo"]
+        if nav["status"] == "IN_TRANSIT":
+            job.state = "traveling"
+            await self._sleep_until(cooldown_deadline({"expiration": nav.get("route", {}).get("arrival")}))
+            # The held nav still says IN_TRANSIT; orbiting on arrival refreshes it
+            await self.actions["orbit"](job.ship_symbol, {})
+        elif cargo["units"] >= cargo["capacity"]:
+            if nav["waypointSymbol"] != job.market_waypoint:
+                await self._travel(job, job.market_waypoint)
+            else:
+                await self._sell(job, ship)
+        elif nav["waypointSymbol"] != job.mine_waypoint:
+            await self._travel(job, job.mine_waypoint)
+        else:
+            await self._mine(job, ship)
+
+    async def _travel(self, job: MiningJob, waypoint_symbol: str) -> None:
+        if self.store.get(job.ship_symbol)["nav"]["status"] == "DOCKED":
+            await self.actions["orbit"](job.ship_symbol, {})
+        job.state = "traveling"
+        await self.actions["navigate"](job.ship_symbol, {"waypointSymbol": waypoint_symbol})
+
+    async def _wait_cooldown(self, job: MiningJob) -> None:
+        deadline = cooldown_deadline(self.store.get(job.ship_symbol).get("cooldown"))
+        if deadline > time.monotonic():
+            job.state = "cooldown"
+            await self._sleep_until(deadline)
+
+    async def _mine(self, job: MiningJob, ship: dict) -> None:
+        if ship["nav"]["status"] != "IN_ORBIT":
+            await self.actions["orbit"](job.ship_symbol, {})
+        survey = None
+        if any(mount["symbol"].startswith("MOUNT_SURVEYOR") for mount in ship.get("mounts") or []):
+            survey = self.surveys.best(job.mine_waypoint)
+            if survey is None:
+                await self._wait_cooldown(job)
+                job.state = "surveying"
+                # The survey handler adds the results to the survey store
+                await self.actions["survey"](job.ship_symbol, {})
+                job.surveys += 1
+                return
+        await self._wait_cooldown(job)
+        job.state = "extracting"
+        try:
+            body = await self.actions["extract"](job.ship_symbol, {"survey": survey} if survey else {})
+        except HTTPException as e:
+            if survey is not None and dead_survey_error(e.detail):
+                # Exhausted or expired: the extract handler dropped it from the store, so pick again
+                return
+            raise
+        extracted = body["data"]["extraction"]["yield"]
+        job.extractions += 1
+        job.yields[extracted["symbol"]] += extracted["units"]
+        self._extracted[job.ship_symbol].add(extracted["symbol"])
+
+    async def _sell(self, job: MiningJob, ship: dict) -> None:
+        if ship["nav"]["status"] != "DOCKED":
+            await self.actions["dock"](job.ship_symbol, {})
+        job.state = "selling"
+        extracted = self._extracted[job.ship_symbol]
+        goods = [(item["symbol"], item["units"]) for item in ship["cargo"]["inventory"] if item["symbol"] in extracted]
+        if not goods:
+            raise MiningStopped("Cargo hold is full of goods this ship didn't mine")
+        for symbol, units in goods:
+            await self._sell_good(job, ship["nav"]["waypointSymbol"], symbol, units)
+
+    async def _sell_good(self, job: MiningJob, waypoint_symbol: str, symbol: str, units: int) -> None:
+        while units > 0:
+            batch = min(units, self.trade_volumes.get((waypoint_symbol, symbol), units))
+            try:
+                body = await self.actions["sell"](job.ship_symbol, {"symbol": symbol, "units": batch})
+            except HTTPException as e:
+                volume = error_data(e.detail).get("tradeVolume")
+                if volume and volume < batch:
+                    # Over the market's per-transaction limit: sell in batches of it
+                    self.trade_volumes[(waypoint_symbol, symbol)] = volume
+                    continue
+                if e.status_code != 400 or error_code(e.detail) != NOT_SOLD_CODE:
+                    raise
+                # The market doesn't buy it; make room for goods it does
+                await self.actions["jettison"](job.ship_symbol, {"symbol": symbol, "units": units})
+                job.jettisoned += units
+                return
+            transaction = body["data"]["transaction"]
+            job.units_sold += transaction["units"]
+            job.credits += transaction["totalPrice"]
+            units -= batch
+
+    @staticmethod
+    async def _sleep_until(deadline: float) -> None:
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
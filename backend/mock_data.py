@@ -81,7 +81,8 @@ MOCK_SHIPS = [
             {"name": "Laser Cannon I", "symbol": "MOUNT_LASER_CANNON_I", "description": "Basic laser cannon"},
             {"name": "Missile Launcher I", "symbol": "MOUNT_MISSILE_LAUNCHER_I", "description": "Basic missile launcher"}
         ],
-        "cargo": {"units": 50, "capacity": 100, "inventory": [{"symbol": "FUEL", "units": 50}]}
+        "cargo": {"units": 50, "capacity": 100, "inventory": [{"symbol": "FUEL", "units": 50}]},
+        "fuel": {"current": 100, "capacity": 100, "consumed": {"amount": 0, "timestamp": "2023-11-01T00:00:00.000Z"}}
     }
 ]
 
@@ -408,6 +409,18 @@ MOCK_SURVEYS = [
     }
 ]
 
+# Cooldown set by a mock ship action
+def mock_cooldown(ship_symbol: str, seconds: int) -> dict:
+    """A cooldown starting now, as the live API reports one after an action"""
+    from datetime import datetime, timedelta, timezone
+    expiration = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+    return {
+        "shipSymbol": ship_symbol,
+        "totalSeconds": seconds,
+        "remainingSeconds": seconds,
+        "expiration": expiration.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    }
+
 # Mock resource data generator
 def generate_mock_resource_data(ship_symbol: str):
     import random
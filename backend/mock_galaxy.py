@@ -0,0 +1,387 @@
+import copy
+import itertools
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from .market_history import SUPPLY_LEVELS
+from .mock_data import MOCK_AVAILABLE_CREW, MOCK_EQUIPMENT, MOCK_SCAN_RESULTS, MOCK_SHIPS, MOCK_SYSTEMS, MOCK_WAYPOINTS
+
+# Relative odds of each generated waypoint type (every system also gets one jump gate)
+WAYPOINT_TYPES = {
+    "PLANET": 6, "MOON": 5, "ASTEROID": 8, "ASTEROID_FIELD": 2, "ENGINEERED_ASTEROID": 1,
+    "GAS_GIANT": 2, "ORBITAL_STATION": 2, "DEBRIS_FIELD": 1, "NEBULA": 1,
+}
+SYSTEM_TYPES = ["RED_STAR", "ORANGE_STAR", "BLUE_STAR", "YOUNG_STAR", "WHITE_DWARF", "NEUTRON_STAR", "UNSTABLE"]
+DEPOSIT_TRAITS = ["COMMON_METAL_DEPOSITS", "PRECIOUS_METAL_DEPOSITS", "RARE_METAL_DEPOSITS", "MINERAL_DEPOSITS", "ICE_CRYSTALS"]
+# Goods an extraction can yield at a waypoint with each deposit trait
+DEPOSIT_GOODS = {
+    "COMMON_METAL_DEPOSITS": ["IRON_ORE", "COPPER_ORE", "ALUMINUM_ORE", "QUARTZ_SAND"],
+    "PRECIOUS_METAL_DEPOSITS": ["PRECIOUS_STONES", "QUARTZ_SAND"],
+    "RARE_METAL_DEPOSITS": ["PRECIOUS_STONES", "SILICON_CRYSTALS", "COPPER_ORE"],
+    "MINERAL_DEPOSITS": ["SILICON_CRYSTALS", "QUARTZ_SAND"],
+    "ICE_CRYSTALS": ["ICE_WATER"],
+}
+SURVEY_SIZES = ["SMALL", "MODERATE", "LARGE"]
+SURFACE_TRAITS = ["FROZEN", "VOLCANIC", "BARREN", "OCEAN", "TEMPERATE", "TOXIC_ATMOSPHERE", "CORROSIVE_ATMOSPHERE"]
+TRADE_GOODS = {
+    "FUEL": 72, "IRON_ORE": 18, "COPPER_ORE": 24, "ALUMINUM_ORE": 30, "SILICON_CRYSTALS": 32,
+    "QUARTZ_SAND": 20, "ICE_WATER": 12, "PRECIOUS_STONES": 90, "IRON": 60, "COPPER": 70,
+    "ALUMINUM": 80, "FOOD": 40, "MEDICINE": 210, "MACHINERY": 260, "ELECTRONICS": 390,
+}
+SHIP_ROLES = ["COMMAND", "EXCAVATOR", "HAULER", "SATELLITE", "EXPLORER", "TRADER"]
+# Other ships a short-range scan can pick up
+SCANNED_FRAMES = ["FRAME_PROBE", "FRAME_DRONE", "FRAME_LIGHT_FREIGHTER", "FRAME_MINER", "FRAME_INTERCEPTOR", "FRAME_FRIGATE"]
+SCANNED_ROLES = ["TRADER", "HAULER", "EXCAVATOR", "PATROL", "EXPLORER"]
+FACTIONS = ["COSMIC", "GALACTIC", "QUANTUM", "DOMINION", "ASTRO"]
+THREAT_LEVELS = ["LOW", "LOW", "MEDIUM", "HIGH"]
+CREW_ROLES = {
+    "GUNNER": ("combat", "weapons", "tactics"),
+    "MEDIC": ("medicine", "surgery", "biology"),
+    "MINER": ("mining", "geology", "equipment"),
+    "SECURITY": ("security", "combat", "investigation"),
+    "ENGINEER": ("repair", "power", "navigation"),
+}
+FIRST_NAMES = ["Ada", "Bram", "Cleo", "Dax", "Esme", "Finn", "Gia", "Hal", "Iris", "Jun", "Kai", "Lena", "Milo", "Nia", "Oren", "Pia"]
+LAST_NAMES = ["Okafor", "Lindqvist", "Moreau", "Tanaka", "Reyes", "Novak", "Haddad", "Brennan", "Sato", "Kowalski", "Adeyemi", "Varga"]
+
+def _trait(symbol: str) -> dict:
+    name = symbol.replace("_", " ").title()
+    return {"symbol": symbol, "name": name, "description": f"{name}."}
+
+def _base36(value: int) -> str:
+    digits = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    out = ""
+    while value:
+        value, digit = divmod(value, 36)
+        out = digits[digit] + out
+    return out or "0"
+
+def _waypoint_symbol(system_symbol: str, i: int) -> str:
+    # A1..A100, B1..B100, ... Z100, then plain indexes once the letters run out
+    if i < 2600:
+        return f"{system_symbol}-{chr(65 + i // 100)}{i % 100 + 1}"
+    return f"{system_symbol}-W{i}"
+
+class MockGalaxy:
+    """Seeded procedural galaxy, fleet and crew pool served by demo mode.
+
+    The hand-written demo data stays at the front: system X1-DF55 with its
+    five waypoints, ship DEMO_SHIP_1, the four hireable crew, the ships a
+    scan picks up there and the equipment catalogue. Further
+    systems are named on from it (X1-DF56, X1-DF57, ...) and each one's
+    details and waypoints are generated only when first asked for, from a
+    random stream seeded by `seed` and the system symbol, so the same seed
+    always gives the same galaxy and a galaxy of 100k waypoints costs nothing
+    until it is explored. The fleet, crew pool and contract offers are small
+    and built up front.
+    """
+
+    def __init__(self, seed: int = 1, systems: int = 3, waypoints_per_system: int = 12, ships: int = 1,
+                 market_share: float = 0.2, crew: int = 4, contracts: int = 3):
+        self.seed = seed
+        self.waypoints_per_system = waypoints_per_system
+        self.market_share = market_share
+        first = MOCK_SYSTEMS[0]["symbol"]
+        sector, name = first.split("-")
+        start = int(name, 36)
+        self.system_symbols = [first] + [f"{sector}-{_base36(start + i)}" for i in range(1, max(systems, 1))]
+        self._positions = {symbol: i for i, symbol in enumerate(self.system_symbols)}
+        # Spread systems so their density stays about the same as the galaxy grows
+        self.galaxy_radius = max(1000.0, 150.0 * math.sqrt(len(self.system_symbols)))
+        self.system_radius = max(200.0, 40.0 * math.sqrt(waypoints_per_system))
+        self._headers: Dict[str, dict] = {}
+        self._systems: Dict[str, dict] = {}
+        self._waypoints: Dict[str, List[dict]] = {}
+        self._waypoints_by_symbol: Dict[str, dict] = {}
+        self._survey_ids = itertools.count(1)
+        self.available_crew = self._generate_crew(crew)
+        self.equipment = copy.deepcopy(MOCK_EQUIPMENT)
+        self._ships = self._generate_ships(ships)
+        self._contracts = self._generate_contracts(contracts)
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(":".join(str(part) for part in (self.seed,) + key))
+
+    def __contains__(self, system_symbol: str) -> bool:
+        return system_symbol in self._positions
+
+    @property
+    def waypoint_total(self) -> int:
+        return len(MOCK_WAYPOINTS) + (len(self.system_symbols) - 1) * self.waypoints_per_system
+
+    def _header(self, system_symbol: str) -> dict:
+        """A system without its waypoint list, which is all scans and distance checks need"""
+        header = self._headers.get(system_symbol)
+        if header is None:
+            if self._positions[system_symbol] == 0:
+                header = {key: value for key, value in MOCK_SYSTEMS[0].items() if key != "waypoints"}
+            else:
+                rng = self._rng("system", system_symbol)
+                angle = rng.uniform(0, 2 * math.pi)
+                distance = self.galaxy_radius * math.sqrt(rng.random())
+                header = {
+                    "symbol": system_symbol,
+                    "sectorSymbol": system_symbol.split("-")[0],
+                    "type": rng.choice(SYSTEM_TYPES),
+                    "x": round(distance * math.cos(angle)),
+                    "y": round(distance * math.sin(angle)),
+                    "factions": [{"symbol": "COSMIC"}] if rng.random() < 0.3 else [],
+                }
+            self._headers[system_symbol] = header
+        return header
+
+    def system(self, system_symbol: str) -> Optional[dict]:
+        """A system with its waypoint summaries, generated on first use; None if it isn't in the galaxy"""
+        if system_symbol not in self._positions:
+            return None
+        system = self._systems.get(system_symbol)
+        if system is None:
+            system = dict(self._header(system_symbol), waypoints=[
+                {"symbol": w["symbol"], "type": w["type"], "x": w["x"], "y": w["y"]}
+                for w in self.waypoints(system_symbol)
+            ])
+            self._systems[system_symbol] = system
+        return system
+
+    def nearby_systems(self, system_symbol: str, limit: int = 5) -> List[dict]:
+        """The `limit` systems closest to a system, with distances, as a long-range scan reports them"""
+        if system_symbol not in self._positions:
+            return []
+        origin = self._header(system_symbol)
+        found = []
+        for symbol in self.system_symbols:
+            if symbol != system_symbol:
+                header = self._header(symbol)
+                found.append((math.hypot(header["x"] - origin["x"], header["y"] - origin["y"]), header))
+        found.sort(key=lambda item: item[0])
+        return [
+            {key: header[key] for key in ("symbol", "sectorSymbol", "type", "x", "y")} | {"distance": round(distance, 1)}
+            for distance, header in found[:limit]
+        ]
+
+    def headers(self) -> List[dict]:
+        """Every system without its waypoint list, so the whole galaxy is listed without generating any waypoints"""
+        return [self._header(symbol) for symbol in self.system_symbols]
+
+    def systems(self) -> List[dict]:
+        """Every system (generating any not yet seen, so this is the one call that walks the whole galaxy)"""
+        return [self.system(symbol) for symbol in self.system_symbols]
+
+    def waypoints(self, system_symbol: str) -> List[dict]:
+        """A system's waypoints, generated on first use; empty for systems outside the galaxy"""
+        waypoints = self._waypoints.get(system_symbol)
+        if waypoints is None:
+            if system_symbol not in self._positions:
+                return []
+            if self._positions[system_symbol] == 0:
+                waypoints = copy.deepcopy(MOCK_WAYPOINTS)
+            else:
+                waypoints = self._generate_waypoints(system_symbol)
+            self._waypoints[system_symbol] = waypoints
+            for waypoint in waypoints:
+                self._waypoints_by_symbol[waypoint["symbol"]] = waypoint
+        return waypoints
+
+    def waypoint(self, waypoint_symbol: str) -> Optional[dict]:
+        """Look a waypoint up by symbol, generating its system if needed"""
+        self.waypoints(waypoint_symbol.rsplit("-", 1)[0])
+        return self._waypoints_by_symbol.get(waypoint_symbol)
+
+    def _generate_waypoints(self, system_symbol: str) -> List[dict]:
+        rng = self._rng("waypoints", system_symbol)
+        types, weights = list(WAYPOINT_TYPES), list(WAYPOINT_TYPES.values())
+        waypoints = []
+        for i in range(self.waypoints_per_system):
+            waypoint_type = "JUMP_GATE" if i == 0 else rng.choices(types, weights)[0]
+            angle = rng.uniform(0, 2 * math.pi)
+            distance = self.system_radius * math.sqrt(rng.random())
+            traits = []
+            if waypoint_type in ("ASTEROID", "ASTEROID_FIELD", "ENGINEERED_ASTEROID", "MOON"):
+                traits += [_trait(symbol) for symbol in rng.sample(DEPOSIT_TRAITS, rng.randint(1, 2))]
+            elif waypoint_type in ("PLANET", "GAS_GIANT"):
+                traits.append(_trait(rng.choice(SURFACE_TRAITS)))
+            if waypoint_type != "JUMP_GATE" and rng.random() < self.market_share:
+                traits.append(_trait("MARKETPLACE"))
+                if rng.random() < 0.25:
+                    traits.append(_trait("SHIPYARD"))
+            waypoint = {
+                "symbol": _waypoint_symbol(system_symbol, i),
+                "type": waypoint_type,
+                "systemSymbol": system_symbol,
+                "x": round(distance * math.cos(angle)),
+                "y": round(distance * math.sin(angle)),
+                "orbitals": [],
+                "traits": traits,
+            }
+            waypoints.append(waypoint)
+        return waypoints
+
+    def market(self, waypoint_symbol: str) -> Optional[dict]:
+        """Trade goods and prices of a marketplace waypoint; None for anything else"""
+        waypoint = self.waypoint(waypoint_symbol)
+        if waypoint is None or not any(trait["symbol"] == "MARKETPLACE" for trait in waypoint["traits"]):
+            return None
+        rng = self._rng("market", waypoint_symbol)
+        goods = ["FUEL"] + rng.sample(sorted(set(TRADE_GOODS) - {"FUEL"}), rng.randint(3, 8))
+        now = time.time()
+        trade_goods = []
+        for symbol in goods:
+            # Each price swings ±15% around the market's own level over a few hours, so
+            # polled price history has trends to chart; scarcer when dearer
+            swing = math.sin(2 * math.pi * now / rng.uniform(3600, 4 * 3600) + rng.uniform(0, 2 * math.pi))
+            price = max(1, round(TRADE_GOODS[symbol] * rng.uniform(0.7, 1.4) * (1 + 0.15 * swing)))
+            trade_goods.append({
+                "symbol": symbol,
+                "tradeVolume": rng.choice([10, 20, 40, 60, 100]),
+                "supply": SUPPLY_LEVELS[min(4, int((1 - swing) * 2.5))],
+                "purchasePrice": price,
+                "sellPrice": max(1, round(price * rng.uniform(0.85, 0.97))),
+            })
+        return {
+            "symbol": waypoint_symbol,
+            "exports": [{"symbol": symbol} for symbol in goods[1:2]],
+            "imports": [{"symbol": symbol} for symbol in goods[2:3]],
+            "exchange": [{"symbol": "FUEL"}],
+            "tradeGoods": trade_goods,
+        }
+
+    def deposits(self, waypoint_symbol: str) -> List[str]:
+        """Goods that can be extracted at a waypoint, from its deposit traits"""
+        waypoint = self.waypoint(waypoint_symbol)
+        goods = []
+        for trait in waypoint["traits"] if waypoint else []:
+            goods += [symbol for symbol in DEPOSIT_GOODS.get(trait["symbol"], []) if symbol not in goods]
+        return goods
+
+    def surveys(self, waypoint_symbol: str, count: int = 3, lifetime: int = 900) -> List[dict]:
+        """Fresh surveys of a waypoint's deposits, expiring `lifetime` seconds from now"""
+        goods = self.deposits(waypoint_symbol)
+        if not goods:
+            return []
+        expiration = datetime.now(timezone.utc) + timedelta(seconds=lifetime)
+        surveys = []
+        for _ in range(count):
+            deposits = [random.choice(goods) for _ in range(random.randint(3, 7))]
+            surveys.append({
+                "signature": f"{waypoint_symbol}-{next(self._survey_ids):05X}",
+                "symbol": waypoint_symbol,
+                "deposits": [{"symbol": symbol} for symbol in deposits],
+                "expiration": expiration.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+                "size": random.choice(SURVEY_SIZES),
+            })
+        return surveys
+
+    def scanned_ships(self, waypoint_symbol: str) -> List[dict]:
+        """Other ships in a waypoint's system as a short-range scan reports them, the same on every scan"""
+        origin = self.waypoint(waypoint_symbol)
+        if origin is None:
+            return []
+        system_symbol = origin["systemSymbol"]
+        if self._positions[system_symbol] == 0:
+            return copy.deepcopy(MOCK_SCAN_RESULTS["ships"])
+        rng = self._rng("scan", system_symbol)
+        ships = []
+        for n in range(1, rng.randint(0, 4) + 1):
+            waypoint = rng.choice(self.waypoints(system_symbol))
+            capacity = rng.choice([0, 20, 40, 80, 120])
+            ships.append({
+                "symbol": f"{system_symbol}-CONTACT-{n}",
+                "registration": {"factionSymbol": rng.choice(FACTIONS), "role": rng.choice(SCANNED_ROLES)},
+                "nav": {"waypointSymbol": waypoint["symbol"], "status": rng.choice(["DOCKED", "IN_ORBIT", "IN_TRANSIT"])},
+                "frame": {"symbol": rng.choice(SCANNED_FRAMES)},
+                "cargo": {"units": rng.randint(0, capacity), "capacity": capacity},
+                "threat_level": rng.choice(THREAT_LEVELS),
+                "distance": round(math.hypot(waypoint["x"] - origin["x"], waypoint["y"] - origin["y"]), 1),
+            })
+        ships.sort(key=lambda ship: ship["distance"])
+        return ships
+
+    def ships(self) -> List[dict]:
+        return self._ships
+
+    def _generate_ships(self, count: int) -> List[dict]:
+        ships = copy.deepcopy(MOCK_SHIPS[:max(count, 1)])
+        # Generated ships start spread over a handful of home systems, like a real fleet
+        homes = self.system_symbols[:4]
+        for n in range(len(ships) + 1, count + 1):
+            rng = self._rng("ship", n)
+            waypoint = rng.choice(self.waypoints(rng.choice(homes)))
+            location = {key: waypoint[key] for key in ("symbol", "type", "systemSymbol", "x", "y")}
+            role = SHIP_ROLES[n % len(SHIP_ROLES)]
+            ship = copy.deepcopy(MOCK_SHIPS[0])
+            fuel_capacity = 0 if role == "SATELLITE" else rng.choice([100, 400, 800, 1200])
+            cargo_capacity = rng.choice([0, 40, 60, 80, 120])
+            units = rng.randint(0, cargo_capacity)
+            ship.update({
+                "symbol": f"DEMO_SHIP_{n}",
+                "registration": {"name": f"Demo {role.title()} {n}", "role": role},
+                "crew": {"current": rng.randint(0, 4), "capacity": 4},
+                "engine": dict(ship["engine"], speed=rng.choice([3, 10, 15, 25, 30, 36])),
+                "cargo": {"units": units, "capacity": cargo_capacity,
+                          "inventory": [{"symbol": rng.choice(list(TRADE_GOODS)), "units": units}] if units else []},
+                "fuel": dict(ship["fuel"], current=rng.randint(fuel_capacity // 4, fuel_capacity), capacity=fuel_capacity),
+            })
+            ship["nav"].update({
+                "status": rng.choice(["DOCKED", "IN_ORBIT"]),
+                "waypointSymbol": waypoint["symbol"],
+                "systemSymbol": waypoint["systemSymbol"],
+            })
+            ship["nav"]["route"].update({"destination": location, "origin": dict(location)})
+            ships.append(ship)
+        return ships
+
+    def contracts(self) -> List[dict]:
+        return self._contracts
+
+    def _generate_contracts(self, count: int) -> List[dict]:
+        """Procurement offers for goods sold in the home systems, delivered elsewhere in the same system"""
+        contracts = []
+        now = datetime.now(timezone.utc)
+        for n in range(1, count + 1):
+            rng = self._rng("contract", n)
+            system_symbol = self.system_symbols[(n - 1) % min(3, len(self.system_symbols))]
+            waypoints = [w for w in self.waypoints(system_symbol) if w["type"] != "JUMP_GATE"]
+            sold = sorted({good["symbol"] for w in waypoints for good in (self.market(w["symbol"]) or {}).get("tradeGoods", [])
+                           if good["symbol"] != "FUEL"})
+            deliver = []
+            for symbol in rng.sample(sold or sorted(set(TRADE_GOODS) - {"FUEL"}), 1 if rng.random() < 0.7 else 2):
+                deliver.append({"tradeSymbol": symbol, "destinationSymbol": rng.choice(waypoints)["symbol"],
+                                "unitsRequired": rng.choice([20, 40, 60, 80, 120]), "unitsFulfilled": 0})
+            value = sum(TRADE_GOODS.get(term["tradeSymbol"], 50) * term["unitsRequired"] for term in deliver)
+            payment = round(value * rng.uniform(1.2, 2.0))
+            offer_ends = (now + timedelta(days=1)).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+            contracts.append({
+                "id": f"demo-contract-{n}",
+                "factionSymbol": "COSMIC",
+                "type": "PROCUREMENT",
+                "terms": {
+                    "deadline": (now + timedelta(days=7)).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+                    "payment": {"onAccepted": payment // 5, "onFulfilled": payment - payment // 5},
+                    "deliver": deliver,
+                },
+                "accepted": False,
+                "fulfilled": False,
+                "expiration": offer_ends,
+                "deadlineToAccept": offer_ends,
+            })
+        return contracts
+
+    def _generate_crew(self, count: int) -> List[dict]:
+        crew = copy.deepcopy(MOCK_AVAILABLE_CREW[:count])
+        roles = list(CREW_ROLES)
+        for n in range(len(crew) + 1, count + 1):
+            rng = self._rng("crew", n)
+            role = rng.choice(roles)
+            level = rng.randint(1, 5)
+            crew.append({
+                "id": f"hire_{n:03d}",
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "role": role,
+                "level": level,
+                "skills": {skill: min(100, rng.randint(40, 70) + 5 * level) for skill in CREW_ROLES[role]},
+                "salary": 60 + 20 * level,
+            })
+        return crew
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 # Basic models
 class Agent(BaseModel):
@@ -82,8 +82,9 @@ class CrewTrainingFacility(BaseModel):
     training_cost: int  # Credits per training session
 
 class HireCrewRequest(BaseModel):
-    role: str
-    max_salary: int
+    hireableCrewId: Optional[str] = None  # A crew member from /api/crew/available; otherwise picked by role
+    role: Optional[str] = None
+    max_salary: Optional[int] = None
 
 class TrainCrewRequest(BaseModel):
     skill: str
@@ -131,7 +132,7 @@ class System(BaseModel):
     type: str
     x: int
     y: int
-    waypoints: List[dict]
+    waypoints: Optional[List[dict]] = None  # Left out of the demo galaxy's system list
     factions: List[dict]
 
 class Waypoint(BaseModel):
@@ -162,6 +163,23 @@ class TransferRequest(BaseModel):
     units: int
     shipSymbol: str
 
+class ExtractRequest(BaseModel):
+    survey: Optional[dict] = None  # A survey of the ship's waypoint to target its deposits
+    bestSurvey: bool = False  # Without a survey, use the most valuable stored one of the waypoint
+
+class CargoRequest(BaseModel):
+    symbol: str
+    units: int
+
+class BatchShipAction(BaseModel):
+    shipSymbol: str
+    action: str  # "navigate", "dock", "orbit", "refuel"
+    waypointSymbol: Optional[str] = None  # Required for navigate
+    units: Optional[int] = None  # Optional for refuel
+
+class BatchShipRequest(BaseModel):
+    actions: List[BatchShipAction]
+
 class RepairRequest(BaseModel):
     pass  # No specific parameters needed for repair
 
@@ -175,7 +193,7 @@ class SecurityActionRequest(BaseModel):
 
 class SecurityStatus(BaseModel):
     cloakingActive: bool = False
-    cloakingCooldown: Optional[int] = None
+    cloakingCooldown: Optional[int] = None  # Seconds until the cloak can be engaged again
     stealthModeActive: bool = False 
     stealthModeLevel: int = 0  # 0-3 stealth levels
     signalJammingActive: bool = False
@@ -186,6 +204,7 @@ class SecurityStatus(BaseModel):
     encryptionActive: bool = False
     encryptionLevel: int = 1  # 1-5 encryption levels
     energyConsumption: int = 0  # Current energy drain from security systems
+    remainingSeconds: Dict[str, int] = {}  # Seconds left of each timed effect
 
 # Scanning & Intelligence Models
 class ScanResult(BaseModel):
@@ -198,6 +217,21 @@ class ScanResult(BaseModel):
 class SurveyRequest(BaseModel):
     shipSymbol: str
 
+class ScheduleActionRequest(BaseModel):
+    action: str  # scan-systems, scan-waypoints, scan-ships, survey, ...
+    payload: dict = {}
+
+class MiningStartRequest(BaseModel):
+    marketWaypoint: Optional[str] = None  # Where to sell; defaults to the mining waypoint, which then needs a marketplace
+
+class DeliverContractRequest(BaseModel):
+    shipSymbol: str
+    tradeSymbol: str
+    units: int
+
+class DeliveryStartRequest(BaseModel):
+    shipSymbol: Optional[str] = None  # Defaults to the ship the sourcing plan picks
+
 # Resource Management Models
 class ResourceData(BaseModel):
     fuel: dict
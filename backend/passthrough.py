@@ -0,0 +1,63 @@
+import re
+from typing import Any, Iterable
+
+import orjson
+from fastapi import Response
+
+from .tracing import span
+
+# `{"data":` at the start of an upstream envelope
+_DATA_HEAD = re.compile(rb'\s*\{\s*"data"\s*:')
+_META = b'"meta"'
+_WHITESPACE = b" \t\r\n"
+
+class RawJSONResponse(Response):
+    """A response whose body is already-encoded JSON"""
+    media_type = "application/json"
+
+def data_bytes(body: bytes) -> bytes:
+    """The encoded `data` member of an upstream `{"data": ..., "meta": ...}` envelope.
+
+    SpaceTraders puts `data` first and the small `meta` object last, so the
+    bytes in between are sliced out without decoding the (possibly large)
+    payload. The tail is decoded to check the slice really ended at `meta`.
+    An envelope without `meta` (single objects are small) has its slice
+    decoded to check it is `data` alone and not `data` plus further members.
+    Any other layout falls back to decoding and re-encoding with orjson.
+    """
+    head = _DATA_HEAD.match(body)
+    end = len(body)
+    while end and body[end - 1] in _WHITESPACE:
+        end -= 1
+    if head is not None and body[end - 1:end] == b"}":
+        end -= 1
+        meta = body.rfind(_META, head.end(), end)
+        if meta < 0:
+            data = body[head.end():end].strip(_WHITESPACE)
+            try:
+                orjson.loads(data)
+                return data
+            except orjson.JSONDecodeError:
+                return orjson.dumps(orjson.loads(body)["data"])
+        comma = meta - 1
+        while comma > head.end() and body[comma] in _WHITESPACE:
+            comma -= 1
+        if body[comma] == ord(","):
+            try:
+                if isinstance(orjson.loads(body[meta + len(_META):end].lstrip(_WHITESPACE + b":")), dict):
+                    return body[head.end():comma].strip(_WHITESPACE)
+            except orjson.JSONDecodeError:
+                pass
+    return orjson.dumps(orjson.loads(body)["data"])
+
+def json_array(items: Iterable[bytes]) -> bytes:
+    """A JSON array from already-encoded items"""
+    return b"[" + b",".join(items) + b"]"
+
+def raw_response(body: bytes, status_code: int = 200) -> RawJSONResponse:
+    return RawJSONResponse(body, status_code=status_code)
+
+def json_response(content: Any, status_code: int = 200) -> RawJSONResponse:
+    """Encode `content` with orjson, skipping response model validation and FastAPI's JSON encoder"""
+    with span("encode"):
+        return RawJSONResponse(orjson.dumps(content), status_code=status_code)
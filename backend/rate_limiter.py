@@ -0,0 +1,201 @@
+import asyncio
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from enum import IntEnum
+from typing import Deque, Dict, Optional
+
+import httpx
+
+from .tracing import span
+
+class Lane(IntEnum):
+    """Priority lanes for upstream calls; lower values are served first"""
+    COMMAND = 0     # Ship movement: navigate, dock, orbit
+    ACTION = 1      # Every other mutating call
+    READ = 2        # Agent and fleet reads
+    BACKGROUND = 3  # Galaxy data: systems, waypoints, factions
+
+_COMMAND_PATH = re.compile(r"/my/ships/[^/]+/(navigate|dock|orbit)$")
+_BACKGROUND_PATH = re.compile(r"/(systems|factions)(/|$)")
+
+def classify_request(method: str, path: str) -> Lane:
+    """Pick the priority lane for an upstream request from its method and path"""
+    if method != "GET":
+        return Lane.COMMAND if _COMMAND_PATH.search(path) else Lane.ACTION
+    if "/my/" not in path and _BACKGROUND_PATH.search(path):
+        return Lane.BACKGROUND
+    return Lane.READ
+
+def _parse_reset(value: str) -> Optional[float]:
+    """Convert an x-ratelimit-reset timestamp into seconds from now"""
+    try:
+        reset = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset.tzinfo is None:
+        # Upstream timestamps are UTC; one sent without an offset is read as UTC too
+        reset = reset.replace(tzinfo=timezone.utc)
+    return (reset - datetime.now(timezone.utc)).total_seconds()
+
+class UpstreamRateLimiter:
+    """Token bucket shared by every upstream call, with strict-priority lanes.
+
+    The bucket refills at `rate` tokens per second up to `burst`. Waiters queue
+    per lane and a single dispatcher hands out tokens to the highest-priority
+    lane first. Upstream rate-limit headers adjust the refill rate and pause
+    the bucket until the advertised reset or Retry-After time.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._queues: Dict[Lane, Deque[asyncio.Future]] = {lane: deque() for lane in Lane}
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._granted = {lane: 0 for lane in Lane}
+        self._wait_total = {lane: 0.0 for lane in Lane}
+        self._wait_max = {lane: 0.0 for lane in Lane}
+        self.throttled = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _delay(self, now: float) -> float:
+        """Seconds until a token can be handed out"""
+        self._refill(now)
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def _record(self, lane: Lane, waited: float) -> None:
+        self._granted[lane] += 1
+        self._wait_total[lane] += waited
+        self._wait_max[lane] = max(self._wait_max[lane], waited)
+
+    async def acquire(self, lane: Lane) -> None:
+        """Wait for a token in the given lane"""
+        now = time.monotonic()
+        if not self.queue_depth() and self._delay(now) == 0:
+            self._tokens -= 1
+            self._record(lane, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues[lane].append(future)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future in self._queues[lane]:
+                self._queues[lane].remove(future)
+            elif future.done() and not future.cancelled():
+                # Cancelled after the dispatcher granted a token: hand it back unused
+                self._refill(time.monotonic())
+                self._tokens = min(self.burst, self._tokens + 1)
+            raise
+        self._record(lane, time.monotonic() - now)
+
+    async def _dispatch(self) -> None:
+        while self.queue_depth():
+            delay = self._delay(time.monotonic())
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            for lane in Lane:
+                queue = self._queues[lane]
+                while queue and queue[0].done():
+                    queue.popleft()
+                if queue:
+                    self._tokens -= 1
+                    queue.popleft().set_result(None)
+                    break
+
+    def update_from_response(self, response: httpx.Response) -> None:
+        """Follow the upstream x-ratelimit-* and Retry-After headers"""
+        headers = response.headers
+        now = time.monotonic()
+        per_second = headers.get("x-ratelimit-limit-per-second")
+        if per_second:
+            try:
+                self.rate = max(float(per_second), 0.001)
+            except ValueError:
+                pass
+
+        pause = 0.0
+        if response.status_code == 429:
+            self.throttled += 1
+            self._tokens = 0
+            try:
+                pause = float(headers.get("retry-after", 1 / self.rate))
+            except ValueError:
+                pause = 1 / self.rate
+        elif headers.get("x-ratelimit-remaining") == "0" and headers.get("x-ratelimit-reset"):
+            pause = _parse_reset(headers["x-ratelimit-reset"]) or 0.0
+        if pause > 0:
+            self._blocked_until = max(self._blocked_until, now + pause)
+
+    def queue_depth(self, lane: Optional[Lane] = None) -> int:
+        """Number of callers waiting for a token, overall or in one lane"""
+        if lane is not None:
+            return len(self._queues[lane])
+        return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "ratePerSecond": self.rate,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 3),
+            "blockedForSeconds": round(max(0.0, self._blocked_until - now), 3),
+            "throttledResponses": self.throttled,
+            "queueDepth": self.queue_depth(),
+            "lanes": {
+                lane.name: {
+                    "queueDepth": len(self._queues[lane]),
+                    "granted": self._granted[lane],
+                    "avgWaitMs": round(1000 * self._wait_total[lane] / self._granted[lane], 3) if self._granted[lane] else 0.0,
+                    "maxWaitMs": round(1000 * self._wait_max[lane], 3),
+                }
+                for lane in Lane
+            },
+        }
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that takes a limiter token before every upstream request.
+
+    Requests are classified into lanes by `classify_request` unless the caller
+    passes `extensions={"lane": Lane.X}`. 429 responses are retried after the
+    advertised Retry-After instead of being handed back to the router.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: UpstreamRateLimiter, max_retries: int = 3):
+        self._transport = transport
+        self._limiter = limiter
+        self._max_retries = max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        lane = request.extensions.get("lane")
+        if lane is None:
+            lane = classify_request(request.method, request.url.path)
+        attempt = 0
+        while True:
+            with span("rate_limit_wait", lane=lane.name):
+                await self._limiter.acquire(lane)
+            response = await self._transport.handle_async_request(request)
+            self._limiter.update_from_response(response)
+            if response.status_code != 429 or attempt >= self._max_retries:
+                return response
+            await response.aclose()
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Pattern, Tuple
+
+import httpx
+
+from .coalescing import CapturedResponse
+
+class CacheRule(NamedTuple):
+    """Which upstream GETs are cached, for how long, and whether they go to disk"""
+    resource: str
+    pattern: Pattern
+    ttl: float
+    persist: bool
+
+# Mutations that change ships: every one under /my/ships, and contract deliveries (which unload cargo)
+_SHIP_MUTATION = re.compile(r"/my/ships(/|$)|/my/contracts/[^/]+/deliver$")
+
+class _Entry:
+    __slots__ = ("resource", "expires", "response")
+
+    def __init__(self, resource: str, expires: float, response: CapturedResponse):
+        self.resource = resource
+        self.expires = expires
+        self.response = response
+
+class DiskCacheTier:
+    """SQLite second tier for long-lived galaxy data that survives restarts.
+
+    Keys are hashed so the Authorization header never reaches disk, and expiry
+    uses wall-clock time because entries outlive the process.
+    """
+
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, resource TEXT, expires REAL, status INTEGER, headers TEXT, content BLOB)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, float, CapturedResponse]]:
+        row = self._db.execute(
+            "SELECT resource, expires, status, headers, content FROM responses WHERE key = ?", (self._hash(key),)
+        ).fetchone()
+        if row is None:
+            return None
+        resource, expires, status, headers, content = row
+        remaining = expires - time.time()
+        if remaining <= 0:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (self._hash(key),))
+            self._db.commit()
+            return None
+        return resource, remaining, CapturedResponse(status, httpx.Headers(json.loads(headers)), content)
+
+    def put(self, key: str, resource: str, ttl: float, response: CapturedResponse) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (self._hash(key), resource, time.time() + ttl, response.status_code,
+             json.dumps(response.headers.multi_items()), response.content),
+        )
+        self._db.commit()
+
+    def invalidate(self, resource: str) -> None:
+        self._db.execute("DELETE FROM responses WHERE resource = ?", (resource,))
+        self._db.commit()
+
+class ResponseCache:
+    """Bounded in-memory LRU of upstream responses with per-resource TTLs.
+
+    An optional `DiskCacheTier` backs the resources whose rule has
+    `persist=True`; memory misses fall through to disk before going upstream.
+    """
+
+    def __init__(self, rules, max_entries: int, disk: Optional[DiskCacheTier] = None):
+        self.rules = list(rules)
+        self.max_entries = max_entries
+        self.disk = disk
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._counters: Dict[str, Dict[str, int]] = {
+            rule.resource: {"memoryHits": 0, "diskHits": 0, "misses": 0, "invalidations": 0} for rule in self.rules
+        }
+        # Bumped by every invalidation, so a fetch that overlapped one can tell its response is stale
+        self._generations: Dict[str, int] = {rule.resource: 0 for rule in self.rules}
+        self.evictions = 0
+
+    def match(self, path: str) -> Optional[CacheRule]:
+        for rule in self.rules:
+            if rule.pattern.search(path):
+                return rule
+        return None
+
+    def get(self, key: str, rule: CacheRule) -> Optional[CapturedResponse]:
+        counters = self._counters[rule.resource]
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires > time.monotonic():
+                self._entries.move_to_end(key)
+                counters["memoryHits"] += 1
+                return entry.response
+            del self._entries[key]
+
+        if rule.persist and self.disk is not None:
+            stored = self.disk.get(key)
+            if stored is not None:
+                resource, remaining, response = stored
+                self._store(key, resource, remaining, response)
+                counters["diskHits"] += 1
+                return response
+
+        counters["misses"] += 1
+        return None
+
+    def _store(self, key: str, resource: str, ttl: float, response: CapturedResponse) -> None:
+        self._entries[key] = _Entry(resource, time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def put(self, key: str, rule: CacheRule, response: CapturedResponse) -> None:
+        self._store(key, rule.resource, rule.ttl, response)
+        if rule.persist and self.disk is not None:
+            self.disk.put(key, rule.resource, rule.ttl, response)
+
+    def generation(self, resource: str) -> int:
+        return self._generations[resource]
+
+    def invalidate(self, resource: str) -> None:
+        """Drop every cached response for a resource from both tiers"""
+        self._generations[resource] += 1
+        stale = [key for key, entry in self._entries.items() if entry.resource == resource]
+        for key in stale:
+            del self._entries[key]
+        if self.disk is not None:
+            self.disk.invalidate(resource)
+        self._counters[resource]["invalidations"] += 1
+
+    def stats(self) -> dict:
+        hits = sum(c["memoryHits"] + c["diskHits"] for c in self._counters.values())
+        lookups = hits + sum(c["misses"] for c in self._counters.values())
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "diskTier": self.disk is not None,
+            "evictions": self.evictions,
+            "hitRatio": round(hits / lookups, 4) if lookups else 0.0,
+            "resources": {resource: dict(counters) for resource, counters in self._counters.items()},
+        }
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """httpx transport that serves cacheable GETs from a `ResponseCache`.
+
+    Only 200 responses are stored. Any successful mutation under /my/ships,
+    or contract delivery, invalidates the cached fleet so navigate/dock/orbit
+    never leave stale nav and a delivery never leaves stale cargo.
+    A miss notes the resource's generation before going upstream and only
+    stores the response if no invalidation happened meanwhile; the generation
+    also goes down as the `generation` request extension, which keeps
+    `SingleFlightTransport` from sharing a call started before a mutation
+    with requests made after it. Callers can skip the cache with
+    `extensions={"cache": False}`.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: ResponseCache):
+        self._transport = transport
+        self._cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method != "GET":
+            response = await self._transport.handle_async_request(request)
+            if response.is_success and _SHIP_MUTATION.search(path):
+                self._cache.invalidate("ships")
+            return response
+
+        rule = self._cache.match(path)
+        if rule is None or request.extensions.get("cache") is False:
+            return await self._transport.handle_async_request(request)
+
+        key = f"{request.url}|{request.headers.get('authorization', '')}"
+        cached = self._cache.get(key, rule)
+        if cached is not None:
+            return cached.build(request)
+
+        generation = self._cache.generation(rule.resource)
+        request.extensions["generation"] = (rule.resource, generation)
+        captured = await CapturedResponse.capture(await self._transport.handle_async_request(request))
+        if captured.status_code == 200 and self._cache.generation(rule.resource) == generation:
+            self._cache.put(key, rule, captured)
+        return captured.build(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,234 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .galaxy_store import GalaxyStore
+
+# SpaceTraders flight modes: travel time multiplier and fuel burned per unit of distance
+FLIGHT_MODES: Dict[str, Dict[str, float]] = {
+    "CRUISE": {"multiplier": 25.0, "fuel_per_unit": 1.0},
+    "BURN": {"multiplier": 12.5, "fuel_per_unit": 2.0},
+    "STEALTH": {"multiplier": 30.0, "fuel_per_unit": 1.0},
+    "DRIFT": {"multiplier": 250.0, "fuel_per_unit": 0.0},
+}
+
+def fuel_cost(distance, mode: str):
+    """Fuel a hop costs in `mode` (DRIFT always burns 1); works on scalars and arrays"""
+    distance = np.asarray(distance, dtype=np.float64)
+    if mode == "DRIFT":
+        cost = np.ones_like(distance)
+    else:
+        cost = np.maximum(np.round(distance), 1) * FLIGHT_MODES[mode]["fuel_per_unit"]
+    return np.where(distance > 0, cost, 0)
+
+def travel_time(distance, mode: str, speed: float):
+    """Seconds a hop takes in `mode` for an engine of `speed`; works on scalars and arrays"""
+    distance = np.asarray(distance, dtype=np.float64)
+    seconds = np.round(np.maximum(np.round(distance), 1) * (FLIGHT_MODES[mode]["multiplier"] / speed) + 15)
+    return np.where(distance > 0, seconds, 0)
+
+def best_hops(distances: np.ndarray, fuel, capacity, speed, modes: Sequence[str]):
+    """Fastest flight mode for every hop in `distances` given `fuel` in the tank.
+
+    `fuel`, `capacity` and `speed` may be arrays broadcasting against
+    `distances`, to cost hops for several ships at once. Returns (seconds,
+    mode index, fuel used) arrays, with infinite seconds where no allowed
+    mode fits in the tank.
+    """
+    shape = np.broadcast_shapes(np.shape(distances), np.shape(fuel), np.shape(capacity), np.shape(speed))
+    seconds = np.full(shape, np.inf)
+    chosen = np.full(shape, -1, dtype=np.int8)
+    used = np.zeros(shape)
+    # Ships without a fuel tank (probes, satellites) fly for free
+    tank = np.asarray(capacity) > 0
+    for i, mode in enumerate(modes):
+        mode_fuel = fuel_cost(distances, mode)
+        mode_seconds = travel_time(distances, mode, speed)
+        if tank.all():
+            better = (mode_fuel <= fuel) & (mode_seconds < seconds)
+            used = np.where(better, mode_fuel, used)
+        elif tank.any():
+            better = ((mode_fuel <= fuel) | ~tank) & (mode_seconds < seconds)
+            used = np.where(better & tank, mode_fuel, used)
+        else:
+            better = mode_seconds < seconds
+        seconds = np.where(better, mode_seconds, seconds)
+        chosen = np.where(better, i, chosen)
+    return seconds, chosen, used
+
+class MarketGraph:
+    """Hop costs between every pair of a system's marketplaces for one ship profile.
+
+    Leaving a market always means leaving with a full tank, so these costs
+    don't depend on where a route starts or ends and one graph serves every
+    route a ship profile plans in the system.
+    """
+
+    def __init__(self, markets: Sequence[dict], capacity: int, speed: float, modes: Sequence[str]):
+        self.symbols = [market["symbol"] for market in markets]
+        self.positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.xs = np.array([market["x"] for market in markets], dtype=np.float64)
+        self.ys = np.array([market["y"] for market in markets], dtype=np.float64)
+        self.capacity = capacity
+        self.speed = speed
+        self.modes = list(modes)
+        distances = np.hypot(self.xs[:, None] - self.xs[None, :], self.ys[:, None] - self.ys[None, :])
+        # Fastest mode for each hop on a full tank, its seconds and the fuel it burns
+        self.seconds, self.mode_index, fuel = best_hops(distances, capacity, capacity, speed, self.modes)
+        self.fuel = fuel.astype(np.float32)
+
+    def distances_from(self, x: float, y: float) -> np.ndarray:
+        return np.hypot(self.xs - x, self.ys - y)
+
+def plan_route(graph: MarketGraph, origin: dict, destination: dict, fuel: int) -> Optional[List[dict]]:
+    """Fastest route from `origin` to `destination`, refuelling only at markets.
+
+    Runs A* over the market graph with the origin and destination attached as
+    extra nodes; their hop costs are the only per-route matrix work. The
+    search stops once no open market can beat the best arrival found so far.
+    An origin that is itself a market is left with a full tank, so when
+    `fuel` is short of that the route starts with a refuel step (a hop from
+    the origin to itself with `refuel` set and no flight mode).
+    Returns the hop list, or None when the destination is unreachable.
+    """
+    if origin["symbol"] == destination["symbol"]:
+        return []
+    capacity, speed, modes = graph.capacity, graph.speed, graph.modes
+    origin_index = graph.positions.get(origin["symbol"])
+    destination_index = graph.positions.get(destination["symbol"])
+    origin_fuel = capacity if origin_index is not None else fuel
+
+    # Seconds from the origin to each market, and from each market to the destination
+    if origin_index is not None:
+        cost = graph.seconds[origin_index].copy()
+    else:
+        cost = best_hops(graph.distances_from(origin["x"], origin["y"]), fuel, capacity, speed, modes)[0]
+    if destination_index is not None:
+        to_destination = graph.seconds[:, destination_index]
+    else:
+        to_destination = best_hops(graph.distances_from(destination["x"], destination["y"]), capacity, capacity, speed, modes)[0]
+    direct = np.hypot(destination["x"] - origin["x"], destination["y"] - origin["y"])
+    best = float(best_hops(np.array([direct]), origin_fuel, capacity, speed, modes)[0][0])
+
+    # Consistent heuristic: straight-line distance at the fastest allowed mode. After
+    # rounding, a hop of distance d > 0 takes at least max(rate, rate * (d - 0.5)) + 14.5
+    # seconds, which is at least min(rate, (2 * rate + 29) / 3) * d for every d (the
+    # tightest case is d = 1.5), so that per-unit bound never overestimates
+    rate = min(FLIGHT_MODES[mode]["multiplier"] for mode in modes) / speed
+    heuristic = graph.distances_from(destination["x"], destination["y"]) * min(rate, (2 * rate + 29) / 3)
+
+    previous = np.full(len(graph.symbols), -1)
+    closed = np.zeros(len(graph.symbols), dtype=bool)
+    # The endpoints are handled by `cost`, `to_destination` and the direct hop, never popped
+    for index in (origin_index, destination_index):
+        if index is not None:
+            closed[index] = True
+    last = -1
+    while len(graph.symbols):
+        frontier = np.where(closed, np.inf, cost + heuristic)
+        current = int(np.argmin(frontier))
+        if frontier[current] >= best:
+            break
+        closed[current] = True
+        if cost[current] + to_destination[current] < best:
+            best, last = cost[current] + to_destination[current], current
+        relaxed = cost[current] + graph.seconds[current]
+        improved = (relaxed < cost) & ~closed
+        cost = np.where(improved, relaxed, cost)
+        previous = np.where(improved, current, previous)
+    if not np.isfinite(best):
+        return None
+
+    stops = []
+    while last >= 0:
+        stops.append({"symbol": graph.symbols[last], "x": graph.xs[last], "y": graph.ys[last]})
+        last = int(previous[last])
+    route = [origin] + stops[::-1] + [destination]
+
+    hops = []
+    if origin_index is not None and fuel < capacity:
+        # Everything above assumed the full tank a market origin sells
+        hops.append({"from": origin["symbol"], "to": origin["symbol"], "distance": 0.0, "flightMode": None,
+                     "fuelCost": 0, "duration": 0, "refuel": True})
+    tank = origin_fuel
+    for a, b in zip(route, route[1:]):
+        distance = float(np.hypot(b["x"] - a["x"], b["y"] - a["y"]))
+        seconds, chosen, used = best_hops(np.array([distance]), tank, capacity, speed, modes)
+        refuel = b is not destination
+        hops.append({
+            "from": a["symbol"],
+            "to": b["symbol"],
+            "distance": round(distance, 3),
+            "flightMode": modes[chosen[0]],
+            "fuelCost": int(used[0]),
+            "duration": int(seconds[0]),
+            "refuel": refuel,
+        })
+        tank = capacity if refuel else tank - int(used[0])
+    return hops
+
+def summarize_route(hops: List[dict]) -> dict:
+    return {
+        "hops": hops,
+        "totalDistance": round(sum(hop["distance"] for hop in hops), 3),
+        "totalFuel": sum(hop["fuelCost"] for hop in hops),
+        "totalDuration": sum(hop["duration"] for hop in hops),
+        "refuelStops": sum(1 for hop in hops if hop["refuel"]),
+    }
+
+class RoutePlanner:
+    """Plans routes over a `GalaxyStore`, keeping recent market graphs in an LRU.
+
+    A graph is keyed by system, the version of the system's MARKETPLACE index
+    (so newly stored markets rebuild it) and the ship profile: tank capacity,
+    engine speed and allowed flight modes.
+    """
+
+    def __init__(self, store: GalaxyStore, max_graphs: int = 32):
+        self.store = store
+        self.max_graphs = max_graphs
+        self._graphs: "OrderedDict[Tuple, MarketGraph]" = OrderedDict()
+
+    def graph(self, system_symbol: str, capacity: int, speed: float, modes: Sequence[str]) -> MarketGraph:
+        key, markets = self._key(system_symbol, capacity, speed, modes)
+        graph = self._graphs.get(key)
+        if graph is None:
+            graph = self._remember(key, MarketGraph(markets(), capacity, speed, modes))
+        else:
+            self._graphs.move_to_end(key)
+        return graph
+
+    async def prepare(self, system_symbol: str, capacity: int, speed: float, modes: Sequence[str]) -> None:
+        """Build the system's graph for this profile in a worker thread unless it's cached.
+
+        The markets are copied on the loop, where the store's index changes,
+        and the finished graph is cached back on it; only the O(n²) hop costs
+        are worked out off the loop.
+        """
+        key, markets = self._key(system_symbol, capacity, speed, modes)
+        if key not in self._graphs:
+            graph = await asyncio.to_thread(MarketGraph, markets(), capacity, speed, list(modes))
+            self._remember(key, graph)
+
+    def _key(self, system_symbol: str, capacity: int, speed: float, modes: Sequence[str]):
+        """The cache key of a graph, and a callable copying the markets it is built from"""
+        index = self.store.waypoint_index(system_symbol, "MARKETPLACE")
+        markets = lambda: sorted(({"symbol": waypoint.data["symbol"], "x": waypoint.data["x"], "y": waypoint.data["y"]}
+                                  for waypoint in index.items()), key=lambda market: market["symbol"])
+        return (system_symbol, index.version, capacity, speed, tuple(modes)), markets
+
+    def _remember(self, key: Tuple, graph: MarketGraph) -> MarketGraph:
+        self._graphs[key] = graph
+        self._graphs.move_to_end(key)
+        while len(self._graphs) > self.max_graphs:
+            self._graphs.popitem(last=False)
+        return graph
+
+    def plan(self, origin: dict, destination: dict, fuel: int, capacity: int, speed: float,
+             modes: Optional[Sequence[str]] = None) -> Optional[List[dict]]:
+        """Fastest route between two waypoints of one system (see `plan_route`)"""
+        modes = list(modes or FLIGHT_MODES)
+        graph = self.graph(origin["systemSymbol"], capacity, speed, modes)
+        return plan_route(graph, origin, destination, fuel)
@@ -3,17 +3,17 @@ import httpx
 
 from ..models import CombatActionRequest
 from ..config import HAS_VALID_TOKEN
-from ..mock_data import MOCK_SHIPS
-from ..utilities import get_httpx_client
+from ..utilities import get_httpx_client, fleet_repository
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/api/ships", tags=["combat"])
+router = APIRouter(prefix="/api/ships", tags=["combat"], route_class=TracedRoute)
 
 @router.post("/{ship_symbol}/combat/weapons")
 async def manage_weapons(ship_symbol: str, request: CombatActionRequest, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Arm or disarm ship weapons"""
     if not HAS_VALID_TOKEN:
         # Mock weapon management response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
@@ -40,7 +40,7 @@ async def manage_shields(ship_symbol: str, request: CombatActionRequest, client:
     """Activate or deactivate ship shields"""
     if not HAS_VALID_TOKEN:
         # Mock shield management response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
@@ -67,7 +67,7 @@ async def target_acquisition(ship_symbol: str, request: CombatActionRequest, cli
     """Acquire or release target lock"""
     if not HAS_VALID_TOKEN:
         # Mock targeting response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
@@ -96,7 +96,7 @@ async def evasive_maneuvers(ship_symbol: str, request: CombatActionRequest, clie
     """Engage or disengage evasive maneuvers"""
     if not HAS_VALID_TOKEN:
         # Mock evasive maneuvers response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
@@ -123,7 +123,7 @@ async def point_defense_system(ship_symbol: str, request: CombatActionRequest, c
     """Activate or deactivate point defense systems"""
     if not HAS_VALID_TOKEN:
         # Mock point defense response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
@@ -150,7 +150,7 @@ async def launch_missiles(ship_symbol: str, request: CombatActionRequest, client
     """Launch guided missiles at target"""
     if not HAS_VALID_TOKEN:
         # Mock missile launch response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
@@ -179,7 +179,7 @@ async def get_combat_status(ship_symbol: str, client: httpx.AsyncClient = Depend
     """Get current combat status of ship"""
     if not HAS_VALID_TOKEN:
         # Mock combat status response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
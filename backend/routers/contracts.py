@@ -0,0 +1,221 @@
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
+import httpx
+
+from ..models import DeliverContractRequest, DeliveryStartRequest, CargoRequest, NavigateRequest, RefuelRequest
+from ..config import HAS_VALID_TOKEN, SPACETRADERS_API_URL, SPACETRADERS_TOKEN
+from ..contracts import open_deliveries
+from ..mock_data import MOCK_AGENT
+from ..upstream import get_upstream_client
+from ..utilities import get_httpx_client, fleet_store, fleet_repository, contract_store, contract_planner, delivery_engine
+from ..tracing import TracedRoute
+from .ships import navigate_ship, dock_ship, orbit_ship, refuel_ship, purchase_cargo, _mock_change_cargo
+
+router = APIRouter(prefix="/api/contracts", tags=["contracts"], route_class=TracedRoute)
+
+async def _synced(client: httpx.AsyncClient, refresh: bool = False) -> None:
+    """Read the contracts upstream unless the store already holds them (demo mode always does)"""
+    if not HAS_VALID_TOKEN or (contract_store.synced_at is not None and not refresh):
+        return
+    try:
+        await contract_store.sync(client)
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _contract(contract_id: str) -> dict:
+    contract = contract_store.get(contract_id)
+    if contract is None:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    return contract
+
+@router.get("")
+async def get_contracts(refresh: bool = False, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Get the agent's contracts from the contract store (`refresh` re-reads them upstream first)"""
+    await _synced(client, refresh)
+    return {"data": contract_store.all()}
+
+@router.get("/plans")
+async def get_contract_plans(ship: Optional[str] = None, timeValue: float = 0.0,
+                             client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Score every open contract by its cheapest sourcing plan, most profitable first.
+
+    Each delivery is sourced by the fleet ship and known market (from the
+    recorded prices, see /api/markets) that cost least in goods, fuel and
+    flight time at `timeValue` credits per hour; `ship` only considers that ship.
+    """
+    await _synced(client)
+    ships = [(await fleet_repository.fetch(ship, client))["symbol"]] if ship else None
+    # Planned on the event loop, which also writes the prices, galaxy indexes and fleet the planner reads
+    plans = contract_planner.plan(contract_store.open(), ships, timeValue)
+    return {"data": plans}
+
+@router.get("/deliveries")
+async def get_deliveries():
+    """Get every contract delivery job and its progress"""
+    return {"data": delivery_engine.stats()}
+
+@router.get("/{contract_id}")
+async def get_contract(contract_id: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Get a contract"""
+    await _synced(client)
+    return {"data": _contract(contract_id)}
+
+@router.get("/{contract_id}/plan")
+async def get_contract_plan(contract_id: str, ship: Optional[str] = None, timeValue: float = 0.0,
+                            client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Cheapest sourcing plan of a contract, with the route of each delivery"""
+    await _synced(client)
+    contract = _contract(contract_id)
+    ships = [(await fleet_repository.fetch(ship, client))["symbol"]] if ship else None
+    plan = contract_planner.plan([contract], ships, timeValue)[0]
+    for delivery in plan["deliveries"]:
+        if delivery.get("shipSymbol"):
+            delivery["routes"] = contract_planner.routes(delivery)
+    return {"data": plan}
+
+@router.post("/{contract_id}/accept")
+async def accept_contract(contract_id: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Accept a contract, collecting its on-accept payment"""
+    if not HAS_VALID_TOKEN:
+        contract = _contract(contract_id)
+        if contract["accepted"]:
+            raise HTTPException(status_code=400, detail="Contract has already been accepted")
+        contract["accepted"] = True
+        MOCK_AGENT["credits"] += contract["terms"]["payment"]["onAccepted"]
+        return {"data": {"agent": MOCK_AGENT, "contract": contract}}
+
+    try:
+        headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
+        response = await client.post(f"{SPACETRADERS_API_URL}/my/contracts/{contract_id}/accept", headers=headers)
+
+        if response.status_code == 200:
+            result = response.json()
+            contract_store.apply(result["data"]["contract"])
+            return result
+        else:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{contract_id}/deliver")
+async def deliver_contract(contract_id: str, request: DeliverContractRequest, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Deliver cargo from a ship docked at a delivery destination of the contract"""
+    async with fleet_repository.lock(request.shipSymbol):
+        if not HAS_VALID_TOKEN:
+            contract = _contract(contract_id)
+            mock_ship = fleet_repository.get(request.shipSymbol)
+            if not mock_ship:
+                raise HTTPException(status_code=404, detail="Ship not found")
+            if not contract["accepted"]:
+                raise HTTPException(status_code=400, detail="Contract has not been accepted")
+            if mock_ship["nav"]["status"] != "DOCKED":
+                raise HTTPException(status_code=400, detail="Ship must be docked to deliver")
+            term = next((term for term in open_deliveries(contract) if term["tradeSymbol"] == request.tradeSymbol
+                         and term["destinationSymbol"] == mock_ship["nav"]["waypointSymbol"]), None)
+            if term is None:
+                raise HTTPException(status_code=400, detail=f"Contract has no open delivery of {request.tradeSymbol} here")
+            if request.units > term["unitsRequired"] - term["unitsFulfilled"]:
+                raise HTTPException(status_code=400, detail="Delivery exceeds the units the contract still requires")
+            cargo = mock_ship["cargo"]
+            item = next((item for item in cargo["inventory"] if item["symbol"] == request.tradeSymbol), None)
+            if not item or item["units"] < request.units:
+                raise HTTPException(status_code=400, detail="Insufficient cargo")
+            _mock_change_cargo(cargo, request.tradeSymbol, -request.units)
+            term["unitsFulfilled"] += request.units
+
+            result = {"data": {"contract": contract, "cargo": cargo}}
+            fleet_store.apply_response(request.shipSymbol, result)
+            return result
+
+        try:
+            headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
+            payload = {"shipSymbol": request.shipSymbol, "tradeSymbol": request.tradeSymbol, "units": request.units}
+            response = await client.post(f"{SPACETRADERS_API_URL}/my/contracts/{contract_id}/deliver",
+                                       json=payload, headers=headers)
+
+            if response.status_code == 200:
+                result = response.json()
+                contract_store.apply(result["data"]["contract"])
+                fleet_store.apply_response(request.shipSymbol, result)
+                return result
+            else:
+                raise HTTPException(status_code=response.status_code, detail=response.text)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{contract_id}/fulfill")
+async def fulfill_contract(contract_id: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Fulfill a contract whose deliveries are all made, collecting its final payment"""
+    if not HAS_VALID_TOKEN:
+        contract = _contract(contract_id)
+        if not contract["accepted"] or contract["fulfilled"] or open_deliveries(contract):
+            raise HTTPException(status_code=400, detail="Contract is not ready to be fulfilled")
+        contract["fulfilled"] = True
+        MOCK_AGENT["credits"] += contract["terms"]["payment"]["onFulfilled"]
+        return {"data": {"agent": MOCK_AGENT, "contract": contract}}
+
+    try:
+        headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
+        response = await client.post(f"{SPACETRADERS_API_URL}/my/contracts/{contract_id}/fulfill", headers=headers)
+
+        if response.status_code == 200:
+            result = response.json()
+            contract_store.apply(result["data"]["contract"])
+            return result
+        else:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{contract_id}/start")
+async def start_delivery(contract_id: str, request: DeliveryStartRequest = DeliveryStartRequest(),
+                         client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Accept (if needed), source, haul and deliver a contract in the background, then fulfill it"""
+    await _synced(client)
+    contract = _contract(contract_id)
+    ship_symbol = request.shipSymbol
+    if ship_symbol is None:
+        plan = contract_planner.plan([contract])[0]
+        ship_symbol = next((delivery["shipSymbol"] for delivery in plan["deliveries"] if delivery.get("shipSymbol")), None)
+        if ship_symbol is None:
+            raise HTTPException(status_code=409, detail="No ship can source this contract; poll its system's markets first")
+    await fleet_repository.fetch(ship_symbol, client)
+    try:
+        job = delivery_engine.start(contract_id, ship_symbol)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"data": job.to_dict()}
+
+@router.post("/{contract_id}/stop")
+async def stop_delivery(contract_id: str):
+    """Stop a contract's delivery job, keeping its totals"""
+    job = await delivery_engine.stop_contract(contract_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Contract has no delivery job")
+    return {"data": job.to_dict()}
+
+@router.get("/{contract_id}/delivery")
+async def get_delivery(contract_id: str):
+    """Get a contract's delivery state, units bought and delivered and credits"""
+    job = delivery_engine.jobs.get(contract_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Contract has no delivery job")
+    return {"data": job.to_dict()}
+
+# The engine's steps are the ordinary contract and ship actions, sharing the upstream client and its rate budget
+delivery_engine.register("accept", lambda contract_id, payload: accept_contract(contract_id, get_upstream_client()))
+delivery_engine.register("deliver", lambda contract_id, payload: deliver_contract(contract_id, DeliverContractRequest(**payload), get_upstream_client()))
+delivery_engine.register("fulfill", lambda contract_id, payload: fulfill_contract(contract_id, get_upstream_client()))
+delivery_engine.register("purchase", lambda ship_symbol, payload: purchase_cargo(ship_symbol, CargoRequest(**payload), get_upstream_client()))
+delivery_engine.register("refuel", lambda ship_symbol, payload: refuel_ship(ship_symbol, RefuelRequest(**payload), get_upstream_client()))
+delivery_engine.register("navigate", lambda ship_symbol, payload: navigate_ship(ship_symbol, NavigateRequest(**payload), get_upstream_client()))
+delivery_engine.register("dock", lambda ship_symbol, payload: dock_ship(ship_symbol, get_upstream_client()))
+delivery_engine.register("orbit", lambda ship_symbol, payload: orbit_ship(ship_symbol, get_upstream_client()))
@@ -1,21 +1,25 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 import httpx
+import orjson
 
 from ..models import Agent, System, Waypoint
-from ..config import HAS_VALID_TOKEN, SPACETRADERS_API_URL, SPACETRADERS_TOKEN
-from ..mock_data import MOCK_AGENT, MOCK_SYSTEMS, MOCK_WAYPOINTS, MOCK_FACTIONS
-from ..utilities import get_httpx_client
+from ..config import HAS_VALID_TOKEN, SPACETRADERS_API_URL, SPACETRADERS_TOKEN, RESPONSE_PASSTHROUGH
+from ..mock_data import MOCK_AGENT, MOCK_FACTIONS
+from ..utilities import get_httpx_client, galaxy_store, galaxy_crawler, mock_galaxy
+from ..passthrough import data_bytes, json_response, raw_response
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/api", tags=["core"])
+router = APIRouter(prefix="/api", tags=["core"], route_class=TracedRoute)
 
 @router.get("/status")
-async def get_status():
+async def get_status(client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Get SpaceTraders API status"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{SPACETRADERS_API_URL}")
-            return response.json()
+        response = await client.get(f"{SPACETRADERS_API_URL}")
+        return response.json()
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -30,10 +34,14 @@ async def get_agent(client: httpx.AsyncClient = Depends(get_httpx_client)):
         response = await client.get(f"{SPACETRADERS_API_URL}/my/agent", headers=headers)
         
         if response.status_code == 200:
+            if RESPONSE_PASSTHROUGH:
+                return raw_response(data_bytes(response.content))
             data = response.json()
             return data["data"]
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -41,20 +49,46 @@ async def get_agent(client: httpx.AsyncClient = Depends(get_httpx_client)):
 async def get_systems(client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Get all systems"""
     if not HAS_VALID_TOKEN:
-        return MOCK_SYSTEMS
+        # Headers only: listing the whole demo galaxy must not generate every system's waypoints,
+        # which GET /api/systems/{system_symbol} builds for the one system asked for
+        return json_response(mock_galaxy.headers()) if RESPONSE_PASSTHROUGH else mock_galaxy.headers()
+    
+    # Serve the local copy of the galaxy only once a crawl has stored every page;
+    # a partial crawl would silently drop systems, so ask upstream until then
+    meta = galaxy_store.crawl_meta("systems")
+    if meta is not None and meta["complete"]:
+        return raw_response(galaxy_store.systems_json()) if RESPONSE_PASSTHROUGH else galaxy_store.systems()
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
         response = await client.get(f"{SPACETRADERS_API_URL}/systems", headers=headers)
         
         if response.status_code == 200:
+            if RESPONSE_PASSTHROUGH:
+                return raw_response(data_bytes(response.content))
             data = response.json()
             return data["data"]
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/systems/crawl")
+async def start_systems_crawl(restart: bool = False, waypoints: bool = False, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Start (or resume) crawling every page of upstream systems (and optionally their waypoints) into the local galaxy store"""
+    if not HAS_VALID_TOKEN:
+        raise HTTPException(status_code=400, detail="Galaxy crawl requires a valid SpaceTraders token")
+    
+    galaxy_crawler.start(client, restart=restart, waypoints=waypoints)
+    return {"data": galaxy_crawler.status()}
+
+@router.get("/systems/crawl")
+async def get_systems_crawl_status():
+    """Get progress and throughput of the galaxy crawl"""
+    return {"data": galaxy_crawler.status()}
+
 @router.get("/factions")
 async def get_factions(client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Get all factions"""
@@ -66,10 +100,14 @@ async def get_factions(client: httpx.AsyncClient = Depends(get_httpx_client)):
         response = await client.get(f"{SPACETRADERS_API_URL}/factions", headers=headers)
         
         if response.status_code == 200:
+            if RESPONSE_PASSTHROUGH:
+                return raw_response(data_bytes(response.content))
             data = response.json()
             return data["data"]
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -87,21 +125,26 @@ async def get_info():
 async def get_system_waypoints(system_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Get all waypoints in a system"""
     if not HAS_VALID_TOKEN:
-        # Return mock waypoints for the demo system
-        if system_symbol == "X1-DF55":
-            return MOCK_WAYPOINTS
-        else:
-            return []
+        return json_response(mock_galaxy.waypoints(system_symbol)) if RESPONSE_PASSTHROUGH else mock_galaxy.waypoints(system_symbol)
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
         response = await client.get(f"{SPACETRADERS_API_URL}/systems/{system_symbol}/waypoints", headers=headers)
         
         if response.status_code == 200:
+            if RESPONSE_PASSTHROUGH:
+                # The store needs the waypoints decoded; the response reuses the upstream bytes
+                waypoints = data_bytes(response.content)
+                galaxy_store.save_waypoints(orjson.loads(waypoints))
+                return raw_response(waypoints)
             data = response.json()
+            # Keep the local galaxy store (and its spatial index) up to date
+            galaxy_store.save_waypoints(data["data"])
             return data["data"]
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -109,20 +152,23 @@ async def get_system_waypoints(system_symbol: str, client: httpx.AsyncClient = D
 async def get_system(system_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Get system details"""
     if not HAS_VALID_TOKEN:
-        # Return mock system for demo
-        if system_symbol == "X1-DF55":
-            return MOCK_SYSTEMS[0]
-        else:
+        system = mock_galaxy.system(system_symbol)
+        if system is None:
             raise HTTPException(status_code=404, detail="System not found")
+        return json_response(system) if RESPONSE_PASSTHROUGH else system
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
         response = await client.get(f"{SPACETRADERS_API_URL}/systems/{system_symbol}", headers=headers)
         
         if response.status_code == 200:
+            if RESPONSE_PASSTHROUGH:
+                return raw_response(data_bytes(response.content))
             data = response.json()
             return data["data"]
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
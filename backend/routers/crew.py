@@ -3,10 +3,10 @@ import httpx
 
 from ..models import HireCrewRequest
 from ..config import HAS_VALID_TOKEN, SPACETRADERS_API_URL, SPACETRADERS_TOKEN
-from ..mock_data import MOCK_AVAILABLE_CREW
-from ..utilities import get_httpx_client
+from ..utilities import get_httpx_client, mock_galaxy
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/api", tags=["crew"])
+router = APIRouter(prefix="/api", tags=["crew"], route_class=TracedRoute)
 
 @router.get("/ships/{ship_symbol}/crew")
 async def get_ship_crew(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
@@ -83,10 +83,17 @@ async def get_ship_crew(ship_symbol: str, client: httpx.AsyncClient = Depends(ge
 
 @router.post("/ships/{ship_symbol}/crew/hire")
 async def hire_crew_member(ship_symbol: str, request: HireCrewRequest, client: httpx.AsyncClient = Depends(get_httpx_client)):
-    """Hire a crew member for a ship"""
+    """Hire a crew member for a ship: `hireableCrewId`, or (demo mode) the first available one with `role` within `max_salary`"""
+    if request.hireableCrewId is None and (HAS_VALID_TOKEN or request.role is None):
+        raise HTTPException(status_code=400, detail="Provide hireableCrewId" if HAS_VALID_TOKEN else "Provide hireableCrewId or role")
+    
     if not HAS_VALID_TOKEN:
         # Mock hiring response
-        hired_crew = next((crew for crew in MOCK_AVAILABLE_CREW if crew["id"] == request.hireableCrewId), None)
+        if request.hireableCrewId is not None:
+            hired_crew = next((crew for crew in mock_galaxy.available_crew if crew["id"] == request.hireableCrewId), None)
+        else:
+            hired_crew = next((crew for crew in mock_galaxy.available_crew if crew["role"] == request.role
+                               and (request.max_salary is None or crew["salary"] <= request.max_salary)), None)
         if not hired_crew:
             raise HTTPException(status_code=404, detail="Crew member not found")
         
@@ -94,7 +101,7 @@ async def hire_crew_member(ship_symbol: str, request: HireCrewRequest, client: h
             "data": {
                 "agent": {"credits": 999800},  # Deduct hiring cost
                 "crew": {
-                    "symbol": f"CREW_{len(MOCK_AVAILABLE_CREW) + 1:03d}",
+                    "symbol": f"CREW_{len(mock_galaxy.available_crew) + 1:03d}",
                     "name": hired_crew["name"],
                     "role": hired_crew["role"],
                     "level": hired_crew["level"],
@@ -123,6 +130,8 @@ async def hire_crew_member(ship_symbol: str, request: HireCrewRequest, client: h
             return response.json()
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -130,7 +139,7 @@ async def hire_crew_member(ship_symbol: str, request: HireCrewRequest, client: h
 async def get_available_crew(waypoint_symbol: str = "X1-DF55-20250X", client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Get available crew members for hire at a waypoint"""
     if not HAS_VALID_TOKEN:
-        return {"data": MOCK_AVAILABLE_CREW}
+        return {"data": mock_galaxy.available_crew}
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
@@ -140,10 +149,10 @@ async def get_available_crew(waypoint_symbol: str = "X1-DF55-20250X", client: ht
             return response.json()
         else:
             # If endpoint doesn't exist, return mock data
-            return {"data": MOCK_AVAILABLE_CREW}
+            return {"data": mock_galaxy.available_crew}
     except Exception as e:
         # Return mock data if API fails
-        return {"data": MOCK_AVAILABLE_CREW}
+        return {"data": mock_galaxy.available_crew}
 
 @router.post("/ships/{ship_symbol}/crew/{crew_symbol}/dismiss")
 async def dismiss_crew_member(ship_symbol: str, crew_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
@@ -165,5 +174,7 @@ async def dismiss_crew_member(ship_symbol: str, crew_symbol: str, client: httpx.
             return response.json()
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException
+
+from ..tracing import TracedRoute, traces
+
+router = APIRouter(prefix="/api/debug", tags=["debug"], route_class=TracedRoute)
+
+@router.get("/traces")
+async def get_traces(limit: int = 20):
+    """Most recent kept traces (slow requests and those sent with `X-Trace: 1`), newest first"""
+    return {"data": [trace.summary() for trace in traces.recent(limit)]}
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """One trace with its spans and, if it was requested with `X-Profile: 1`, its sampled stacks"""
+    trace = traces.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found (it may have been evicted)")
+    return {"data": trace.to_dict()}
@@ -0,0 +1,87 @@
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional, Tuple
+import httpx
+
+from ..utilities import get_httpx_client, galaxy_store, fleet_repository
+from ..tracing import TracedRoute
+
+router = APIRouter(prefix="/api/galaxy", tags=["galaxy"], route_class=TracedRoute)
+
+async def get_ship_position(ship_symbol: str, client: httpx.AsyncClient) -> Tuple[str, float, float]:
+    """Resolve a ship to (system symbol, x, y) from its nav data"""
+    ship = await fleet_repository.fetch(ship_symbol, client)
+    nav = ship["nav"]
+    destination = nav.get("route", {}).get("destination")
+    if destination and destination.get("symbol") == nav["waypointSymbol"]:
+        return nav["systemSymbol"], destination["x"], destination["y"]
+
+    waypoint = galaxy_store.get_waypoint(nav["waypointSymbol"])
+    if not waypoint:
+        raise HTTPException(status_code=404, detail="Ship location is not in the local galaxy store")
+    return nav["systemSymbol"], waypoint["x"], waypoint["y"]
+
+@router.get("/waypoints/nearest")
+async def get_nearest_waypoints(
+    ship: Optional[str] = None,
+    waypoint: Optional[str] = None,
+    system: Optional[str] = None,
+    x: Optional[float] = None,
+    y: Optional[float] = None,
+    trait: Optional[str] = None,
+    type: Optional[str] = None,
+    limit: int = 5,
+    client: httpx.AsyncClient = Depends(get_httpx_client)
+):
+    """Find the nearest waypoints to a ship, a waypoint or a point in a system, optionally by trait or type"""
+    if ship:
+        system, x, y = await get_ship_position(ship, client)
+    elif waypoint:
+        origin = galaxy_store.get_waypoint(waypoint)
+        if not origin:
+            raise HTTPException(status_code=404, detail="Waypoint not found in local galaxy store")
+        system, x, y = origin["systemSymbol"], origin["x"], origin["y"]
+    elif system is None or x is None or y is None:
+        raise HTTPException(status_code=400, detail="Provide ship, waypoint, or system with x and y")
+
+    results = galaxy_store.nearest_waypoints(system, x, y, limit=limit, trait=trait, waypoint_type=type)
+    return {
+        "data": [dict(found, distance=round(distance, 3)) for distance, found in results],
+        "origin": {"systemSymbol": system, "x": x, "y": y}
+    }
+
+@router.get("/systems/nearest")
+async def get_nearest_systems(
+    system: Optional[str] = None,
+    x: Optional[float] = None,
+    y: Optional[float] = None,
+    limit: int = 5
+):
+    """Find the nearest systems to a system or to galaxy coordinates"""
+    if system:
+        origin = galaxy_store.get_system(system)
+        if not origin:
+            raise HTTPException(status_code=404, detail="System not found in local galaxy store")
+        x, y = origin["x"], origin["y"]
+    elif x is None or y is None:
+        raise HTTPException(status_code=400, detail="Provide system, or x and y")
+
+    results = galaxy_store.nearest_systems(x, y, limit=limit)
+    return {"data": [dict(found, distance=round(distance, 3)) for distance, found in results]}
+
+@router.get("/waypoints/{waypoint_symbol}")
+async def get_stored_waypoint(waypoint_symbol: str):
+    """Get a waypoint from the local galaxy store"""
+    waypoint = galaxy_store.get_waypoint(waypoint_symbol)
+    if not waypoint:
+        raise HTTPException(status_code=404, detail="Waypoint not found in local galaxy store")
+    return {"data": waypoint}
+
+@router.get("/stats")
+async def get_galaxy_stats():
+    """Get counts of systems and waypoints held in the local galaxy store"""
+    return {
+        "data": {
+            "systems": galaxy_store.system_count(),
+            "waypoints": galaxy_store.waypoint_count()
+        }
+    }
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
+import httpx
+
+from ..utilities import get_httpx_client, market_history, market_ingester
+from ..tracing import TracedRoute
+
+router = APIRouter(prefix="/api/markets", tags=["markets"], route_class=TracedRoute)
+
+@router.get("")
+async def get_markets():
+    """Every market with recorded prices: goods seen, observations and last poll"""
+    return {"data": market_history.markets()}
+
+@router.post("/poll")
+async def start_market_polling(client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Start polling every known marketplace into the price history (no-op if already running)"""
+    market_ingester.start(client)
+    return {"data": market_ingester.status()}
+
+@router.delete("/poll")
+async def stop_market_polling():
+    """Stop background market polling, saving the history when MARKET_HISTORY_PATH is set"""
+    await market_ingester.stop()
+    return {"data": market_ingester.status()}
+
+@router.get("/poll")
+async def get_market_polling_status():
+    """Get market polling progress and price history size"""
+    return {"data": market_ingester.status()}
+
+@router.post("/{waypoint_symbol}/poll")
+async def poll_market(waypoint_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Read one market now (e.g. right after a ship docks there) and record its prices"""
+    try:
+        await market_ingester.poll(client, waypoint_symbol)
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    goods = market_history.latest(waypoint_symbol)
+    if goods is None:
+        raise HTTPException(status_code=404, detail="No prices reported for that market")
+    return {"data": {"symbol": waypoint_symbol, "tradeGoods": goods}}
+
+@router.get("/{waypoint_symbol}")
+async def get_market_prices(waypoint_symbol: str):
+    """Latest recorded price, volume and supply of every good seen at a market"""
+    goods = market_history.latest(waypoint_symbol)
+    if goods is None:
+        raise HTTPException(status_code=404, detail="No prices recorded for that market")
+    return {"data": {"symbol": waypoint_symbol, "tradeGoods": goods}}
+
+@router.get("/{waypoint_symbol}/history")
+async def get_market_history(waypoint_symbol: str, good: str, start: Optional[float] = None,
+                             end: Optional[float] = None, points: int = 200):
+    """A good's price history at a market (epoch seconds `start`/`end`), downsampled to at most `points` for charts"""
+    history = market_history.history(waypoint_symbol, good, start, end, max(1, min(points, 5000)))
+    if history is None:
+        raise HTTPException(status_code=404, detail="No prices recorded for that good at that market")
+    return {"data": history}
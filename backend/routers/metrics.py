@@ -0,0 +1,52 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..metrics import metrics, render_samples
+from ..upstream import rate_limiter, single_flight, response_cache
+from ..tracing import TracedRoute
+
+router = APIRouter(tags=["metrics"], route_class=TracedRoute)
+
+def _upstream_lines() -> list:
+    """Gauges and counters read from the upstream client's own stats at scrape time"""
+    limiter = rate_limiter.stats()
+    lanes = limiter["lanes"]
+    cache = response_cache.stats()
+    resources = cache["resources"]
+    coalescing = single_flight.stats()
+    return [
+        *render_samples("upstream_rate_limiter_queue_depth", "gauge", "Callers waiting for a rate limiter token.",
+                        [({"lane": lane}, stats["queueDepth"]) for lane, stats in lanes.items()]),
+        *render_samples("upstream_rate_limiter_granted_total", "counter", "Rate limiter tokens handed out.",
+                        [({"lane": lane}, stats["granted"]) for lane, stats in lanes.items()]),
+        *render_samples("upstream_rate_limiter_wait_seconds_max", "gauge", "Longest wait for a token so far.",
+                        [({"lane": lane}, stats["maxWaitMs"] / 1000) for lane, stats in lanes.items()]),
+        *render_samples("upstream_rate_limiter_tokens", "gauge", "Tokens currently in the bucket.",
+                        [({}, limiter["tokens"])]),
+        *render_samples("upstream_rate_limiter_rate_per_second", "gauge", "Current token refill rate.",
+                        [({}, limiter["ratePerSecond"])]),
+        *render_samples("upstream_throttled_responses_total", "counter", "429 responses received from SpaceTraders.",
+                        [({}, limiter["throttledResponses"])]),
+        *render_samples("upstream_cache_hits_total", "counter", "Upstream GETs answered from the response cache.",
+                        [({"resource": resource, "tier": tier}, counters[f"{tier}Hits"])
+                         for resource, counters in resources.items() for tier in ("memory", "disk")]),
+        *render_samples("upstream_cache_misses_total", "counter", "Cacheable upstream GETs that went upstream.",
+                        [({"resource": resource}, counters["misses"]) for resource, counters in resources.items()]),
+        *render_samples("upstream_cache_invalidations_total", "counter", "Times a cached resource was dropped.",
+                        [({"resource": resource}, counters["invalidations"]) for resource, counters in resources.items()]),
+        *render_samples("upstream_cache_hit_ratio", "gauge", "Share of cacheable lookups served from cache.",
+                        [({}, cache["hitRatio"])]),
+        *render_samples("upstream_cache_entries", "gauge", "Responses held in memory.", [({}, cache["entries"])]),
+        *render_samples("upstream_cache_evictions_total", "counter", "Entries evicted by the LRU bound.",
+                        [({}, cache["evictions"])]),
+        *render_samples("upstream_coalesced_requests_total", "counter", "GETs that shared an identical in-flight call.",
+                        [({}, coalescing["coalescedCalls"])]),
+        *render_samples("upstream_in_flight_requests", "gauge", "Distinct coalescable GETs in flight.",
+                        [({}, coalescing["inFlight"])]),
+    ]
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Request and upstream metrics in the Prometheus text exposition format"""
+    lines = metrics.render() + _upstream_lines()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
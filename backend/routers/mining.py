@@ -0,0 +1,77 @@
+from fastapi import APIRouter, HTTPException, Depends
+import httpx
+
+from ..config import HAS_VALID_TOKEN, SPACETRADERS_API_URL, SPACETRADERS_TOKEN
+from ..models import MiningStartRequest, ExtractRequest, CargoRequest, NavigateRequest
+from ..upstream import get_upstream_client
+from ..utilities import get_httpx_client, fleet_repository, galaxy_store, mining_engine, mock_galaxy
+from ..tracing import TracedRoute
+from .ships import extract_resources, jettison_cargo, sell_cargo, navigate_ship, dock_ship, orbit_ship
+from .scanning import create_survey
+
+router = APIRouter(prefix="/api/mining", tags=["mining"], route_class=TracedRoute)
+
+@router.post("/{ship_symbol}/start")
+async def start_mining(ship_symbol: str, request: MiningStartRequest = MiningStartRequest(), client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Start the survey-extract-sell loop for a ship at its current waypoint"""
+    ship = await fleet_repository.fetch(ship_symbol, client)
+    market_waypoint = request.marketWaypoint or ship["nav"]["waypointSymbol"]
+    if not await _has_marketplace(market_waypoint, client):
+        raise HTTPException(status_code=400, detail=f"No marketplace at {market_waypoint} to sell at; set marketWaypoint")
+    try:
+        job = mining_engine.start(ship_symbol, market_waypoint)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"data": job.to_dict()}
+
+async def _has_marketplace(waypoint_symbol: str, client: httpx.AsyncClient) -> bool:
+    if not HAS_VALID_TOKEN:
+        return mock_galaxy.market(waypoint_symbol) is not None
+    
+    waypoint = galaxy_store.get_waypoint(waypoint_symbol)
+    if waypoint is None:
+        try:
+            headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
+            system_symbol = waypoint_symbol.rsplit("-", 1)[0]
+            response = await client.get(f"{SPACETRADERS_API_URL}/systems/{system_symbol}/waypoints/{waypoint_symbol}", headers=headers)
+            
+            if response.status_code == 200:
+                waypoint = response.json()["data"]
+                galaxy_store.save_waypoints([waypoint])
+            else:
+                raise HTTPException(status_code=response.status_code, detail=response.text)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    return any(trait["symbol"] == "MARKETPLACE" for trait in waypoint.get("traits", []))
+
+@router.post("/{ship_symbol}/stop")
+async def stop_mining(ship_symbol: str):
+    """Stop a ship's mining loop, keeping its totals"""
+    job = await mining_engine.stop_ship(ship_symbol)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ship has no mining job")
+    return {"data": job.to_dict()}
+
+@router.get("/status")
+async def get_mining_status():
+    """Get every mining job and the fleet's combined yield per hour"""
+    return {"data": mining_engine.stats()}
+
+@router.get("/{ship_symbol}/status")
+async def get_ship_mining_status(ship_symbol: str):
+    """Get a ship's mining state, yields and units/credits per hour"""
+    job = mining_engine.jobs.get(ship_symbol)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ship has no mining job")
+    return {"data": job.to_dict()}
+
+# The engine's steps are the ordinary ship actions, sharing the upstream client and its rate budget
+mining_engine.register("survey", lambda ship_symbol, payload: create_survey(ship_symbol, get_upstream_client()))
+mining_engine.register("extract", lambda ship_symbol, payload: extract_resources(ship_symbol, ExtractRequest(**payload), get_upstream_client()))
+mining_engine.register("sell", lambda ship_symbol, payload: sell_cargo(ship_symbol, CargoRequest(**payload), get_upstream_client()))
+mining_engine.register("jettison", lambda ship_symbol, payload: jettison_cargo(ship_symbol, CargoRequest(**payload), get_upstream_client()))
+mining_engine.register("navigate", lambda ship_symbol, payload: navigate_ship(ship_symbol, NavigateRequest(**payload), get_upstream_client()))
+mining_engine.register("dock", lambda ship_symbol, payload: dock_ship(ship_symbol, get_upstream_client()))
+mining_engine.register("orbit", lambda ship_symbol, payload: orbit_ship(ship_symbol, get_upstream_client()))
@@ -1,34 +1,37 @@
 from fastapi import APIRouter, HTTPException
 from ..models import ModificationRequest, CustomizationRequest
 from ..config import SHIP_COLORS, SHIP_DECALS
-from ..mock_data import MOCK_SHIPS, MOCK_AGENT, MOCK_EQUIPMENT
+from ..mock_data import MOCK_AGENT
+from ..utilities import fleet_store, fleet_repository, mock_galaxy
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/api", tags=["modifications"])
+router = APIRouter(prefix="/api", tags=["modifications"], route_class=TracedRoute)
 
 @router.get("/equipment")
 async def get_equipment():
     """Get available equipment for ship modifications"""
-    return {"data": MOCK_EQUIPMENT}
+    return {"data": mock_galaxy.equipment}
 
 @router.get("/equipment/{component_type}")
 async def get_equipment_by_type(component_type: str):
     """Get equipment by type (modules, mounts, reactors, engines)"""
-    if component_type not in MOCK_EQUIPMENT:
+    if component_type not in mock_galaxy.equipment:
         raise HTTPException(status_code=404, detail="Component type not found")
-    return {"data": MOCK_EQUIPMENT[component_type]}
+    return {"data": mock_galaxy.equipment[component_type]}
 
 @router.post("/ships/{ship_symbol}/install")
+@fleet_repository.locked
 async def install_component(ship_symbol: str, request: ModificationRequest):
     """Install a module or mount on a ship"""
     # Find the ship
-    ship = next((s for s in MOCK_SHIPS if s["symbol"] == ship_symbol), None)
+    ship = fleet_repository.get(ship_symbol)
     if not ship:
         raise HTTPException(status_code=404, detail="Ship not found")
     
     # Find the component in equipment
     component_data = None
-    if request.componentType in MOCK_EQUIPMENT:
-        component_data = next((c for c in MOCK_EQUIPMENT[request.componentType] if c["symbol"] == request.componentSymbol), None)
+    if request.componentType in mock_galaxy.equipment:
+        component_data = next((c for c in mock_galaxy.equipment[request.componentType] if c["symbol"] == request.componentSymbol), None)
     
     if not component_data:
         raise HTTPException(status_code=404, detail="Component not found")
@@ -76,7 +79,7 @@ async def install_component(ship_symbol: str, request: ModificationRequest):
     # Deduct credits
     MOCK_AGENT["credits"] -= component_data["price"]
     
-    return {
+    result = {
         "data": {
             "ship": ship,
             "transaction": {
@@ -86,11 +89,14 @@ async def install_component(ship_symbol: str, request: ModificationRequest):
             }
         }
     }
+    fleet_store.apply_response(ship_symbol, result)
+    return result
 
 @router.post("/ships/{ship_symbol}/remove")
+@fleet_repository.locked
 async def remove_component(ship_symbol: str, request: ModificationRequest):
     """Remove a module or mount from a ship"""
-    ship = next((s for s in MOCK_SHIPS if s["symbol"] == ship_symbol), None)
+    ship = fleet_repository.get(ship_symbol)
     if not ship:
         raise HTTPException(status_code=404, detail="Ship not found")
     
@@ -113,14 +119,14 @@ async def remove_component(ship_symbol: str, request: ModificationRequest):
     
     # Calculate refund (50% of original price)
     component_data = None
-    if request.componentType in MOCK_EQUIPMENT:
-        component_data = next((c for c in MOCK_EQUIPMENT[request.componentType] if c["symbol"] == request.componentSymbol), None)
+    if request.componentType in mock_galaxy.equipment:
+        component_data = next((c for c in mock_galaxy.equipment[request.componentType] if c["symbol"] == request.componentSymbol), None)
     
     if component_data:
         refund_amount = component_data["price"] // 2
         MOCK_AGENT["credits"] += refund_amount
     
-    return {
+    result = {
         "data": {
             "ship": ship,
             "transaction": {
@@ -130,11 +136,14 @@ async def remove_component(ship_symbol: str, request: ModificationRequest):
             }
         }
     }
+    fleet_store.apply_response(ship_symbol, result)
+    return result
 
 @router.post("/ships/{ship_symbol}/customize")
+@fleet_repository.locked
 async def customize_ship(ship_symbol: str, request: CustomizationRequest):
     """Customize ship appearance (name, color, decals)"""
-    ship = next((s for s in MOCK_SHIPS if s["symbol"] == ship_symbol), None)
+    ship = fleet_repository.get(ship_symbol)
     if not ship:
         raise HTTPException(status_code=404, detail="Ship not found")
     
@@ -166,7 +175,7 @@ async def customize_ship(ship_symbol: str, request: CustomizationRequest):
     
     MOCK_AGENT["credits"] -= total_cost
     
-    return {
+    result = {
         "data": {
             "ship": ship,
             "transaction": {
@@ -175,11 +184,13 @@ async def customize_ship(ship_symbol: str, request: CustomizationRequest):
             }
         }
     }
+    fleet_store.apply_response(ship_symbol, result)
+    return result
 
 @router.get("/ships/{ship_symbol}/modification-info")
 async def get_ship_modification_info(ship_symbol: str):
     """Get ship modification capabilities and current status"""
-    ship = next((s for s in MOCK_SHIPS if s["symbol"] == ship_symbol), None)
+    ship = fleet_repository.get(ship_symbol)
     if not ship:
         raise HTTPException(status_code=404, detail="Ship not found")
     
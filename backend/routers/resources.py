@@ -4,8 +4,9 @@ import httpx
 from ..config import HAS_VALID_TOKEN
 from ..mock_data import generate_mock_resource_data
 from ..utilities import get_httpx_client
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/api/ships", tags=["resources"])
+router = APIRouter(prefix="/api/ships", tags=["resources"], route_class=TracedRoute)
 
 @router.get("/{ship_symbol}/resources")
 async def get_ship_resources(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
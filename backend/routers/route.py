@@ -0,0 +1,72 @@
+from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import httpx
+
+from ..route_planner import FLIGHT_MODES, summarize_route
+from ..utilities import get_httpx_client, galaxy_store, route_planner, fleet_repository
+from ..tracing import TracedRoute
+
+router = APIRouter(prefix="/api/route", tags=["route"], route_class=TracedRoute)
+
+@router.get("")
+async def get_route(
+    to: str,
+    ship: Optional[str] = None,
+    origin: Optional[str] = None,
+    fuel: Optional[int] = None,
+    capacity: Optional[int] = None,
+    speed: Optional[int] = None,
+    modes: Optional[str] = None,
+    client: httpx.AsyncClient = Depends(get_httpx_client)
+):
+    """Plan the fastest multi-hop route to a waypoint, refuelling at marketplaces on the way.
+
+    Uses the ship's location, fuel and engine speed when `ship` is given (any of
+    which `origin`, `fuel`, `capacity` and `speed` override). `modes` limits the
+    flight modes considered, e.g. `CRUISE,DRIFT`.
+    """
+    if ship:
+        data = await fleet_repository.fetch(ship, client)
+        origin = origin or data["nav"]["waypointSymbol"]
+        ship_fuel = data.get("fuel", {})
+        fuel = ship_fuel.get("current", 0) if fuel is None else fuel
+        capacity = ship_fuel.get("capacity", 0) if capacity is None else capacity
+        speed = data["engine"].get("speed") if speed is None else speed
+    if not origin:
+        raise HTTPException(status_code=400, detail="Provide ship or origin")
+    capacity = 0 if capacity is None else capacity
+    fuel = capacity if fuel is None else fuel
+    speed = speed or 30
+
+    allowed = None
+    if modes:
+        allowed = [mode.strip().upper() for mode in modes.split(",")]
+        unknown = [mode for mode in allowed if mode not in FLIGHT_MODES]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown flight modes: {', '.join(unknown)}")
+
+    start = galaxy_store.get_waypoint(origin)
+    end = galaxy_store.get_waypoint(to)
+    if not start or not end:
+        raise HTTPException(status_code=404, detail="Waypoint not found in local galaxy store")
+    if start["systemSymbol"] != end["systemSymbol"]:
+        raise HTTPException(status_code=400, detail="Routes between systems are not supported")
+
+    # Planned on the event loop: the planner reads and fills the galaxy store's indexes and its own
+    # graph cache, which the loop also writes, and a cached graph makes a plan a few milliseconds
+    hops = route_planner.plan(start, end, fuel, capacity, speed, allowed)
+    if hops is None:
+        raise HTTPException(status_code=422, detail="Destination is unreachable with the available fuel")
+
+    route = summarize_route(hops)
+    eta = datetime.now(timezone.utc) + timedelta(seconds=route["totalDuration"])
+    return {
+        "data": dict(
+            route,
+            origin=origin,
+            destination=to,
+            fuel={"current": fuel, "capacity": capacity},
+            eta=eta.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        )
+    }
@@ -1,37 +1,46 @@
 from fastapi import APIRouter, HTTPException, Depends
+import time
 import httpx
 
+from ..cooldown_scheduler import cooldown_deadline
 from ..config import HAS_VALID_TOKEN, SPACETRADERS_API_URL, SPACETRADERS_TOKEN
-from ..mock_data import MOCK_SCAN_RESULTS, MOCK_SURVEYS
-from ..utilities import get_httpx_client
+from ..mock_data import mock_cooldown
+from ..upstream import get_upstream_client
+from ..utilities import get_httpx_client, fleet_store, fleet_repository, mock_galaxy, cooldown_scheduler, survey_store
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/api/ships", tags=["scanning"])
+router = APIRouter(prefix="/api/ships", tags=["scanning"], route_class=TracedRoute)
 
 @router.post("/{ship_symbol}/scan/systems")
 async def scan_systems(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Long-range sensors - Detect systems and celestial objects"""
     if not HAS_VALID_TOKEN:
-        # Mock response for demo
-        return {
+        # Mock response for demo: the systems nearest the ship's
+        ship = fleet_repository.get(ship_symbol)
+        if not ship:
+            raise HTTPException(status_code=404, detail="Ship not found")
+        body = {
             "data": {
-                "cooldown": {
-                    "shipSymbol": ship_symbol,
-                    "totalSeconds": 70,
-                    "remainingSeconds": 70,
-                    "expiration": "2023-11-01T00:01:10.000Z"
-                },
-                "systems": MOCK_SCAN_RESULTS["systems"]
+                "cooldown": mock_cooldown(ship_symbol, 70),
+                "systems": mock_galaxy.nearby_systems(ship["nav"]["systemSymbol"])
             }
         }
+        fleet_store.apply_response(ship_symbol, body)
+        return body
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
         response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/scan/systems", headers=headers)
         
         if response.status_code == 201:
-            return response.json()
+            body = response.json()
+            # Carries the new cooldown, which the scheduler times queued actions by
+            fleet_store.apply_response(ship_symbol, body)
+            return body
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -39,27 +48,32 @@ async def scan_systems(ship_symbol: str, client: httpx.AsyncClient = Depends(get
 async def scan_waypoints(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Planetary survey - Scan waypoints for resources and composition"""
     if not HAS_VALID_TOKEN:
-        # Mock response for demo
-        return {
+        # Mock response for demo: the waypoints of the ship's system
+        ship = fleet_repository.get(ship_symbol)
+        if not ship:
+            raise HTTPException(status_code=404, detail="Ship not found")
+        body = {
             "data": {
-                "cooldown": {
-                    "shipSymbol": ship_symbol,
-                    "totalSeconds": 60,
-                    "remainingSeconds": 60,
-                    "expiration": "2023-11-01T00:01:00.000Z"
-                },
-                "waypoints": MOCK_SCAN_RESULTS["waypoints"]
+                "cooldown": mock_cooldown(ship_symbol, 60),
+                "waypoints": mock_galaxy.waypoints(ship["nav"]["systemSymbol"])
             }
         }
+        fleet_store.apply_response(ship_symbol, body)
+        return body
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
         response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/scan/waypoints", headers=headers)
         
         if response.status_code == 201:
-            return response.json()
+            body = response.json()
+            # Carries the new cooldown, which the scheduler times queued actions by
+            fleet_store.apply_response(ship_symbol, body)
+            return body
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -67,27 +81,32 @@ async def scan_waypoints(ship_symbol: str, client: httpx.AsyncClient = Depends(g
 async def scan_ships(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Signal interception and threat assessment - Scan nearby ships"""
     if not HAS_VALID_TOKEN:
-        # Mock response for demo
-        return {
+        # Mock response for demo: the other ships in the ship's system
+        ship = fleet_repository.get(ship_symbol)
+        if not ship:
+            raise HTTPException(status_code=404, detail="Ship not found")
+        body = {
             "data": {
-                "cooldown": {
-                    "shipSymbol": ship_symbol,
-                    "totalSeconds": 10,
-                    "remainingSeconds": 10,
-                    "expiration": "2023-11-01T00:00:10.000Z"
-                },
-                "ships": MOCK_SCAN_RESULTS["ships"]
+                "cooldown": mock_cooldown(ship_symbol, 10),
+                "ships": mock_galaxy.scanned_ships(ship["nav"]["waypointSymbol"])
             }
         }
+        fleet_store.apply_response(ship_symbol, body)
+        return body
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
         response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/scan/ships", headers=headers)
         
         if response.status_code == 201:
-            return response.json()
+            body = response.json()
+            # Carries the new cooldown, which the scheduler times queued actions by
+            fleet_store.apply_response(ship_symbol, body)
+            return body
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -95,27 +114,38 @@ async def scan_ships(ship_symbol: str, client: httpx.AsyncClient = Depends(get_h
 async def create_survey(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Resource mapping - Create detailed survey of current waypoint"""
     if not HAS_VALID_TOKEN:
-        # Mock response for demo
-        return {
+        # Mock response for demo: fresh surveys of the ship's waypoint, which needs deposits to survey
+        ship = fleet_repository.get(ship_symbol)
+        if not ship:
+            raise HTTPException(status_code=404, detail="Ship not found")
+        surveys = mock_galaxy.surveys(ship["nav"]["waypointSymbol"])
+        if not surveys:
+            raise HTTPException(status_code=400, detail="Waypoint has no deposits to survey")
+        body = {
             "data": {
-                "cooldown": {
-                    "shipSymbol": ship_symbol,
-                    "totalSeconds": 60,
-                    "remainingSeconds": 60,
-                    "expiration": "2023-11-01T00:01:00.000Z"
-                },
-                "surveys": MOCK_SURVEYS
+                "cooldown": mock_cooldown(ship_symbol, 60),
+                "surveys": surveys
             }
         }
+        fleet_store.apply_response(ship_symbol, body)
+        survey_store.add(body["data"]["surveys"])
+        return body
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
         response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/survey", headers=headers)
         
         if response.status_code == 201:
-            return response.json()
+            body = response.json()
+            # Carries the new cooldown, which the scheduler times queued actions by
+            fleet_store.apply_response(ship_symbol, body)
+            # Kept for extractions until they expire or are exhausted
+            survey_store.add(body["data"]["surveys"])
+            return body
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -123,7 +153,11 @@ async def create_survey(ship_symbol: str, client: httpx.AsyncClient = Depends(ge
 async def get_ship_cooldown(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Get current ship cooldown status"""
     if not HAS_VALID_TOKEN:
-        # Mock response - no cooldown
+        # Mock response: the cooldown left by the ship's last mock action, if it hasn't expired
+        cooldown = (fleet_repository.get(ship_symbol) or {}).get("cooldown")
+        remaining = round(cooldown_deadline(cooldown) - time.monotonic())
+        if remaining > 0:
+            return {"data": dict(cooldown, remainingSeconds=remaining)}
         return {
             "data": {
                 "shipSymbol": ship_symbol,
@@ -138,10 +172,10 @@ async def get_ship_cooldown(ship_symbol: str, client: httpx.AsyncClient = Depend
         response = await client.get(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/cooldown", headers=headers)
         
         if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 404:
+            body = response.json()
+        elif response.status_code in (204, 404):
             # No cooldown
-            return {
+            body = {
                 "data": {
                     "shipSymbol": ship_symbol,
                     "totalSeconds": 0,
@@ -151,5 +185,15 @@ async def get_ship_cooldown(ship_symbol: str, client: httpx.AsyncClient = Depend
             }
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+        fleet_store.apply_response(ship_symbol, {"data": {"cooldown": body["data"]}})
+        return body
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Cooldown-bound actions the scheduler can queue (POST /api/ships/{ship_symbol}/schedule)
+cooldown_scheduler.register("scan-systems", lambda ship_symbol, payload: scan_systems(ship_symbol, get_upstream_client()))
+cooldown_scheduler.register("scan-waypoints", lambda ship_symbol, payload: scan_waypoints(ship_symbol, get_upstream_client()))
+cooldown_scheduler.register("scan-ships", lambda ship_symbol, payload: scan_ships(ship_symbol, get_upstream_client()))
+cooldown_scheduler.register("survey", lambda ship_symbol, payload: create_survey(ship_symbol, get_upstream_client()))
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException
+
+from ..models import ScheduleActionRequest
+from ..utilities import cooldown_scheduler
+from ..tracing import TracedRoute
+
+router = APIRouter(prefix="/api", tags=["scheduler"], route_class=TracedRoute)
+
+@router.post("/ships/{ship_symbol}/schedule")
+async def schedule_action(ship_symbol: str, request: ScheduleActionRequest):
+    """Queue an action to run as soon as the ship's cooldown (and anything queued before it) allows"""
+    try:
+        scheduled = cooldown_scheduler.submit(ship_symbol, request.action, request.payload)
+    except KeyError:
+        actions = ", ".join(sorted(cooldown_scheduler.actions))
+        raise HTTPException(status_code=400, detail=f"Unknown action: {request.action}. Choose from: {actions}")
+    return {"data": scheduled.to_dict()}
+
+@router.get("/ships/{ship_symbol}/schedule")
+async def get_schedule(ship_symbol: str):
+    """Get a ship's tracked cooldown, its queued actions and the results of recent ones"""
+    return {"data": cooldown_scheduler.ship_status(ship_symbol)}
+
+@router.delete("/ships/{ship_symbol}/schedule/{action_id}")
+async def cancel_scheduled_action(ship_symbol: str, action_id: str):
+    """Cancel a queued action that hasn't started"""
+    scheduled = cooldown_scheduler.cancel(ship_symbol, action_id)
+    if scheduled is None:
+        raise HTTPException(status_code=404, detail="No queued action with that id")
+    return {"data": scheduled.to_dict()}
+
+@router.get("/scheduler/stats")
+async def get_scheduler_stats():
+    """Get cooldown scheduler counters and timer wheel state"""
+    return {"data": cooldown_scheduler.stats()}
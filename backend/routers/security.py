@@ -1,224 +1,151 @@
 from fastapi import APIRouter, HTTPException
 from ..models import SecurityActionRequest, SecurityStatus
-from ..utilities import ship_security_status
+from ..security_engine import COUNTERMEASURES_CHARGES, JAMMING_RADIUS
+from ..utilities import security_engine
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/api/ships", tags=["security"])
+router = APIRouter(prefix="/api/ships", tags=["security"], route_class=TracedRoute)
+
+def _activate(request: SecurityActionRequest) -> bool:
+    if request.action not in ("activate", "deactivate"):
+        raise HTTPException(status_code=400, detail="Invalid action. Use 'activate' or 'deactivate'")
+    return request.action == "activate"
+
+@router.get("/security/status")
+async def get_security_statuses(symbols: str):
+    """Get the security status of many ships (`symbols` is comma-separated), all as of the same instant"""
+    ship_symbols = [symbol for symbol in symbols.split(",") if symbol]
+    return {"data": security_engine.statuses(ship_symbols)}
 
 @router.get("/{ship_symbol}/security/status", response_model=SecurityStatus)
 async def get_ship_security_status(ship_symbol: str):
     """Get current security status for a ship"""
-    if ship_symbol not in ship_security_status:
-        ship_security_status[ship_symbol] = SecurityStatus()
-    return ship_security_status[ship_symbol]
+    return security_engine.status(ship_symbol)
 
 @router.post("/{ship_symbol}/security/cloaking")
 async def toggle_cloaking_device(ship_symbol: str, request: SecurityActionRequest):
-    """Activate or deactivate cloaking device"""
-    if ship_symbol not in ship_security_status:
-        ship_security_status[ship_symbol] = SecurityStatus()
-    
-    status = ship_security_status[ship_symbol]
-    
-    if request.action == "activate":
-        if status.cloakingCooldown and status.cloakingCooldown > 0:
-            raise HTTPException(status_code=400, detail="Cloaking device is on cooldown")
-        
-        status.cloakingActive = True
-        status.energyConsumption += 25
-        status.cloakingCooldown = None
-        
+    """Activate (for `duration` seconds, default 5 minutes) or deactivate the cloaking device"""
+    activate = _activate(request)
+    try:
+        seconds = security_engine.cloaking(ship_symbol, activate, request.duration)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if activate:
         return {
             "message": "Cloaking device activated. Ship is now hidden from sensors.",
-            "status": status,
-            "effectDuration": request.duration or 300  # 5 minutes default
-        }
-    
-    elif request.action == "deactivate":
-        status.cloakingActive = False
-        status.energyConsumption = max(0, status.energyConsumption - 25)
-        status.cloakingCooldown = 120  # 2 minute cooldown
-        
-        return {
-            "message": "Cloaking device deactivated. Ship is now visible to sensors.",
-            "status": status,
-            "cooldownDuration": 120
+            "status": security_engine.status(ship_symbol),
+            "effectDuration": seconds
         }
-    
-    else:
-        raise HTTPException(status_code=400, detail="Invalid action. Use 'activate' or 'deactivate'")
+
+    return {
+        "message": "Cloaking device deactivated. Ship is now visible to sensors.",
+        "status": security_engine.status(ship_symbol),
+        "cooldownDuration": seconds
+    }
 
 @router.post("/{ship_symbol}/security/jamming")
 async def toggle_signal_jamming(ship_symbol: str, request: SecurityActionRequest):
     """Activate or deactivate signal jamming"""
-    if ship_symbol not in ship_security_status:
-        ship_security_status[ship_symbol] = SecurityStatus()
-    
-    status = ship_security_status[ship_symbol]
-    
-    if request.action == "activate":
-        status.signalJammingActive = True
-        status.jammingRadius = 50  # 50 unit radius
-        status.energyConsumption += 15
-        
-        return {
-            "message": "Signal jamming activated. Disrupting enemy communications in 50 unit radius.",
-            "status": status,
-            "jammingRadius": 50
-        }
-    
-    elif request.action == "deactivate":
-        status.signalJammingActive = False
-        status.jammingRadius = 0
-        status.energyConsumption = max(0, status.energyConsumption - 15)
-        
+    activate = _activate(request)
+    security_engine.jamming(ship_symbol, activate, request.duration)
+
+    if activate:
         return {
-            "message": "Signal jamming deactivated.",
-            "status": status
+            "message": f"Signal jamming activated. Disrupting enemy communications in {JAMMING_RADIUS} unit radius.",
+            "status": security_engine.status(ship_symbol),
+            "jammingRadius": JAMMING_RADIUS
         }
-    
-    else:
-        raise HTTPException(status_code=400, detail="Invalid action. Use 'activate' or 'deactivate'")
+
+    return {
+        "message": "Signal jamming deactivated.",
+        "status": security_engine.status(ship_symbol)
+    }
 
 @router.post("/{ship_symbol}/security/electronic-warfare")
 async def toggle_electronic_warfare(ship_symbol: str, request: SecurityActionRequest):
     """Activate or deactivate electronic warfare systems"""
-    if ship_symbol not in ship_security_status:
-        ship_security_status[ship_symbol] = SecurityStatus()
-    
-    status = ship_security_status[ship_symbol]
-    
-    if request.action == "activate":
-        status.electronicWarfareActive = True
-        status.energyConsumption += 30
-        
+    activate = _activate(request)
+    security_engine.electronic_warfare(ship_symbol, activate, request.duration)
+
+    if activate:
         return {
             "message": "Electronic warfare systems activated. Ready to hack enemy systems.",
-            "status": status,
+            "status": security_engine.status(ship_symbol),
             "capabilities": ["System infiltration", "Data extraction", "Remote control override"]
         }
-    
-    elif request.action == "deactivate":
-        status.electronicWarfareActive = False
-        status.energyConsumption = max(0, status.energyConsumption - 30)
-        
-        return {
-            "message": "Electronic warfare systems deactivated.",
-            "status": status
-        }
-    
-    else:
-        raise HTTPException(status_code=400, detail="Invalid action. Use 'activate' or 'deactivate'")
+
+    return {
+        "message": "Electronic warfare systems deactivated.",
+        "status": security_engine.status(ship_symbol)
+    }
 
 @router.post("/{ship_symbol}/security/stealth-mode")
 async def toggle_stealth_mode(ship_symbol: str, request: SecurityActionRequest):
-    """Activate or deactivate stealth mode"""
-    if ship_symbol not in ship_security_status:
-        ship_security_status[ship_symbol] = SecurityStatus()
-    
-    status = ship_security_status[ship_symbol]
-    
-    if request.action == "activate":
-        status.stealthModeActive = True
-        status.stealthModeLevel = min(3, status.stealthModeLevel + 1)
-        status.energyConsumption += 10 * status.stealthModeLevel
-        
-        return {
-            "message": f"Stealth mode activated at level {status.stealthModeLevel}. Sensor signature reduced.",
-            "status": status,
-            "signatureReduction": f"{25 * status.stealthModeLevel}%"
-        }
-    
-    elif request.action == "deactivate":
-        if status.stealthModeActive:
-            status.energyConsumption = max(0, status.energyConsumption - (10 * status.stealthModeLevel))
-        status.stealthModeActive = False
-        status.stealthModeLevel = 0
-        
+    """Activate (raising the level by one, up to 3) or deactivate stealth mode"""
+    activate = _activate(request)
+    level = security_engine.stealth_mode(ship_symbol, activate, request.duration)
+
+    if activate:
         return {
-            "message": "Stealth mode deactivated. Sensor signature at normal levels.",
-            "status": status
+            "message": f"Stealth mode activated at level {level}. Sensor signature reduced.",
+            "status": security_engine.status(ship_symbol),
+            "signatureReduction": f"{25 * level}%"
         }
-    
-    else:
-        raise HTTPException(status_code=400, detail="Invalid action. Use 'activate' or 'deactivate'")
+
+    return {
+        "message": "Stealth mode deactivated. Sensor signature at normal levels.",
+        "status": security_engine.status(ship_symbol)
+    }
 
 @router.post("/{ship_symbol}/security/countermeasures")
 async def deploy_countermeasures(ship_symbol: str, request: SecurityActionRequest):
-    """Deploy countermeasures (decoys and chaff)"""
-    if ship_symbol not in ship_security_status:
-        ship_security_status[ship_symbol] = SecurityStatus()
-    
-    status = ship_security_status[ship_symbol]
-    
-    if request.action == "activate":
-        if status.countermeasuresCharges <= 0:
-            raise HTTPException(status_code=400, detail="No countermeasure charges remaining")
-        
-        status.countermeasuresActive = True
-        status.countermeasuresCharges -= 1
-        
+    """Deploy countermeasures (decoys and chaff) for `duration` seconds, default 3 minutes"""
+    activate = _activate(request)
+    try:
+        seconds = security_engine.countermeasures(ship_symbol, activate, request.duration)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    status = security_engine.status(ship_symbol)
+
+    if activate:
         return {
             "message": "Countermeasures deployed! Decoys and chaff active.",
             "status": status,
-            "remainingCharges": status.countermeasuresCharges,
-            "effectDuration": 180  # 3 minutes
-        }
-    
-    elif request.action == "deactivate":
-        status.countermeasuresActive = False
-        
-        return {
-            "message": "Countermeasures deactivated.",
-            "status": status
+            "remainingCharges": status["countermeasuresCharges"],
+            "effectDuration": seconds
         }
-    
-    else:
-        raise HTTPException(status_code=400, detail="Invalid action. Use 'activate' or 'deactivate'")
+
+    return {
+        "message": "Countermeasures deactivated.",
+        "status": status
+    }
 
 @router.post("/{ship_symbol}/security/encryption")
 async def toggle_encryption(ship_symbol: str, request: SecurityActionRequest):
-    """Activate or deactivate secure communications encryption"""
-    if ship_symbol not in ship_security_status:
-        ship_security_status[ship_symbol] = SecurityStatus()
-    
-    status = ship_security_status[ship_symbol]
-    
-    if request.action == "activate":
-        status.encryptionActive = True
-        status.encryptionLevel = min(5, status.encryptionLevel + 1)
-        status.energyConsumption += 5 * status.encryptionLevel
-        
-        return {
-            "message": f"Encryption activated at level {status.encryptionLevel}. Communications secured.",
-            "status": status,
-            "encryptionStrength": f"AES-{128 + (status.encryptionLevel * 64)}"
-        }
-    
-    elif request.action == "deactivate":
-        if status.encryptionActive:
-            status.energyConsumption = max(0, status.energyConsumption - (5 * status.encryptionLevel))
-        status.encryptionActive = False
-        status.encryptionLevel = 1
-        
+    """Activate (raising the level by one, up to 5) or deactivate secure communications encryption"""
+    activate = _activate(request)
+    level = security_engine.encryption(ship_symbol, activate, request.duration)
+
+    if activate:
         return {
-            "message": "Encryption deactivated. Communications are now unsecured.",
-            "status": status
+            "message": f"Encryption activated at level {level}. Communications secured.",
+            "status": security_engine.status(ship_symbol),
+            "encryptionStrength": f"AES-{128 + (level * 64)}"
         }
-    
-    else:
-        raise HTTPException(status_code=400, detail="Invalid action. Use 'activate' or 'deactivate'")
+
+    return {
+        "message": "Encryption deactivated. Communications are now unsecured.",
+        "status": security_engine.status(ship_symbol)
+    }
 
 @router.post("/{ship_symbol}/security/recharge-countermeasures")
 async def recharge_countermeasures(ship_symbol: str):
     """Recharge countermeasure charges (simulates restocking at a station)"""
-    if ship_symbol not in ship_security_status:
-        ship_security_status[ship_symbol] = SecurityStatus()
-    
-    status = ship_security_status[ship_symbol]
-    status.countermeasuresCharges = 3  # Full recharge
-    
+    security_engine.recharge_countermeasures(ship_symbol)
+
     return {
         "message": "Countermeasure charges recharged to maximum capacity.",
-        "status": status,
-        "totalCharges": 3
-    }
\ No newline at end of file
+        "status": security_engine.status(ship_symbol),
+        "totalCharges": COUNTERMEASURES_CHARGES
+    }
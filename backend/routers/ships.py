@@ -1,42 +1,72 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from collections import defaultdict
+from datetime import datetime, timezone
 from typing import List
+import asyncio
+import json
+import random
+import time
 import httpx
 
-from ..models import Ship, NavigateRequest, RefuelRequest, TransferRequest, ModificationRequest, CustomizationRequest
-from ..config import HAS_VALID_TOKEN, SPACETRADERS_API_URL, SPACETRADERS_TOKEN, SHIP_COLORS, SHIP_DECALS
-from ..mock_data import MOCK_SHIPS, MOCK_AGENT, MOCK_WAYPOINTS, MOCK_EQUIPMENT
-from ..utilities import get_httpx_client
+from ..models import Ship, NavigateRequest, RefuelRequest, TransferRequest, ExtractRequest, CargoRequest, ModificationRequest, CustomizationRequest, BatchShipAction, BatchShipRequest
+from ..config import HAS_VALID_TOKEN, SPACETRADERS_API_URL, SPACETRADERS_TOKEN, SHIP_COLORS, SHIP_DECALS, RESPONSE_PASSTHROUGH
+from ..mock_data import MOCK_AGENT, mock_cooldown
+from ..cooldown_scheduler import cooldown_deadline
+from ..survey_store import dead_survey_error
+from ..passthrough import json_response
+from ..utilities import get_httpx_client, fleet_store, fleet_stream, fleet_repository, mock_galaxy, survey_store
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/api/ships", tags=["ships"])
+router = APIRouter(prefix="/api/ships", tags=["ships"], route_class=TracedRoute)
 
 @router.get("", response_model=List[Ship])
-async def get_ships(client: httpx.AsyncClient = Depends(get_httpx_client)):
-    """Get all ships for the current agent"""
-    if not HAS_VALID_TOKEN:
-        return MOCK_SHIPS
-    
+async def get_ships(refresh: bool = False, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Get all ships for the current agent from the fleet store (`refresh` re-reads them upstream first)"""
+    if HAS_VALID_TOKEN and (fleet_store.synced_at is None or refresh):
+        try:
+            await fleet_store.sync(client)
+        except httpx.HTTPStatusError as e:
+            raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    # The held ships are plain upstream dicts, so they are encoded as they are
+    return json_response(fleet_store.all()) if RESPONSE_PASSTHROUGH else fleet_store.all()
+
+@router.get("/stream")
+async def stream_fleet(client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Server-sent events: a fleet snapshot, then a `ship` event with the changed fields and version after every change"""
+    if not len(fleet_store):
+        await get_ships(client=client)
+    queue = fleet_stream.subscribe()
+    return StreamingResponse(
+        fleet_stream.events(queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{ship_symbol}")
+async def get_ship(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Get one ship from the fleet store, with its version"""
     try:
-        headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
-        response = await client.get(f"{SPACETRADERS_API_URL}/my/ships", headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data["data"]
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
+        ship = await fleet_repository.fetch(ship_symbol, client)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return {"data": ship, "meta": {"version": fleet_store.version(ship_symbol)}}
 
 @router.post("/{ship_symbol}/navigate")
+@fleet_repository.locked
 async def navigate_ship(ship_symbol: str, request: NavigateRequest, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Navigate ship to a waypoint"""
     if not HAS_VALID_TOKEN:
         # Mock navigation response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
-        target_waypoint = next((wp for wp in MOCK_WAYPOINTS if wp["symbol"] == request.waypointSymbol), None)
+        target_waypoint = mock_galaxy.waypoint(request.waypointSymbol)
         if not target_waypoint:
             raise HTTPException(status_code=404, detail="Waypoint not found")
         
@@ -51,12 +81,14 @@ async def navigate_ship(ship_symbol: str, request: NavigateRequest, client: http
             "y": target_waypoint["y"]
         }
         
-        return {
+        result = {
             "data": {
                 "fuel": {"current": 48, "capacity": 100, "consumed": {"amount": 2, "timestamp": "2023-11-01T00:00:00.000Z"}},
                 "nav": mock_ship["nav"]
             }
         }
+        fleet_store.apply_response(ship_symbol, result)
+        return result
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
@@ -65,64 +97,83 @@ async def navigate_ship(ship_symbol: str, request: NavigateRequest, client: http
                                    json=payload, headers=headers)
         
         if response.status_code == 200:
-            return response.json()
+            result = response.json()
+            fleet_store.apply_response(ship_symbol, result)
+            return result
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{ship_symbol}/dock")
+@fleet_repository.locked
 async def dock_ship(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Dock ship at current waypoint"""
     if not HAS_VALID_TOKEN:
         # Mock dock response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
         mock_ship["nav"]["status"] = "DOCKED"
-        return {"data": {"nav": mock_ship["nav"]}}
+        result = {"data": {"nav": mock_ship["nav"]}}
+        fleet_store.apply_response(ship_symbol, result)
+        return result
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
         response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/dock", headers=headers)
         
         if response.status_code == 200:
-            return response.json()
+            result = response.json()
+            fleet_store.apply_response(ship_symbol, result)
+            return result
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{ship_symbol}/orbit")
+@fleet_repository.locked
 async def orbit_ship(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Put ship in orbit around current waypoint"""
     if not HAS_VALID_TOKEN:
         # Mock orbit response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
         mock_ship["nav"]["status"] = "IN_ORBIT"
-        return {"data": {"nav": mock_ship["nav"]}}
+        result = {"data": {"nav": mock_ship["nav"]}}
+        fleet_store.apply_response(ship_symbol, result)
+        return result
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
         response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/orbit", headers=headers)
         
         if response.status_code == 200:
-            return response.json()
+            result = response.json()
+            fleet_store.apply_response(ship_symbol, result)
+            return result
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{ship_symbol}/refuel")
+@fleet_repository.locked
 async def refuel_ship(ship_symbol: str, request: RefuelRequest = RefuelRequest(), client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Refuel ship at current waypoint"""
     if not HAS_VALID_TOKEN:
         # Mock refuel response
-        mock_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
+        mock_ship = fleet_repository.get(ship_symbol)
         if not mock_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
         
@@ -133,13 +184,15 @@ async def refuel_ship(ship_symbol: str, request: RefuelRequest = RefuelRequest()
         fuel_cost = 50 if request.units is None else request.units
         fuel_units = 100 if request.units is None else min(request.units, 100)
         
-        return {
+        result = {
             "data": {
                 "agent": {"credits": 999950},
                 "fuel": {"current": fuel_units, "capacity": 100, "consumed": {"amount": 0, "timestamp": "2023-11-01T00:00:00.000Z"}},
                 "transaction": {"waypointSymbol": mock_ship["nav"]["waypointSymbol"], "shipSymbol": ship_symbol, "tradeSymbol": "FUEL", "type": "PURCHASE", "units": fuel_units, "pricePerUnit": 1, "totalPrice": fuel_cost, "timestamp": "2023-11-01T00:00:00.000Z"}
             }
         }
+        fleet_store.apply_response(ship_symbol, result)
+        return result
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
@@ -151,9 +204,13 @@ async def refuel_ship(ship_symbol: str, request: RefuelRequest = RefuelRequest()
                                    json=payload, headers=headers)
         
         if response.status_code == 200:
-            return response.json()
+            result = response.json()
+            fleet_store.apply_response(ship_symbol, result)
+            return result
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -181,10 +238,13 @@ async def get_repair_cost(ship_symbol: str, client: httpx.AsyncClient = Depends(
             return response.json()
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{ship_symbol}/repair")
+@fleet_repository.locked
 async def repair_ship(ship_symbol: str, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Repair ship at current waypoint"""
     if not HAS_VALID_TOKEN:
@@ -206,19 +266,28 @@ async def repair_ship(ship_symbol: str, client: httpx.AsyncClient = Depends(get_
         response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/repair", headers=headers)
         
         if response.status_code == 200:
-            return response.json()
+            result = response.json()
+            fleet_store.apply_response(ship_symbol, result)
+            return result
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{ship_symbol}/transfer")
 async def transfer_cargo(ship_symbol: str, request: TransferRequest, client: httpx.AsyncClient = Depends(get_httpx_client)):
     """Transfer cargo between ships"""
+    # Both cargo holds change, so hold both ships' locks
+    async with fleet_repository.lock(ship_symbol, request.shipSymbol):
+        return await _transfer_cargo(ship_symbol, request, client)
+
+async def _transfer_cargo(ship_symbol: str, request: TransferRequest, client: httpx.AsyncClient):
     if not HAS_VALID_TOKEN:
         # Mock transfer response
-        source_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == ship_symbol), None)
-        target_ship = next((ship for ship in MOCK_SHIPS if ship["symbol"] == request.shipSymbol), None)
+        source_ship = fleet_repository.get(ship_symbol)
+        target_ship = fleet_repository.get(request.shipSymbol)
         
         if not source_ship or not target_ship:
             raise HTTPException(status_code=404, detail="Ship not found")
@@ -239,11 +308,14 @@ async def transfer_cargo(ship_symbol: str, request: TransferRequest, client: htt
         else:
             target_ship["cargo"]["inventory"].append({"symbol": request.tradeSymbol, "units": request.units})
         
-        return {
+        result = {
             "data": {
                 "cargo": source_ship["cargo"]
             }
         }
+        fleet_store.apply_response(ship_symbol, result)
+        fleet_store.apply(target_ship["symbol"], {"cargo": target_ship["cargo"]})
+        return result
     
     try:
         headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
@@ -256,8 +328,315 @@ async def transfer_cargo(ship_symbol: str, request: TransferRequest, client: htt
                                    json=payload, headers=headers)
         
         if response.status_code == 200:
-            return response.json()
+            result = response.json()
+            fleet_store.apply_response(ship_symbol, result)
+            return result
+        else:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Extractions a mock survey supports before it's exhausted, by size
+MOCK_SURVEY_EXTRACTIONS = {"SMALL": 10, "MODERATE": 25, "LARGE": 50}
+mock_survey_extractions = defaultdict(int)
+
+def _mock_survey_error(survey: dict, code: int, message: str) -> HTTPException:
+    """A dead survey's extraction error, shaped like the live API's; the survey store drops it"""
+    survey_store.discard(survey.get("signature"))
+    return HTTPException(status_code=400, detail=json.dumps({"error": {"message": message, "code": code, "data": {}}}))
+
+def _mock_cargo_item(cargo: dict, symbol: str) -> dict:
+    item = next((item for item in cargo["inventory"] if item["symbol"] == symbol), None)
+    if item is None:
+        item = {"symbol": symbol, "name": symbol.replace("_", " ").title(), "description": "", "units": 0}
+        cargo["inventory"].append(item)
+    return item
+
+def _mock_change_cargo(cargo: dict, symbol: str, units: int) -> None:
+    """Add (or with negative units, remove) units of a good in a mock cargo hold"""
+    item = _mock_cargo_item(cargo, symbol)
+    item["units"] += units
+    cargo["units"] += units
+    if item["units"] <= 0:
+        cargo["inventory"].remove(item)
+
+def _mock_transaction(ship_symbol: str, waypoint_symbol: str, symbol: str, kind: str, units: int, price: int) -> dict:
+    return {
+        "waypointSymbol": waypoint_symbol,
+        "shipSymbol": ship_symbol,
+        "tradeSymbol": symbol,
+        "type": kind,
+        "units": units,
+        "pricePerUnit": price,
+        "totalPrice": units * price,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    }
+
+def _mock_trade_good(mock_ship: dict, request: CargoRequest, kind: str) -> dict:
+    """The market entry for a good at a docked mock ship's waypoint, with the live API's trade errors"""
+    if mock_ship["nav"]["status"] != "DOCKED":
+        raise HTTPException(status_code=400, detail="Ship must be docked to trade")
+    waypoint_symbol = mock_ship["nav"]["waypointSymbol"]
+    market = mock_galaxy.market(waypoint_symbol)
+    if market is None:
+        raise HTTPException(status_code=400, detail="No marketplace at this waypoint")
+    good = next((good for good in market["tradeGoods"] if good["symbol"] == request.symbol), None)
+    if good is None:
+        # marketTradeNotSoldError / marketTradeNoPurchaseError
+        error = {"message": f"Market does not trade {request.symbol}", "code": 4602 if kind == "SELL" else 4601,
+                 "data": {"waypointSymbol": waypoint_symbol, "tradeSymbol": request.symbol}}
+        raise HTTPException(status_code=400, detail=json.dumps({"error": error}))
+    if request.units > good["tradeVolume"]:
+        error = {"message": f"Market limits {request.symbol} to {good['tradeVolume']} units per transaction", "code": 4604,
+                 "data": {"waypointSymbol": waypoint_symbol, "tradeSymbol": request.symbol,
+                          "units": request.units, "tradeVolume": good["tradeVolume"]}}
+        raise HTTPException(status_code=400, detail=json.dumps({"error": error}))
+    return good
+
+@router.post("/{ship_symbol}/extract")
+@fleet_repository.locked
+async def extract_resources(ship_symbol: str, request: ExtractRequest = ExtractRequest(), client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Extract resources at the ship's waypoint, targeting a survey's deposits if one is given"""
+    survey = request.survey
+    if survey is None and request.bestSurvey:
+        # The stored survey with the most valuable deposits, or a plain extraction if there's none
+        ship = await fleet_repository.fetch(ship_symbol, client)
+        survey = survey_store.best(ship["nav"]["waypointSymbol"])
+    
+    if not HAS_VALID_TOKEN:
+        # Mock extraction: a random batch of one of the waypoint's (or survey's) deposits
+        mock_ship = fleet_repository.get(ship_symbol)
+        if not mock_ship:
+            raise HTTPException(status_code=404, detail="Ship not found")
+        if mock_ship["nav"]["status"] != "IN_ORBIT":
+            raise HTTPException(status_code=400, detail="Ship must be in orbit to extract")
+        
+        waypoint_symbol = mock_ship["nav"]["waypointSymbol"]
+        if survey:
+            if survey.get("symbol") != waypoint_symbol:
+                raise HTTPException(status_code=400, detail="Survey is for a different waypoint")
+            if cooldown_deadline({"expiration": survey.get("expiration")}) <= time.monotonic():
+                raise _mock_survey_error(survey, 4221, "Survey has expired")
+            mock_survey_extractions[survey.get("signature")] += 1
+            if mock_survey_extractions[survey.get("signature")] > MOCK_SURVEY_EXTRACTIONS.get(survey.get("size"), 10):
+                raise _mock_survey_error(survey, 4224, "Survey has been exhausted")
+            deposits = [deposit["symbol"] for deposit in survey.get("deposits", [])]
+        else:
+            deposits = mock_galaxy.deposits(waypoint_symbol)
+        if not deposits:
+            raise HTTPException(status_code=400, detail="Waypoint has no deposits to extract")
+        
+        cargo = mock_ship["cargo"]
+        space = cargo["capacity"] - cargo["units"]
+        if space <= 0:
+            raise HTTPException(status_code=400, detail="Cargo hold is full")
+        extracted = {"symbol": random.choice(deposits), "units": min(space, random.randint(3, 10))}
+        _mock_change_cargo(cargo, extracted["symbol"], extracted["units"])
+        
+        result = {
+            "data": {
+                "extraction": {"shipSymbol": ship_symbol, "yield": extracted},
+                "cooldown": mock_cooldown(ship_symbol, 70),
+                "cargo": cargo
+            }
+        }
+        fleet_store.apply_response(ship_symbol, result)
+        return result
+    
+    try:
+        headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
+        if survey:
+            response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/extract/survey",
+                                       json=survey, headers=headers)
+        else:
+            response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/extract", headers=headers)
+        
+        if response.status_code == 201:
+            result = response.json()
+            # Carries the new cargo and cooldown
+            fleet_store.apply_response(ship_symbol, result)
+            return result
+        else:
+            if survey and dead_survey_error(response.text):
+                survey_store.discard(survey["signature"])
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{ship_symbol}/jettison")
+@fleet_repository.locked
+async def jettison_cargo(ship_symbol: str, request: CargoRequest, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Jettison cargo from the ship's hold"""
+    if not HAS_VALID_TOKEN:
+        # Mock jettison response
+        mock_ship = fleet_repository.get(ship_symbol)
+        if not mock_ship:
+            raise HTTPException(status_code=404, detail="Ship not found")
+        
+        cargo = mock_ship["cargo"]
+        item = next((item for item in cargo["inventory"] if item["symbol"] == request.symbol), None)
+        if not item or item["units"] < request.units:
+            raise HTTPException(status_code=400, detail="Insufficient cargo")
+        _mock_change_cargo(cargo, request.symbol, -request.units)
+        
+        result = {"data": {"cargo": cargo}}
+        fleet_store.apply_response(ship_symbol, result)
+        return result
+    
+    try:
+        headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
+        payload = {"symbol": request.symbol, "units": request.units}
+        response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/jettison",
+                                   json=payload, headers=headers)
+        
+        if response.status_code == 200:
+            result = response.json()
+            fleet_store.apply_response(ship_symbol, result)
+            return result
+        else:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{ship_symbol}/sell")
+@fleet_repository.locked
+async def sell_cargo(ship_symbol: str, request: CargoRequest, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Sell cargo to the market at the ship's waypoint"""
+    if not HAS_VALID_TOKEN:
+        # Mock sale at the waypoint's market price
+        mock_ship = fleet_repository.get(ship_symbol)
+        if not mock_ship:
+            raise HTTPException(status_code=404, detail="Ship not found")
+        
+        good = _mock_trade_good(mock_ship, request, "SELL")
+        cargo = mock_ship["cargo"]
+        item = next((item for item in cargo["inventory"] if item["symbol"] == request.symbol), None)
+        if not item or item["units"] < request.units:
+            raise HTTPException(status_code=400, detail="Insufficient cargo")
+        _mock_change_cargo(cargo, request.symbol, -request.units)
+        transaction = _mock_transaction(ship_symbol, mock_ship["nav"]["waypointSymbol"], request.symbol, "SELL",
+                                        request.units, good["sellPrice"])
+        MOCK_AGENT["credits"] += transaction["totalPrice"]
+        survey_store.set_price(request.symbol, transaction["pricePerUnit"])
+        
+        result = {"data": {"agent": MOCK_AGENT, "cargo": cargo, "transaction": transaction}}
+        fleet_store.apply_response(ship_symbol, result)
+        return result
+    
+    try:
+        headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
+        payload = {"symbol": request.symbol, "units": request.units}
+        response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/sell",
+                                   json=payload, headers=headers)
+        
+        if response.status_code == 201:
+            result = response.json()
+            fleet_store.apply_response(ship_symbol, result)
+            # Re-ranks stored surveys by what their deposits sell for now
+            survey_store.set_price(request.symbol, result["data"]["transaction"]["pricePerUnit"])
+            return result
         else:
             raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{ship_symbol}/purchase")
+@fleet_repository.locked
+async def purchase_cargo(ship_symbol: str, request: CargoRequest, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Buy cargo from the market at the ship's waypoint"""
+    if not HAS_VALID_TOKEN:
+        # Mock purchase at the waypoint's market price
+        mock_ship = fleet_repository.get(ship_symbol)
+        if not mock_ship:
+            raise HTTPException(status_code=404, detail="Ship not found")
+        
+        good = _mock_trade_good(mock_ship, request, "PURCHASE")
+        cargo = mock_ship["cargo"]
+        if cargo["capacity"] - cargo["units"] < request.units:
+            raise HTTPException(status_code=400, detail="Not enough cargo space")
+        transaction = _mock_transaction(ship_symbol, mock_ship["nav"]["waypointSymbol"], request.symbol, "PURCHASE",
+                                        request.units, good["purchasePrice"])
+        if MOCK_AGENT["credits"] < transaction["totalPrice"]:
+            raise HTTPException(status_code=400, detail="Insufficient credits")
+        _mock_change_cargo(cargo, request.symbol, request.units)
+        MOCK_AGENT["credits"] -= transaction["totalPrice"]
+        
+        result = {"data": {"agent": MOCK_AGENT, "cargo": cargo, "transaction": transaction}}
+        fleet_store.apply_response(ship_symbol, result)
+        return result
+    
+    try:
+        headers = {"Authorization": f"Bearer {SPACETRADERS_TOKEN}"}
+        payload = {"symbol": request.symbol, "units": request.units}
+        response = await client.post(f"{SPACETRADERS_API_URL}/my/ships/{ship_symbol}/purchase",
+                                   json=payload, headers=headers)
+        
+        if response.status_code == 201:
+            result = response.json()
+            fleet_store.apply_response(ship_symbol, result)
+            return result
+        else:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def run_ship_action(action: BatchShipAction, client: httpx.AsyncClient) -> dict:
+    """Run one batch action through the matching single-ship endpoint"""
+    if action.action == "navigate":
+        if not action.waypointSymbol:
+            raise HTTPException(status_code=400, detail="waypointSymbol is required to navigate")
+        return await navigate_ship(action.shipSymbol, NavigateRequest(waypointSymbol=action.waypointSymbol), client)
+    if action.action == "dock":
+        return await dock_ship(action.shipSymbol, client)
+    if action.action == "orbit":
+        return await orbit_ship(action.shipSymbol, client)
+    if action.action == "refuel":
+        return await refuel_ship(action.shipSymbol, RefuelRequest(units=action.units), client)
+    raise HTTPException(status_code=400, detail=f"Unknown action: {action.action}")
+
+@router.post("/batch")
+async def batch_ship_actions(request: BatchShipRequest, client: httpx.AsyncClient = Depends(get_httpx_client)):
+    """Run navigate/dock/orbit/refuel actions for many ships concurrently.
+
+    Ships run in parallel (paced by the shared upstream rate limiter); each
+    ship's own actions run in the order given, and once one fails the rest
+    for that ship are skipped. Failures are reported per action instead of
+    failing the batch.
+    """
+    results: List[dict] = [{} for _ in request.actions]
+    by_ship = defaultdict(list)
+    for position, action in enumerate(request.actions):
+        by_ship[action.shipSymbol].append(position)
+
+    async def run_ship(positions: List[int]):
+        failed = False
+        for position in positions:
+            action = request.actions[position]
+            result = {"shipSymbol": action.shipSymbol, "action": action.action}
+            if failed:
+                result.update(success=False, status=409, error="Skipped after an earlier action for this ship failed")
+            else:
+                try:
+                    response = await run_ship_action(action, client)
+                    result.update(success=True, status=200, data=response.get("data", response))
+                except HTTPException as e:
+                    failed = True
+                    result.update(success=False, status=e.status_code, error=e.detail)
+            results[position] = result
+
+    await asyncio.gather(*(run_ship(positions) for positions in by_ship.values()))
+    succeeded = sum(1 for result in results if result["success"])
+    return {
+        "data": results,
+        "meta": {"total": len(results), "succeeded": succeeded, "failed": len(results) - succeeded}
+    }
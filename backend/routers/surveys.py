@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from ..utilities import survey_store
+from ..tracing import TracedRoute
+
+router = APIRouter(prefix="/api/surveys", tags=["surveys"], route_class=TracedRoute)
+
+@router.get("")
+async def get_surveys(waypoint: Optional[str] = None, limit: int = 50):
+    """Live surveys (of one waypoint, or all), most valuable first"""
+    return {"data": survey_store.surveys(waypoint, limit)}
+
+@router.get("/best")
+async def get_best_survey(waypoint: str):
+    """The most valuable live survey of a waypoint, to pass to extract"""
+    survey = survey_store.best(waypoint)
+    if survey is None:
+        raise HTTPException(status_code=404, detail="No live survey of that waypoint")
+    return {"data": dict(survey, value=round(survey_store.value(survey), 2))}
+
+@router.get("/stats")
+async def get_survey_stats():
+    """Get survey store counters: live surveys, picks and evictions"""
+    return {"data": survey_store.stats()}
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
+import httpx
+
+from ..route_planner import FLIGHT_MODES
+from ..utilities import get_httpx_client, galaxy_store, trade_route_finder, fleet_repository
+from ..tracing import TracedRoute
+
+router = APIRouter(prefix="/api/trade", tags=["trade"], route_class=TracedRoute)
+
+@router.get("/routes")
+async def get_trade_routes(
+    ship: Optional[str] = None,
+    system: Optional[str] = None,
+    units: Optional[int] = None,
+    speed: Optional[int] = None,
+    fuelCapacity: Optional[int] = None,
+    limit: int = 10,
+    timeValue: float = 0.0,
+    maxAge: Optional[float] = None,
+    modes: Optional[str] = None,
+    client: httpx.AsyncClient = Depends(get_httpx_client)
+):
+    """Most profitable buy-and-sell trades between markets, from the latest recorded prices.
+
+    Each trade's profit is net of the hop's fuel and of its flight time at
+    `timeValue` credits per hour. With `ship`, its cargo capacity, engine
+    speed and fuel tank are used (`units`, `speed` and `fuelCapacity`
+    override them), trades are searched in its system and the flight to the
+    buying market is charged too. Without it, every system with recorded
+    prices is searched. `maxAge` ignores prices older than that many seconds.
+    """
+    origin, fuel = None, None
+    if ship:
+        data = await fleet_repository.fetch(ship, client)
+        units = data["cargo"]["capacity"] if units is None else units
+        speed = data["engine"].get("speed") if speed is None else speed
+        ship_fuel = data.get("fuel") or {}
+        fuelCapacity = ship_fuel.get("capacity", 0) if fuelCapacity is None else fuelCapacity
+        fuel = min(ship_fuel.get("current", 0), fuelCapacity)
+        origin = galaxy_store.get_waypoint(data["nav"]["waypointSymbol"])
+        system = system or data["nav"]["systemSymbol"]
+    if units is None:
+        raise HTTPException(status_code=400, detail="Provide ship or units")
+
+    allowed = None
+    if modes:
+        allowed = [mode.strip().upper() for mode in modes.split(",")]
+        unknown = [mode for mode in allowed if mode not in FLIGHT_MODES]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown flight modes: {', '.join(unknown)}")
+
+    systems = [system] if system else trade_route_finder.systems()
+    # Ranked on the event loop: the finder reads the price matrices and galaxy indexes that market
+    # polls and waypoint reads write there. Only the market graphs, which a cold galaxy-wide query
+    # would otherwise spend hundreds of milliseconds building, are built off it first
+    await trade_route_finder.prepare(systems, speed or 30, fuelCapacity or 0, allowed)
+    routes = trade_route_finder.find(
+        systems, units, speed or 30, fuelCapacity or 0, max(1, min(limit, 100)),
+        timeValue, maxAge, allowed, origin, fuel
+    )
+    return {"data": routes}
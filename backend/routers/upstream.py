@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+
+from ..upstream import rate_limiter, single_flight, response_cache
+from ..tracing import TracedRoute
+
+router = APIRouter(prefix="/api/upstream", tags=["upstream"], route_class=TracedRoute)
+
+@router.get("/stats")
+async def get_upstream_stats():
+    """Get shared upstream client statistics (rate limiter, request coalescing and response cache)"""
+    return {
+        "rateLimiter": rate_limiter.stats(),
+        "coalescing": single_flight.stats(),
+        "cache": response_cache.stats()
+    }
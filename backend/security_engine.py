@@ -0,0 +1,175 @@
+import math
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+# Seconds a timed effect lasts unless the request gives a duration, and the cloak's recharge after it ends
+CLOAKING_DURATION = 300
+CLOAKING_COOLDOWN = 120
+COUNTERMEASURES_DURATION = 180
+COUNTERMEASURES_CHARGES = 3
+JAMMING_RADIUS = 50
+MAX_STEALTH_LEVEL = 3
+MAX_ENCRYPTION_LEVEL = 5
+
+# Energy drawn while each system runs (stealth and encryption per level)
+ENERGY = {"cloaking": 25, "jamming": 15, "electronicWarfare": 30, "stealthMode": 10, "encryption": 5}
+
+class ShipSecurity:
+    """One ship's security systems as monotonic expiry times; an effect is active while now < its `*_until`"""
+    __slots__ = ("cloaking_until", "cloaking_ready_at", "jamming_until", "electronic_warfare_until",
+                 "stealth_until", "stealth_level", "countermeasures_until", "countermeasures_charges",
+                 "encryption_until", "encryption_level")
+
+    def __init__(self):
+        self.cloaking_until = 0.0
+        self.cloaking_ready_at = 0.0
+        self.jamming_until = 0.0
+        self.electronic_warfare_until = 0.0
+        self.stealth_until = 0.0
+        self.stealth_level = 0
+        self.countermeasures_until = 0.0
+        self.countermeasures_charges = COUNTERMEASURES_CHARGES
+        self.encryption_until = 0.0
+        self.encryption_level = 1
+
+# A ship that never used a security system reads as this
+_IDLE = ShipSecurity()
+
+def _until(now: float, duration: Optional[float]) -> float:
+    return math.inf if duration is None else now + duration
+
+def _remaining(until: float, now: float) -> Optional[int]:
+    return math.ceil(until - now) if now < until < math.inf else None
+
+class SecurityEngine:
+    """Cloaking, jamming, stealth and the other security systems of every ship, evaluated on read.
+
+    Activating a system stores when its effect ends (never, for systems
+    left on until deactivated without a `duration`) and, for the cloak, when
+    it can be used again. Nothing counts down in the background: a status
+    read compares those times with the monotonic clock to work out what is
+    active, the cooldowns and seconds left, and the energy drawn, so reads
+    never change state and any number of ships costs nothing between reads.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.ships: Dict[str, ShipSecurity] = {}
+
+    def _ship(self, ship_symbol: str) -> ShipSecurity:
+        ship = self.ships.get(ship_symbol)
+        if ship is None:
+            ship = self.ships[ship_symbol] = ShipSecurity()
+        return ship
+
+    def status(self, ship_symbol: str, now: Optional[float] = None) -> dict:
+        """A ship's security status as of `now` (default the clock)"""
+        ship = self.ships.get(ship_symbol, _IDLE)
+        now = self.clock() if now is None else now
+        cloaking = now < ship.cloaking_until
+        jamming = now < ship.jamming_until
+        electronic_warfare = now < ship.electronic_warfare_until
+        stealth = now < ship.stealth_until
+        countermeasures = now < ship.countermeasures_until
+        encryption = now < ship.encryption_until
+        stealth_level = ship.stealth_level if stealth else 0
+        encryption_level = ship.encryption_level if encryption else 1
+        remaining = {}
+        for name, until in (("cloaking", ship.cloaking_until), ("signalJamming", ship.jamming_until),
+                            ("electronicWarfare", ship.electronic_warfare_until), ("stealthMode", ship.stealth_until),
+                            ("countermeasures", ship.countermeasures_until), ("encryption", ship.encryption_until)):
+            seconds = _remaining(until, now)
+            if seconds is not None:
+                remaining[name] = seconds
+        return {
+            "cloakingActive": cloaking,
+            "cloakingCooldown": None if cloaking else _remaining(ship.cloaking_ready_at, now),
+            "stealthModeActive": stealth,
+            "stealthModeLevel": stealth_level,
+            "signalJammingActive": jamming,
+            "jammingRadius": JAMMING_RADIUS if jamming else 0,
+            "electronicWarfareActive": electronic_warfare,
+            "countermeasuresActive": countermeasures,
+            "countermeasuresCharges": ship.countermeasures_charges,
+            "encryptionActive": encryption,
+            "encryptionLevel": encryption_level,
+            "energyConsumption": (ENERGY["cloaking"] * cloaking + ENERGY["jamming"] * jamming
+                                  + ENERGY["electronicWarfare"] * electronic_warfare
+                                  + ENERGY["stealthMode"] * stealth_level
+                                  + ENERGY["encryption"] * encryption_level * encryption),
+            "remainingSeconds": remaining,
+        }
+
+    def statuses(self, ship_symbols: Iterable[str]) -> Dict[str, dict]:
+        """Statuses of many ships, all as of one clock reading"""
+        now = self.clock()
+        return {ship_symbol: self.status(ship_symbol, now) for ship_symbol in ship_symbols}
+
+    def cloaking(self, ship_symbol: str, activate: bool, duration: Optional[float] = None) -> float:
+        """Engage the cloak for `duration` seconds or drop it; returns the effect or cooldown length.
+
+        The cooldown starts when the cloak ends, whether it ran out or was
+        dropped. Raises ValueError while it is cooling down.
+        """
+        ship, now = self._ship(ship_symbol), self.clock()
+        if activate:
+            if now >= ship.cloaking_until and now < ship.cloaking_ready_at:
+                raise ValueError("Cloaking device is on cooldown")
+            duration = CLOAKING_DURATION if duration is None else duration
+            ship.cloaking_until = now + duration
+            ship.cloaking_ready_at = ship.cloaking_until + CLOAKING_COOLDOWN
+            return duration
+        if now < ship.cloaking_until:
+            ship.cloaking_until = now
+            ship.cloaking_ready_at = now + CLOAKING_COOLDOWN
+        return max(0, math.ceil(ship.cloaking_ready_at - now))
+
+    def jamming(self, ship_symbol: str, activate: bool, duration: Optional[float] = None) -> None:
+        ship, now = self._ship(ship_symbol), self.clock()
+        ship.jamming_until = _until(now, duration) if activate else min(ship.jamming_until, now)
+
+    def electronic_warfare(self, ship_symbol: str, activate: bool, duration: Optional[float] = None) -> None:
+        ship, now = self._ship(ship_symbol), self.clock()
+        ship.electronic_warfare_until = _until(now, duration) if activate else min(ship.electronic_warfare_until, now)
+
+    def stealth_mode(self, ship_symbol: str, activate: bool, duration: Optional[float] = None) -> int:
+        """Raise stealth one level (up to 3) or drop it; returns the new level"""
+        ship, now = self._ship(ship_symbol), self.clock()
+        if activate:
+            level = ship.stealth_level if now < ship.stealth_until else 0
+            ship.stealth_level = min(MAX_STEALTH_LEVEL, level + 1)
+            ship.stealth_until = _until(now, duration)
+        else:
+            ship.stealth_until = min(ship.stealth_until, now)
+            ship.stealth_level = 0
+        return ship.stealth_level
+
+    def countermeasures(self, ship_symbol: str, activate: bool, duration: Optional[float] = None) -> float:
+        """Deploy one charge of countermeasures for `duration` seconds, or end them; raises ValueError with no charges left"""
+        ship, now = self._ship(ship_symbol), self.clock()
+        if activate:
+            if ship.countermeasures_charges <= 0:
+                raise ValueError("No countermeasure charges remaining")
+            duration = COUNTERMEASURES_DURATION if duration is None else duration
+            ship.countermeasures_charges -= 1
+            ship.countermeasures_until = now + duration
+            return duration
+        ship.countermeasures_until = min(ship.countermeasures_until, now)
+        return 0.0
+
+    def recharge_countermeasures(self, ship_symbol: str) -> int:
+        ship = self._ship(ship_symbol)
+        ship.countermeasures_charges = COUNTERMEASURES_CHARGES
+        return ship.countermeasures_charges
+
+    def encryption(self, ship_symbol: str, activate: bool, duration: Optional[float] = None) -> int:
+        """Raise encryption one level (up to 5) or turn it off; returns the new level"""
+        ship, now = self._ship(ship_symbol), self.clock()
+        if activate:
+            level = ship.encryption_level if now < ship.encryption_until else 1
+            ship.encryption_level = min(MAX_ENCRYPTION_LEVEL, level + 1)
+            ship.encryption_until = _until(now, duration)
+        else:
+            ship.encryption_until = min(ship.encryption_until, now)
+            ship.encryption_level = 1
+        return ship.encryption_level
@@ -0,0 +1,92 @@
+import math
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+class GridIndex:
+    """Uniform-grid spatial index over 2D points for nearest-neighbour queries.
+
+    Points are bucketed into square cells of `cell_size`. A nearest query scans
+    rings of cells outward from the query point and stops as soon as no
+    unscanned cell can hold anything closer than the current k-th best, so a
+    lookup only touches the handful of cells around the point.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, Tuple[float, float, Any]]] = {}
+        self._positions: Dict[Hashable, Tuple[int, int]] = {}
+        self._bounds: Optional[List[int]] = None  # min_cx, min_cy, max_cx, max_cy
+        # Bumped on every change so callers can key caches derived from the contents
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def items(self) -> Iterator[Any]:
+        for bucket in self._cells.values():
+            for _, _, item in bucket.values():
+                yield item
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def insert(self, key: Hashable, x: float, y: float, item: Any) -> None:
+        """Add or move a point"""
+        self.remove(key)
+        self.version += 1
+        cell = self._cell(x, y)
+        self._cells.setdefault(cell, {})[key] = (x, y, item)
+        self._positions[key] = cell
+        if self._bounds is None:
+            self._bounds = [cell[0], cell[1], cell[0], cell[1]]
+        else:
+            bounds = self._bounds
+            bounds[0], bounds[1] = min(bounds[0], cell[0]), min(bounds[1], cell[1])
+            bounds[2], bounds[3] = max(bounds[2], cell[0]), max(bounds[3], cell[1])
+
+    def remove(self, key: Hashable) -> None:
+        cell = self._positions.pop(key, None)
+        if cell is not None:
+            self.version += 1
+            bucket = self._cells[cell]
+            del bucket[key]
+            if not bucket:
+                del self._cells[cell]
+
+    def _ring(self, cx: int, cy: int, radius: int):
+        if radius == 0:
+            yield cx, cy
+            return
+        for dx in range(-radius, radius + 1):
+            yield cx + dx, cy - radius
+            yield cx + dx, cy + radius
+        for dy in range(-radius + 1, radius):
+            yield cx - radius, cy + dy
+            yield cx + radius, cy + dy
+
+    def nearest(self, x: float, y: float, limit: int = 1,
+                predicate: Optional[Callable[[Any], bool]] = None) -> List[Tuple[float, Any]]:
+        """Up to `limit` (distance, item) pairs closest to (x, y), optionally filtered"""
+        if not self._positions or limit <= 0:
+            return []
+        cx, cy = self._cell(x, y)
+        min_cx, min_cy, max_cx, max_cy = self._bounds
+        max_radius = max(abs(cx - min_cx), abs(cx - max_cx), abs(cy - min_cy), abs(cy - max_cy))
+        found: List[Tuple[float, Any]] = []
+        radius = 0
+        while radius <= max_radius:
+            for cell in self._ring(cx, cy, radius):
+                bucket = self._cells.get(cell)
+                if not bucket:
+                    continue
+                for px, py, item in bucket.values():
+                    if predicate is None or predicate(item):
+                        found.append((math.hypot(px - x, py - y), item))
+            if len(found) >= limit:
+                found.sort(key=lambda pair: pair[0])
+                del found[limit:]
+                # Every cell beyond this ring is at least radius * cell_size away
+                if found[-1][0] <= radius * self.cell_size:
+                    break
+            radius += 1
+        found.sort(key=lambda pair: pair[0])
+        return found[:limit]
@@ -0,0 +1,196 @@
+import heapq
+import itertools
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .cooldown_scheduler import cooldown_deadline
+
+SIZE_RANK = {"SMALL": 0, "MODERATE": 1, "LARGE": 2}
+# Extraction errors meaning the survey itself is spent: failed verification (expired or
+# unknown to the server) and exhausted deposits
+DEAD_SURVEY_CODES = {4221, 4224}
+
+def dead_survey_error(detail) -> bool:
+    """Whether a failed extraction's SpaceTraders error body says its survey can't be used again"""
+    try:
+        error = json.loads(detail)["error"]
+    except (TypeError, ValueError, KeyError):
+        return False
+    if error.get("code") in DEAD_SURVEY_CODES:
+        return True
+    message = str(error.get("message", "")).lower()
+    return "exhausted" in message or "expired" in message
+
+class _Entry:
+    __slots__ = ("survey", "waypoint", "expires", "weights", "value", "rank")
+
+    def __init__(self, survey: dict, expires: float):
+        self.survey = survey
+        self.waypoint = survey["symbol"]
+        self.expires = expires
+        # Share of extractions yielding each good
+        deposits = [deposit["symbol"] for deposit in survey.get("deposits") or []]
+        self.weights = [(good, deposits.count(good) / len(deposits)) for good in set(deposits)]
+        self.value = 0.0
+        self.rank = SIZE_RANK.get(survey.get("size"), 0)
+
+class SurveyStore:
+    """Active surveys by waypoint, ranked by the expected value of one extraction.
+
+    A survey's value is the mean price of its deposits (an extraction yields
+    one of them at random), from the prices given to `set_price` — trade
+    transactions and market reads. Each waypoint keeps a max-heap by value
+    (ties to the larger survey), so `best()` is O(log n). A survey leaves the
+    store `margin` seconds before its expiration, so one picked now is still
+    valid by the time the extraction reaches the server, or as soon as an
+    extraction reports it exhausted. Removals are lazy: a heap item whose
+    survey is gone is skipped when it reaches the top, and the heap is rebuilt
+    once stale items outnumber live ones. A price change only marks the
+    waypoints with that good in their surveys; each is re-valued and
+    re-heaped the next time it is picked from.
+    """
+
+    def __init__(self, margin: float = 30.0, default_price: float = 1.0):
+        self.margin = margin
+        self.default_price = default_price
+        self.prices: Dict[str, float] = {}
+        self._entries: Dict[str, _Entry] = {}
+        self._heaps: Dict[str, List[Tuple[float, int, int, str]]] = {}
+        self._counts: Dict[str, int] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        # Good -> waypoint -> how many of its surveys list that good
+        self._goods: Dict[str, Dict[str, int]] = {}
+        self._stale: Set[str] = set()
+        self._seq = itertools.count()
+        self.expired = 0
+        self.exhausted = 0
+        self.picks = 0
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._entries)
+
+    def value(self, survey: dict) -> float:
+        deposits = survey.get("deposits") or []
+        if not deposits:
+            return 0.0
+        return sum(self.prices.get(deposit["symbol"], self.default_price) for deposit in deposits) / len(deposits)
+
+    def _value(self, entry: _Entry) -> float:
+        prices, default = self.prices, self.default_price
+        return sum(prices.get(good, default) * weight for good, weight in entry.weights)
+
+    def _item(self, entry: _Entry) -> Tuple[float, int, int, str]:
+        return (-entry.value, -entry.rank, next(self._seq), entry.survey["signature"])
+
+    def add(self, surveys: Iterable[dict]) -> int:
+        """Store new surveys, skipping any already (nearly) expired; returns how many were kept"""
+        now = time.monotonic()
+        added = 0
+        for survey in surveys:
+            signature = survey.get("signature")
+            expires = cooldown_deadline({"expiration": survey.get("expiration")}) - self.margin
+            if not signature or expires <= now or signature in self._entries:
+                continue
+            entry = self._entries[signature] = _Entry(survey, expires)
+            entry.value = self._value(entry)
+            self._counts[entry.waypoint] = self._counts.get(entry.waypoint, 0) + 1
+            heapq.heappush(self._heaps.setdefault(entry.waypoint, []), self._item(entry))
+            heapq.heappush(self._expiry, (expires, signature))
+            for good, _ in entry.weights:
+                waypoints = self._goods.setdefault(good, {})
+                waypoints[entry.waypoint] = waypoints.get(entry.waypoint, 0) + 1
+            added += 1
+        return added
+
+    def _remove(self, signature: str) -> Optional[_Entry]:
+        entry = self._entries.pop(signature, None)
+        if entry is None:
+            return None
+        waypoint = entry.waypoint
+        for good, _ in entry.weights:
+            waypoints = self._goods[good]
+            waypoints[waypoint] -= 1
+            if not waypoints[waypoint]:
+                del waypoints[waypoint]
+        self._counts[waypoint] -= 1
+        if not self._counts[waypoint]:
+            del self._heaps[waypoint], self._counts[waypoint]
+            self._stale.discard(waypoint)
+        elif len(self._heaps[waypoint]) > 2 * self._counts[waypoint] + 16:
+            self._rebuild(waypoint)
+        return entry
+
+    def _rebuild(self, waypoint_symbol: str) -> None:
+        """Re-value a waypoint's live surveys and heapify them, dropping stale items"""
+        signatures = {item[3] for item in self._heaps[waypoint_symbol]}
+        entries = [self._entries[signature] for signature in signatures if signature in self._entries]
+        for entry in entries:
+            entry.value = self._value(entry)
+        heap = self._heaps[waypoint_symbol] = [self._item(entry) for entry in entries]
+        heapq.heapify(heap)
+        self._stale.discard(waypoint_symbol)
+
+    def discard(self, signature: str) -> bool:
+        """Drop a survey upstream reported exhausted (or otherwise unusable)"""
+        if self._remove(signature) is None:
+            return False
+        self.exhausted += 1
+        return True
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, signature = heapq.heappop(self._expiry)
+            if self._remove(signature) is not None:
+                self.expired += 1
+
+    def best(self, waypoint_symbol: str) -> Optional[dict]:
+        """The most valuable live survey of a waypoint, or None"""
+        self._expire()
+        if waypoint_symbol in self._stale:
+            self._rebuild(waypoint_symbol)
+        heap = self._heaps.get(waypoint_symbol)
+        while heap:
+            entry = self._entries.get(heap[0][3])
+            if entry is not None:
+                self.picks += 1
+                return entry.survey
+            heapq.heappop(heap)
+        return None
+
+    def surveys(self, waypoint_symbol: Optional[str] = None, limit: Optional[int] = None) -> List[dict]:
+        """Live surveys (up to `limit`), most valuable first, with their value and seconds left"""
+        self._expire()
+        now = time.monotonic()
+        entries = [entry for entry in self._entries.values()
+                   if waypoint_symbol is None or entry.waypoint == waypoint_symbol]
+        for waypoint in {entry.waypoint for entry in entries} & self._stale:
+            self._rebuild(waypoint)
+        entries = heapq.nsmallest(max(limit or len(entries), 0), entries, key=lambda entry: (-entry.value, -entry.rank))
+        return [dict(entry.survey, value=round(entry.value, 2), usableSeconds=round(entry.expires - now, 1))
+                for entry in entries]
+
+    def set_price(self, symbol: str, price: float) -> None:
+        """Record a good's current price; waypoints with surveys of it are re-ranked on their next pick"""
+        if self.prices.get(symbol) == price:
+            return
+        self.prices[symbol] = price
+        self._stale.update(self._goods.get(symbol, ()))
+
+    def set_prices(self, prices: Dict[str, float]) -> None:
+        for symbol, price in prices.items():
+            self.set_price(symbol, price)
+
+    def stats(self) -> dict:
+        self._expire()
+        return {
+            "surveys": len(self._entries),
+            "waypoints": len(self._counts),
+            "prices": len(self.prices),
+            "picks": self.picks,
+            "evictedExpired": self.expired,
+            "evictedExhausted": self.exhausted,
+            "marginSeconds": self.margin,
+        }
@@ -0,0 +1,103 @@
+import asyncio
+import itertools
+import math
+import time
+from typing import Callable, Dict, List, Optional
+
+class Timer:
+    __slots__ = ("id", "tick", "callback", "cancelled")
+
+    def __init__(self, id: int, tick: int, callback: Callable[[], None]):
+        self.id = id
+        self.tick = tick
+        self.callback = callback
+        self.cancelled = False
+
+class TimerWheel:
+    """Hashed timing wheel driven by a single asyncio task.
+
+    Time is cut into `tick`-second ticks and a timer lives in slot
+    `tick % slots`, so scheduling and cancelling are O(1) whatever the
+    number of timers. The driver wakes once per tick and fires the due timers
+    of one slot (timers more than a revolution away stay put until their
+    tick comes round); with no timers pending it sleeps until one is
+    scheduled instead of ticking. Timers never fire early; they fire up to
+    one tick late.
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 512):
+        self.tick = tick
+        self.slots = slots
+        self._wheel: List[Dict[int, Timer]] = [{} for _ in range(slots)]
+        self._origin = time.monotonic()
+        self._current = 0  # Last tick whose slot has been processed
+        self._pending = 0
+        self._ids = itertools.count(1)
+        self._wake = asyncio.Event()
+        self._driver: Optional[asyncio.Task] = None
+        self.fired = 0
+        self.wakeups = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def _tick_at(self, moment: float) -> int:
+        return math.floor((moment - self._origin) / self.tick)
+
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> Timer:
+        """Run `callback` on the loop once `time.monotonic()` has passed `deadline`"""
+        if not self._pending:
+            # Nothing can be due in the ticks that passed while the wheel was empty; skip them
+            self._current = max(self._current, self._tick_at(time.monotonic()) - 1)
+        # Round up so the timer never fires before its deadline
+        tick = max(math.ceil((deadline - self._origin) / self.tick), self._current + 1)
+        timer = Timer(next(self._ids), tick, callback)
+        self._wheel[tick % self.slots][timer.id] = timer
+        self._pending += 1
+        if self._driver is None or self._driver.done():
+            self._driver = asyncio.create_task(self._drive())
+        self._wake.set()
+        return timer
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Timer:
+        return self.call_at(time.monotonic() + delay, callback)
+
+    def cancel(self, timer: Timer) -> None:
+        if not timer.cancelled and self._wheel[timer.tick % self.slots].pop(timer.id, None) is not None:
+            self._pending -= 1
+        timer.cancelled = True
+
+    def _advance(self, now_tick: int) -> None:
+        """Fire every timer due by `now_tick`, visiting each slot at most once"""
+        loop = asyncio.get_running_loop()
+        first = self._current + 1
+        for tick in range(first, min(now_tick, first + self.slots - 1) + 1):
+            slot = self._wheel[tick % self.slots]
+            if not slot:
+                continue
+            due = [timer for timer in slot.values() if timer.tick <= now_tick]
+            for timer in due:
+                del slot[timer.id]
+                self._pending -= 1
+                self.fired += 1
+                # Via the loop, so a failing callback can't stop the driver
+                loop.call_soon(timer.callback)
+        self._current = max(self._current, now_tick)
+
+    async def _drive(self) -> None:
+        while True:
+            if not self._pending:
+                self._wake.clear()
+                await self._wake.wait()
+            self.wakeups += 1
+            self._advance(self._tick_at(time.monotonic()))
+            if self._pending:
+                await asyncio.sleep(self._origin + (self._current + 1) * self.tick - time.monotonic())
+
+    async def stop(self) -> None:
+        if self._driver is not None and not self._driver.done():
+            self._driver.cancel()
+            try:
+                await self._driver
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,248 @@
+import asyncio
+import functools
+import itertools
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from .config import TRACE_BUFFER_SIZE, TRACE_SLOW_MS
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("trace", default=None)
+_NO_SPAN = nullcontext()
+_ids = itertools.count(1)
+
+class Trace:
+    """Timed spans recorded while handling one request"""
+    __slots__ = ("id", "method", "path", "started_at", "start", "duration", "status", "spans", "profile")
+
+    def __init__(self, method: str, path: str):
+        self.id = f"{next(_ids):x}"
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.status = 500
+        self.spans: List[dict] = []
+        self.profile: Optional[dict] = None
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "startedAt": self.started_at,
+            "durationMs": round(self.duration * 1000, 3),
+            "spans": self.spans,
+            "profiled": self.profile is not None,
+        }
+
+    def to_dict(self) -> dict:
+        return dict(self.summary(), profile=self.profile)
+
+@contextmanager
+def _record(trace: Trace, name: str, attrs: Dict[str, Any]):
+    start = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        end = time.perf_counter()
+        trace.spans.append({
+            "name": name,
+            "startMs": round((start - trace.start) * 1000, 3),
+            "durationMs": round((end - start) * 1000, 3),
+            **attrs,
+        })
+
+def span(name: str, **attrs):
+    """Time a block as a span of the current request's trace; a shared no-op when the request isn't traced.
+
+    The yielded dict (None when untraced) can be filled with attributes
+    known only once the block has run, such as a status code.
+    """
+    trace = _current.get()
+    if trace is None:
+        return _NO_SPAN
+    return _record(trace, name, attrs)
+
+class SamplingProfiler:
+    """Samples the stack of one thread at a fixed interval from a helper thread.
+
+    Aimed at the event loop thread while one request runs, so samples also
+    catch whatever else the loop does meanwhile. Suspended coroutines are
+    not on the stack; time spent awaiting upstream shows up as the loop's
+    idle selector frame.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, top: int = 50) -> dict:
+        self._stop.set()
+        self._thread.join()
+        return {
+            "intervalMs": self.interval * 1000,
+            "samples": self.samples,
+            # Folded stacks (root;...;leaf), ready for flamegraph tools
+            "stacks": [{"stack": stack, "count": count} for stack, count in self.stacks.most_common(top)],
+        }
+
+class TraceBuffer:
+    """The last `capacity` traces slower than `slow_ms`, plus every explicitly requested one"""
+
+    def __init__(self, capacity: int, slow_ms: float):
+        self.slow = slow_ms / 1000
+        self._traces: Deque[Trace] = deque(maxlen=capacity)
+
+    def add(self, trace: Trace, requested: bool) -> None:
+        if requested or trace.duration >= self.slow:
+            self._traces.append(trace)
+
+    def recent(self, limit: int) -> List[Trace]:
+        return list(reversed(self._traces))[:limit]
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        return next((trace for trace in self._traces if trace.id == trace_id), None)
+
+class TracingMiddleware:
+    """Pure ASGI middleware that traces requests into a `TraceBuffer`.
+
+    Every request is traced when `always` is set; otherwise only those
+    sending `X-Trace: 1`. `X-Profile: 1` also samples the event loop's stack
+    for that request (one profiled request at a time). Traced responses
+    carry an `X-Trace-Id` header for `/api/debug/traces/{id}`.
+    """
+
+    def __init__(self, app, buffer: TraceBuffer, always: bool = False, profile_interval: float = 0.001):
+        self.app = app
+        self.buffer = buffer
+        self.always = always
+        self.profile_interval = profile_interval
+        self._profiling = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = profile = False
+        for name, value in scope["headers"]:
+            if name == b"x-trace":
+                requested = value not in (b"0", b"false")
+            elif name == b"x-profile":
+                profile = value not in (b"0", b"false")
+        if not (self.always or requested or profile):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(scope["method"], scope["path"])
+        token = _current.set(trace)
+        profiler = None
+        if profile and not self._profiling:
+            self._profiling = True
+            profiler = SamplingProfiler(threading.get_ident(), self.profile_interval)
+            profiler.start()
+
+        async def send_traced(message):
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-trace-id", trace.id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_traced)
+        finally:
+            trace.duration = time.perf_counter() - trace.start
+            _current.reset(token)
+            if profiler is not None:
+                trace.profile = profiler.stop()
+                self._profiling = False
+            self.buffer.add(trace, requested or profile)
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records a span per upstream call, cache hits and limiter waits included"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with span("upstream", method=request.method, path=request.url.path) as attrs:
+            response = await self._transport.handle_async_request(request)
+            if attrs is not None:
+                attrs["status"] = response.status_code
+            return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+class _TracedField:
+    """Wraps a route's response field so response validation and serialization become spans"""
+
+    def __init__(self, field):
+        self._field = field
+
+    def __getattr__(self, name):
+        return getattr(self._field, name)
+
+    def validate(self, *args, **kwargs):
+        with span("validate"):
+            return self._field.validate(*args, **kwargs)
+
+    def serialize(self, *args, **kwargs):
+        with span("serialize"):
+            return self._field.serialize(*args, **kwargs)
+
+class TracedJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        with span("encode"):
+            return super().render(content)
+
+class TracedRoute(APIRoute):
+    """APIRoute whose endpoint call, response validation, serialization and JSON encoding are traced spans"""
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if asyncio.iscoroutinefunction(call) and not hasattr(call, "__traced__"):
+            @functools.wraps(call)
+            async def traced_call(*args, **kwargs):
+                with span("endpoint"):
+                    return await call(*args, **kwargs)
+            traced_call.__traced__ = True
+            self.dependant.call = traced_call
+        if self.secure_cloned_response_field is not None and not isinstance(self.secure_cloned_response_field, _TracedField):
+            self.secure_cloned_response_field = _TracedField(self.secure_cloned_response_field)
+        if isinstance(self.response_class, DefaultPlaceholder) and self.response_class.value is JSONResponse:
+            self.response_class = DefaultPlaceholder(TracedJSONResponse)
+        return super().get_route_handler()
+
+# Process-wide buffer behind /api/debug/traces
+traces = TraceBuffer(TRACE_BUFFER_SIZE, TRACE_SLOW_MS)
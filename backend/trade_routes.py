@@ -0,0 +1,182 @@
+import math
+import time
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .galaxy_store import GalaxyStore
+from .market_history import MarketHistory
+from .route_planner import FLIGHT_MODES, RoutePlanner, best_hops
+
+# A unit of FUEL bought at a market puts this much fuel in a ship's tank
+FUEL_PER_UNIT = 100
+# Systems with more priced markets than this are pruned before building the profit matrix
+PRUNE_ABOVE = 64
+# Cheapest sellers × dearest buyers of each good tried for the pruning threshold
+SAMPLE = 8
+# Profit matrices up to this many (buy, sell, good) cells are built in one go rather than good by good
+DENSE_CELLS = 1 << 18
+
+class TradeRouteFinder:
+    """Ranks buy-here, sell-there trades between the marketplaces of a system.
+
+    For every ordered pair of a system's markets and every good, a trade
+    fills the hold at the first market's purchase price and sells it all at
+    the second's sell price, less the fuel for the hop (bought at the first
+    market's FUEL price) and the hop's time valued at `time_value` credits
+    an hour. Prices are the latest in the `MarketHistory`; each hop is flown
+    in the fastest mode the tank allows, with its time and fuel from a
+    market graph per system and ship profile, cached (separately from the
+    route planner's, since a galaxy-wide query reads every system's).
+
+    The profit matrix is buy market × sell market, maxed over goods one good
+    at a time. In a large system, the best of a small sample of cheap-buy /
+    dear-sell pairs first sets a floor the top trades must beat; as costs
+    only take away, markets whose prices can't clear it by margin alone are
+    left out of the matrix. Only direct hops the tank allows are considered,
+    and prices are taken to hold for the whole load.
+    """
+
+    def __init__(self, history: MarketHistory, store: GalaxyStore, max_graphs: int = 512):
+        self.history = history
+        self.planner = RoutePlanner(store, max_graphs)
+
+    def systems(self) -> List[str]:
+        """Systems with at least one market with recorded prices"""
+        return sorted({symbol.rsplit("-", 1)[0] for symbol in self.history.market_symbols})
+
+    async def prepare(self, systems: Sequence[str], speed: float, fuel_capacity: int,
+                      modes: Optional[Sequence[str]] = None) -> None:
+        """Build the market graphs `find` will read for these systems off the event loop"""
+        modes = list(modes or FLIGHT_MODES)
+        for system_symbol in systems:
+            await self.planner.prepare(system_symbol, fuel_capacity, speed, modes)
+
+    def find(self, systems: Sequence[str], units: int, speed: float, fuel_capacity: int, limit: int = 10,
+             time_value: float = 0.0, max_age: Optional[float] = None, modes: Optional[Sequence[str]] = None,
+             origin: Optional[dict] = None, fuel: Optional[int] = None) -> List[dict]:
+        """The `limit` most profitable trades in `systems`, best first.
+
+        With an `origin` waypoint (and the `fuel` in the tank) the flight
+        there to the buying market is charged to each trade in its system.
+        """
+        modes = list(modes or FLIGHT_MODES)
+        snapshot = self.history.snapshot()
+        candidates = []
+        for system_symbol in systems:
+            start = origin if origin is not None and origin.get("systemSymbol") == system_symbol else None
+            candidates += self._system_routes(system_symbol, snapshot, units, speed, fuel_capacity, modes, limit,
+                                              max(time_value, 0.0), max_age, start, fuel_capacity if fuel is None else fuel)
+        # Only the overall winners are worth describing
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        return [describe() for _, describe in candidates[:limit]]
+
+    def _system_routes(self, system_symbol: str, snapshot: dict, units: int, speed: float, fuel_capacity: int,
+                       modes: List[str], limit: int, time_value: float, max_age: Optional[float],
+                       origin: Optional[dict], fuel: int) -> List[tuple]:
+        """The system's best `limit` trades as (net profit, callable building the route)"""
+        graph = self.planner.graph(system_symbol, fuel_capacity, speed, modes)
+        rows = self.history.market_index(graph.symbols)
+        # Only markets with prices take part
+        keep = np.flatnonzero(rows >= 0)
+        if len(keep) < 2 or units <= 0:
+            return []
+        rows = rows[keep]
+        times = snapshot["time"][rows]
+        seen = times == times
+        if max_age is not None:
+            seen &= times >= time.time() - max_age
+        purchase, sale = snapshot["purchasePrice"][rows], snapshot["sellPrice"][rows]
+        buy = np.where(seen & (purchase > 0), purchase, np.inf).astype(np.float32)
+        sell = np.where(seen & (sale > 0), sale, -np.inf).astype(np.float32)
+
+        # Credits per unit of fuel at each market: its own FUEL price, or the system's median
+        fuel_price = np.zeros(len(keep), dtype=np.float32)
+        if "FUEL" in snapshot["goods"]:
+            fuel_price = buy[:, snapshot["goods"].index("FUEL")].copy()
+            known = np.isfinite(fuel_price)
+            if not known.all():
+                fuel_price[~known] = np.median(fuel_price[known]) if known.any() else 0.0
+            fuel_price /= FUEL_PER_UNIT
+
+        approach_seconds = np.zeros(len(keep))
+        approach_fuel = np.zeros(len(keep), dtype=np.float32)
+        if origin is not None:
+            # Flying from the ship's waypoint to the buying market first
+            approach_seconds, _, approach_fuel = best_hops(
+                graph.distances_from(origin["x"], origin["y"])[keep], fuel, fuel_capacity, speed, modes)
+            approach_fuel = approach_fuel.astype(np.float32)
+
+        def net_profit(margin: np.ndarray, i: np.ndarray, j: np.ndarray):
+            """Net profit of buying at markets `i` and selling at `j` (broadcast), with the hop's seconds and fuel"""
+            seconds = graph.seconds[keep[i], keep[j]] + approach_seconds[i]
+            hop_fuel = graph.fuel[keep[i], keep[j]] + approach_fuel[i]
+            net = margin * units - hop_fuel * fuel_price[i]
+            if time_value:
+                net -= (seconds * (time_value / 3600)).astype(np.float32)
+            # Staying put, and hops the tank can't make, never pay
+            net[~np.isfinite(seconds) | (i == j)] = -np.inf
+            return net, seconds, hop_fuel
+
+        buyers = sellers = np.arange(len(keep))
+        if len(keep) > PRUNE_ABOVE:
+            # Exact profits of the cheapest sellers × dearest buyers of each good...
+            sample = min(SAMPLE, len(keep))
+            i = np.argpartition(buy, sample - 1, axis=0)[:sample].T[:, :, None]
+            j = np.argpartition(-sell, sample - 1, axis=0)[:sample].T[:, None, :]
+            goods = np.arange(buy.shape[1])[:, None, None]
+            sampled = net_profit(sell[j, goods] - buy[i, goods], i, j)[0].ravel()
+            floor = np.partition(sampled, len(sampled) - limit)[len(sampled) - limit] if len(sampled) >= limit else 0.0
+            if floor > 0:
+                # ...set a floor; a market whose prices can't beat it before costs can't be in the top `limit`
+                threshold = floor / units
+                with np.errstate(invalid="ignore"):
+                    buyers = np.flatnonzero((buy < sell.max(axis=0) - threshold).any(axis=1))
+                    sellers = np.flatnonzero((sell > buy.min(axis=0) + threshold).any(axis=1))
+
+        # Best margin per unit of any good for every (buy, sell) pair
+        buy_block, sell_block = buy[buyers], sell[sellers]
+        if buy_block.size * len(sellers) <= DENSE_CELLS:
+            # Small enough to take every good at once
+            margin = (sell_block[None, :, :] - buy_block[:, None, :]).max(axis=2)
+        else:
+            margin = np.full((len(buyers), len(sellers)), -np.inf, dtype=np.float32)
+            spread = np.empty_like(margin)
+            for good in np.flatnonzero(np.isfinite(buy_block).any(axis=0) & np.isfinite(sell_block).any(axis=0)):
+                np.subtract(sell_block[None, :, good], buy_block[:, good, None], out=spread)
+                np.maximum(margin, spread, out=margin)
+        net, seconds, hop_fuel = net_profit(margin, buyers[:, None], sellers[None, :])
+
+        flat = net.ravel()
+        k = min(limit, flat.size)
+        top = np.argpartition(flat, flat.size - k)[flat.size - k:]
+        top = top[flat[top] > 0]
+
+        def describe(a: int, b: int) -> dict:
+            i, j = buyers[a], sellers[b]
+            good = int(np.argmax(sell[j] - buy[i]))
+            hours = float(seconds[a, b]) / 3600
+            fuel_cost = float(hop_fuel[a, b] * fuel_price[i])
+            profit = float(sell[j, good] - buy[i, good]) * units - fuel_cost - hours * time_value
+            return {
+                "system": system_symbol,
+                "good": snapshot["goods"][good],
+                "buyMarket": graph.symbols[keep[i]],
+                "sellMarket": graph.symbols[keep[j]],
+                "buyPrice": int(buy[i, good]),
+                "sellPrice": int(sell[j, good]),
+                "units": units,
+                "flightMode": graph.modes[graph.mode_index[keep[i], keep[j]]],
+                "distance": round(math.hypot(graph.xs[keep[i]] - graph.xs[keep[j]], graph.ys[keep[i]] - graph.ys[keep[j]]), 1),
+                "fuel": int(hop_fuel[a, b]),
+                "durationSeconds": int(seconds[a, b]),
+                "grossProfit": int(sell[j, good] - buy[i, good]) * units,
+                "fuelCost": round(fuel_cost),
+                "timeCost": round(hours * time_value),
+                "profit": round(profit),
+                "profitPerHour": round(profit / hours) if hours > 0 else None,
+                "pricesAge": round(time.time() - float(min(times[i, good], times[j, good])), 1),
+            }
+
+        return [(float(flat[t]), lambda a=a, b=b: describe(a, b))
+                for t, a, b in zip(top, *np.unravel_index(top, net.shape))]
@@ -0,0 +1,86 @@
+import re
+import httpx
+from typing import Optional
+
+from .config import (
+    UPSTREAM_HTTP2,
+    UPSTREAM_MAX_CONNECTIONS,
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+    UPSTREAM_KEEPALIVE_EXPIRY,
+    UPSTREAM_TIMEOUT,
+    UPSTREAM_CONNECT_TIMEOUT,
+    UPSTREAM_RATE_LIMIT_PER_SECOND,
+    UPSTREAM_RATE_LIMIT_BURST,
+    UPSTREAM_MAX_429_RETRIES,
+    CACHE_TTL_SYSTEMS,
+    CACHE_TTL_WAYPOINTS,
+    CACHE_TTL_FACTIONS,
+    CACHE_TTL_SHIPS,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_DB,
+    SPACETRADERS_API_URL,
+)
+from .rate_limiter import UpstreamRateLimiter, RateLimitedTransport
+from .coalescing import SingleFlightGroup, SingleFlightTransport
+from .response_cache import CacheRule, DiskCacheTier, ResponseCache, CachingTransport
+from .metrics import MetricsTransport, metrics
+from .tracing import TracingTransport
+
+# Process-wide client for SpaceTraders API calls. Keeping one client alive lets
+# every router reuse pooled keep-alive connections instead of paying a fresh
+# TCP+TLS handshake per request.
+_client: Optional[httpx.AsyncClient] = None
+
+# One token bucket for every upstream call so bursts from several routers are
+# smoothed out before they reach SpaceTraders' rate limit
+rate_limiter = UpstreamRateLimiter(rate=UPSTREAM_RATE_LIMIT_PER_SECOND, burst=UPSTREAM_RATE_LIMIT_BURST)
+
+# Identical GETs in flight at the same time (e.g. several pages loading
+# /api/ships together) share a single upstream call
+single_flight = SingleFlightGroup()
+
+# Galaxy data barely changes so it is cached for long periods (and optionally on
+# disk); ship reads get a short TTL and are invalidated by any ship mutation
+response_cache = ResponseCache(
+    rules=[
+        CacheRule("waypoints", re.compile(r"/systems/[^/]+/waypoints(/[^/]+)?$"), CACHE_TTL_WAYPOINTS, persist=True),
+        CacheRule("systems", re.compile(r"/systems(/[^/]+)?$"), CACHE_TTL_SYSTEMS, persist=True),
+        CacheRule("factions", re.compile(r"/factions(/[^/]+)?$"), CACHE_TTL_FACTIONS, persist=True),
+        CacheRule("ships", re.compile(r"/my/ships(/[^/]+)?$"), CACHE_TTL_SHIPS, persist=False),
+    ],
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    disk=DiskCacheTier(RESPONSE_CACHE_DB) if RESPONSE_CACHE_DB else None,
+)
+
+def create_upstream_client() -> httpx.AsyncClient:
+    """Build a pooled HTTP client configured from the UPSTREAM_* settings"""
+    limits = httpx.Limits(
+        max_connections=UPSTREAM_MAX_CONNECTIONS,
+        max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(UPSTREAM_TIMEOUT, connect=UPSTREAM_CONNECT_TIMEOUT)
+    transport = httpx.AsyncHTTPTransport(http2=UPSTREAM_HTTP2, limits=limits)
+    # Innermost, so only calls that actually reach SpaceTraders are timed
+    transport = MetricsTransport(transport, metrics, base_url=SPACETRADERS_API_URL)
+    transport = RateLimitedTransport(transport, rate_limiter, max_retries=UPSTREAM_MAX_429_RETRIES)
+    # Coalesce outside the limiter so waiters sharing a response spend no tokens
+    transport = SingleFlightTransport(transport, single_flight)
+    transport = CachingTransport(transport, response_cache)
+    # Outermost, so a traced request's upstream spans include cache hits and shared calls
+    transport = TracingTransport(transport)
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+def get_upstream_client() -> httpx.AsyncClient:
+    """Return the shared upstream client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_upstream_client()
+    return _client
+
+async def close_upstream_client() -> None:
+    """Close the shared upstream client and release its pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,11 +1,117 @@
 import httpx
-from typing import AsyncGenerator
+
+from .config import (
+    HAS_VALID_TOKEN,
+    SPACETRADERS_API_URL,
+    SPACETRADERS_TOKEN,
+    GALAXY_DB_PATH,
+    GALAXY_CRAWL_CONCURRENCY,
+    GALAXY_CRAWL_PAGE_LIMIT,
+    MOCK_GALAXY_SEED,
+    MOCK_GALAXY_SYSTEMS,
+    MOCK_GALAXY_WAYPOINTS_PER_SYSTEM,
+    MOCK_GALAXY_SHIPS,
+    MOCK_GALAXY_MARKET_SHARE,
+    MOCK_GALAXY_CREW,
+    MOCK_GALAXY_CONTRACTS,
+    SCHEDULER_TICK_SECONDS,
+    SCHEDULER_WHEEL_SLOTS,
+    SURVEY_EXPIRY_MARGIN,
+    MARKET_POLL_INTERVAL,
+    MARKET_POLL_RATE,
+    MARKET_HISTORY_PATH,
+)
+from .contracts import ContractPlanner, ContractStore
+from .cooldown_scheduler import CooldownScheduler
+from .deliveries import DeliveryEngine
+from .fleet_repository import FleetRepository
+from .fleet_store import FleetStore
+from .fleet_stream import FleetStream
+from .galaxy_crawler import GalaxyCrawler
+from .galaxy_store import GalaxyStore
+from .market_history import MarketHistory
+from .market_ingester import MarketIngester
+from .mining import MiningEngine
+from .mock_galaxy import MockGalaxy, TRADE_GOODS
+from .route_planner import RoutePlanner
+from .security_engine import SecurityEngine
+from .survey_store import SurveyStore
+from .timer_wheel import TimerWheel
+from .trade_routes import TradeRouteFinder
+from .upstream import get_upstream_client
 
 # HTTP client for SpaceTraders API
-async def get_httpx_client() -> AsyncGenerator[httpx.AsyncClient, None]:
-    """Dependency that provides an HTTP client for SpaceTraders API calls"""
-    async with httpx.AsyncClient() as client:
-        yield client
+async def get_httpx_client() -> httpx.AsyncClient:
+    """Dependency that provides the shared, pooled HTTP client for SpaceTraders API calls"""
+    return get_upstream_client()
+
+# Every ship's security systems, as expiry times worked out on read
+security_engine = SecurityEngine()
+
+# Demo mode's galaxy, fleet and crew pool; systems are generated as they are first read
+mock_galaxy = MockGalaxy(
+    seed=MOCK_GALAXY_SEED,
+    systems=MOCK_GALAXY_SYSTEMS,
+    waypoints_per_system=MOCK_GALAXY_WAYPOINTS_PER_SYSTEM,
+    ships=MOCK_GALAXY_SHIPS,
+    market_share=MOCK_GALAXY_MARKET_SHARE,
+    crew=MOCK_GALAXY_CREW,
+    contracts=MOCK_GALAXY_CONTRACTS,
+)
+
+# Server-side fleet state, updated from action responses and periodic syncs,
+# with every change pushed to /api/ships/stream subscribers
+fleet_store = FleetStore(SPACETRADERS_API_URL, SPACETRADERS_TOKEN)
+if not HAS_VALID_TOKEN:
+    fleet_store.replace(mock_galaxy.ships())
+fleet_stream = FleetStream(fleet_store)
+# O(1) ship lookups and per-ship locks for handlers that change a ship
+fleet_repository = FleetRepository(fleet_store, HAS_VALID_TOKEN, SPACETRADERS_API_URL, SPACETRADERS_TOKEN)
+# Queued per-ship actions fired as cooldowns (seen by the fleet store) expire
+cooldown_scheduler = CooldownScheduler(fleet_store, TimerWheel(SCHEDULER_TICK_SECONDS, SCHEDULER_WHEEL_SLOTS))
+# Active surveys by waypoint, ranked by deposit value at the latest traded prices
+survey_store = SurveyStore(SURVEY_EXPIRY_MARGIN)
+if not HAS_VALID_TOKEN:
+    survey_store.set_prices(TRADE_GOODS)
+# Per-ship survey-extract-sell loops (/api/mining)
+mining_engine = MiningEngine(fleet_store, survey_store)
+
+# Local copy of the galaxy, filled by the crawler and served by /api/systems.
+# Demo mode keeps an in-memory store filled from the mock galaxy as it is read instead.
+if HAS_VALID_TOKEN:
+    galaxy_store = GalaxyStore(GALAXY_DB_PATH)
+else:
+    galaxy_store = GalaxyStore(":memory:", source=mock_galaxy)
+galaxy_crawler = GalaxyCrawler(
+    galaxy_store,
+    SPACETRADERS_API_URL,
+    SPACETRADERS_TOKEN,
+    concurrency=GALAXY_CRAWL_CONCURRENCY,
+    page_limit=GALAXY_CRAWL_PAGE_LIMIT,
+)
+
+# Price and supply history of every known marketplace (/api/markets), polled in the background
+market_history = MarketHistory(MARKET_HISTORY_PATH)
+market_ingester = MarketIngester(
+    market_history,
+    galaxy_store,
+    fleet_store,
+    SPACETRADERS_API_URL,
+    SPACETRADERS_TOKEN,
+    interval=MARKET_POLL_INTERVAL,
+    rate=MARKET_POLL_RATE,
+    source=None if HAS_VALID_TOKEN else mock_galaxy,
+)
+
+# Fuel-aware route planning over the local galaxy store
+route_planner = RoutePlanner(galaxy_store)
+
+# Top buy-and-sell trades over the latest recorded market prices (/api/trade/routes)
+trade_route_finder = TradeRouteFinder(market_history, galaxy_store)
 
-# Global security status storage (in production, this would be in a database)
-ship_security_status = {}
\ No newline at end of file
+# The agent's contracts (/api/contracts), their cheapest sourcing plans and background deliveries
+contract_store = ContractStore(SPACETRADERS_API_URL, SPACETRADERS_TOKEN)
+if not HAS_VALID_TOKEN:
+    contract_store.replace(mock_galaxy.contracts())
+contract_planner = ContractPlanner(market_history, galaxy_store, fleet_store, route_planner)
+delivery_engine = DeliveryEngine(contract_store, fleet_store, contract_planner)
@@ -0,0 +1,2 @@
+# Benchmarks for the backend, run from the repository root, e.g.
+#   python -m benchmarks.bench_upstream_client
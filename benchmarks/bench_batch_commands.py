@@ -0,0 +1,62 @@
+"""Compare moving a fleet one request at a time against one `/api/ships/batch` call.
+
+The stub upstream answers each ship command after a fixed latency. The
+sequential mode issues orbit + navigate per ship from the "browser" one after
+another; the batch mode sends all of them in a single request:
+
+    python -m benchmarks.bench_batch_commands --ships 40 --latency-ms 50
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from .common import configure_live_backend, free_port, run_server
+
+async def run(ship_count: int, rounds: int):
+    from backend.main import app
+
+    symbols = [f"STUB_SHIP_{i}" for i in range(ship_count)]
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend", timeout=60) as client:
+            sequential, batched = [], []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for symbol in symbols:
+                    (await client.post(f"/api/ships/{symbol}/orbit")).raise_for_status()
+                    (await client.post(f"/api/ships/{symbol}/navigate",
+                                       json={"waypointSymbol": "X1-DF55-20250Y"})).raise_for_status()
+                sequential.append(time.perf_counter() - start)
+
+                actions = []
+                for symbol in symbols:
+                    actions.append({"shipSymbol": symbol, "action": "orbit"})
+                    actions.append({"shipSymbol": symbol, "action": "navigate", "waypointSymbol": "X1-DF55-20250Y"})
+                start = time.perf_counter()
+                response = await client.post("/api/ships/batch", json={"actions": actions})
+                batched.append(time.perf_counter() - start)
+                meta = response.json()["meta"]
+                assert meta["failed"] == 0, response.json()
+
+    best_sequential, best_batched = min(sequential), min(batched)
+    print(f"{ship_count} ships x (orbit + navigate)")
+    print(f"sequential requests: {best_sequential * 1000:>8.0f} ms")
+    print(f"one batch request:   {best_batched * 1000:>8.0f} ms")
+    print(f"speedup:             {best_sequential / best_batched:>8.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ships", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    from .stub_upstream import create_stub_app
+    with run_server(create_stub_app(fleet_size=args.ships, latency=args.latency_ms / 1000), free_port()) as url:
+        configure_live_backend(url)
+        asyncio.run(run(args.ships, args.rounds))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Time scoring a board of contract offers in one batched pass against one contract at a time.
+
+Builds `--markets` priced marketplaces over `--systems` systems (as
+bench_trade_routes does), a fleet of `--ships` haulers spread over them and
+`--contracts` procurement contracts of one to three deliveries each, then
+times `ContractPlanner.plan` on every contract at once (one ship × delivery ×
+market array per system) and called once per contract. Both must pick the
+same plans:
+
+    python -m benchmarks.bench_contract_plans --contracts 200 --ships 50
+"""
+import argparse
+import random
+import time
+
+from backend.contracts import ContractPlanner
+from backend.fleet_store import FleetStore
+from backend.route_planner import RoutePlanner
+
+from .bench_trade_routes import build
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--markets", type=int, default=3000)
+    parser.add_argument("--systems", type=int, default=20)
+    parser.add_argument("--goods", type=int, default=15)
+    parser.add_argument("--ships", type=int, default=50)
+    parser.add_argument("--contracts", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    store, history, waypoints = build(args.markets, args.systems, args.goods, args.seed)
+    fleet = FleetStore("", "")
+    fleet.replace({
+        "symbol": f"HAULER-{n}",
+        "nav": {"status": "DOCKED", "waypointSymbol": waypoint["symbol"], "systemSymbol": waypoint["systemSymbol"]},
+        "engine": {"speed": rng.choice([10, 15, 25, 30])},
+        "fuel": {"current": 400, "capacity": rng.choice([400, 800, 1200])},
+        "cargo": {"units": 0, "capacity": rng.choice([40, 80, 120]), "inventory": []},
+    } for n, waypoint in enumerate(rng.sample(waypoints, args.ships)))
+    goods = history.good_symbols[1:]
+    contracts = [{
+        "id": f"contract-{n}",
+        "type": "PROCUREMENT",
+        "terms": {"payment": {"onAccepted": 10000, "onFulfilled": 90000}, "deliver": [
+            {"tradeSymbol": rng.choice(goods), "destinationSymbol": rng.choice(waypoints)["symbol"],
+             "unitsRequired": rng.choice([20, 60, 120, 240]), "unitsFulfilled": 0}
+            for _ in range(rng.randint(1, 3))]},
+        "accepted": False,
+        "fulfilled": False,
+    } for n in range(args.contracts)]
+    planner = ContractPlanner(history, store, fleet, RoutePlanner(store))
+    planner.plan(contracts)  # Builds every system's spatial indexes
+
+    start = time.perf_counter()
+    batched = planner.plan(contracts)
+    batched_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    single = [planner.plan([contract])[0] for contract in contracts]
+    single_ms = (time.perf_counter() - start) * 1000
+
+    by_id = {plan["contractId"]: plan for plan in single}
+    for plan in batched:
+        assert plan["deliveries"] == by_id[plan["contractId"]]["deliveries"], plan["contractId"]
+    feasible = [plan for plan in batched if plan["feasible"]]
+    print(f"{args.contracts} contracts, {args.ships} ships, {args.markets} markets in {args.systems} systems: "
+          f"{len(feasible)} feasible")
+    print(f"batched: {batched_ms:.1f} ms; one at a time: {single_ms:.1f} ms ({single_ms / batched_ms:.1f}x)")
+    if feasible:
+        best = feasible[0]
+        print(f"best {best['contractId']}: profit {best['profit']} over {best['durationSeconds']} s "
+              f"via {', '.join(d['shipSymbol'] + '@' + (d['buyMarket'] or 'hold') for d in best['deliveries'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Show the cooldown scheduler firing queued actions on time across thousands of ships.
+
+Queues `--actions` actions on each of `--ships` ships. Each action "runs" by
+applying a fresh random cooldown to the fleet store, as a scan or survey
+response does, so the next action waits for it. Reports how late actions
+started after their ship's cooldown ended, the timer wheel's wakeups and the
+CPU used, against clients that blindly retry every tick until the cooldown
+is over, where each early retry is an upstream call answered with a 409:
+
+    python -m benchmarks.bench_cooldown_scheduler --ships 5000 --actions 3
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from backend.cooldown_scheduler import CooldownScheduler
+from backend.fleet_store import FleetStore
+from backend.timer_wheel import TimerWheel
+
+from .common import summarize
+
+def cooldown(rng: random.Random, low: float, high: float) -> dict:
+    return {"remainingSeconds": rng.uniform(low, high), "expiration": None}
+
+async def run_scheduler(args) -> dict:
+    rng = random.Random(1)
+    store = FleetStore("", "")
+    # Only held ships take action responses
+    store.replace({"symbol": f"SHIP-{i}"} for i in range(args.ships))
+    scheduler = CooldownScheduler(store, TimerWheel(args.tick, args.slots))
+    lateness = []
+    remaining = args.ships * args.actions
+    done = asyncio.Event()
+
+    async def act(ship_symbol: str, payload: dict) -> dict:
+        nonlocal remaining
+        lateness.append((time.monotonic() - payload["readyAt"][ship_symbol]) * 1000)
+        body = {"data": {"cooldown": cooldown(rng, args.min_cooldown, args.max_cooldown)}}
+        store.apply_response(ship_symbol, body)
+        payload["readyAt"][ship_symbol] = time.monotonic() + body["data"]["cooldown"]["remainingSeconds"]
+        remaining -= 1
+        if not remaining:
+            done.set()
+        return body
+
+    scheduler.register("act", act)
+    ready_at = {}
+    cpu = time.process_time()
+    start = time.perf_counter()
+    for i in range(args.ships):
+        symbol = f"SHIP-{i}"
+        first = cooldown(rng, 0, args.max_cooldown)
+        store.apply(symbol, {"cooldown": first})
+        ready_at[symbol] = time.monotonic() + first["remainingSeconds"]
+        for _ in range(args.actions):
+            scheduler.submit(symbol, "act", {"readyAt": ready_at})
+    await done.wait()
+    result = {
+        "wall": time.perf_counter() - start,
+        "cpu": time.process_time() - cpu,
+        "wakeups": scheduler.wheel.wakeups,
+        "lateness": summarize(lateness),
+    }
+    await scheduler.stop()
+    return result
+
+async def run_retrying(args) -> dict:
+    """Every tick, try each ship's next action; attempts before its cooldown ends would be 409s"""
+    rng = random.Random(1)
+    now = time.monotonic()
+    ready_at = {f"SHIP-{i}": now + rng.uniform(0, args.max_cooldown) for i in range(args.ships)}
+    pending = {symbol: args.actions for symbol in ready_at}
+    lateness, attempts, wakeups = [], 0, 0
+    cpu = time.process_time()
+    start = time.perf_counter()
+    while pending:
+        await asyncio.sleep(args.tick)
+        wakeups += 1
+        now = time.monotonic()
+        for symbol in list(pending):
+            attempts += 1
+            if ready_at[symbol] <= now:
+                lateness.append((now - ready_at[symbol]) * 1000)
+                ready_at[symbol] = now + rng.uniform(args.min_cooldown, args.max_cooldown)
+                pending[symbol] -= 1
+                if not pending[symbol]:
+                    del pending[symbol]
+    return {
+        "wall": time.perf_counter() - start,
+        "cpu": time.process_time() - cpu,
+        "wakeups": wakeups,
+        "attempts": attempts,
+        "lateness": summarize(lateness),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ships", type=int, default=5000)
+    parser.add_argument("--actions", type=int, default=3, help="actions queued per ship")
+    parser.add_argument("--min-cooldown", type=float, default=0.5)
+    parser.add_argument("--max-cooldown", type=float, default=3.0)
+    parser.add_argument("--tick", type=float, default=0.1)
+    parser.add_argument("--slots", type=int, default=512)
+    args = parser.parse_args()
+
+    for name, run in (("timer wheel", run_scheduler), ("retry every tick", run_retrying)):
+        result = asyncio.run(run(args))
+        late = result["lateness"]
+        attempts = result.get("attempts", late["count"])
+        extra = f"  {attempts} upstream calls ({attempts - late['count']} 409s)"
+        print(f"{name:<16} {late['count']} actions in {result['wall']:.1f} s, cpu {result['cpu'] * 1000:.0f} ms, "
+              f"{result['wakeups']} wakeups, late p50 {late['p50']:.1f} ms p99 {late['p99']:.1f} ms{extra}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Show ship lookup cost staying flat from 1 to 50,000 ships.
+
+Fills a fleet store with N copies of the mock ship and times random lookups
+through `FleetRepository.get` against the old linear
+`next(s for s in ships if ...)` scan, plus an uncontended per-ship lock
+round trip:
+
+    python -m benchmarks.bench_fleet_repository --sizes 1 100 1000 10000 50000
+"""
+import argparse
+import asyncio
+import copy
+import random
+import time
+
+from backend.fleet_repository import FleetRepository
+from backend.fleet_store import FleetStore
+from backend.mock_data import MOCK_SHIPS
+
+def per_call_us(fn, symbols) -> float:
+    start = time.perf_counter()
+    for symbol in symbols:
+        fn(symbol)
+    return (time.perf_counter() - start) / len(symbols) * 1e6
+
+async def lock_us(repository: FleetRepository, symbols) -> float:
+    start = time.perf_counter()
+    for symbol in symbols:
+        async with repository.lock(symbol):
+            pass
+    return (time.perf_counter() - start) / len(symbols) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000, 10000, 50000])
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--linear-lookups", type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(3)
+
+    print(f"{'ships':>7} {'repository us':>14} {'linear scan us':>15} {'lock us':>8}")
+    for size in args.sizes:
+        ships = []
+        for i in range(size):
+            ship = copy.deepcopy(MOCK_SHIPS[0])
+            ship["symbol"] = f"SHIP_{i}"
+            ships.append(ship)
+        store = FleetStore("", "")
+        store.replace(ships)
+        repository = FleetRepository(store, False, "", "")
+
+        symbols = [f"SHIP_{rng.randrange(size)}" for _ in range(args.lookups)]
+        indexed = per_call_us(repository.get, symbols)
+        linear = per_call_us(lambda symbol: next((s for s in ships if s["symbol"] == symbol), None),
+                             symbols[:args.linear_lookups])
+        locking = asyncio.run(lock_us(repository, symbols))
+        print(f"{size:>7} {indexed:>14.3f} {linear:>15.1f} {locking:>8.2f}")
+
+if __name__ == "__main__":
+    main()
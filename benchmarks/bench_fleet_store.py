@@ -0,0 +1,60 @@
+"""Compare fleet reads answered by the fleet store against reading the fleet upstream.
+
+The stub upstream serves a paginated `/my/ships` with a fixed latency per
+page. Times `GET /api/ships?refresh=true` (a full upstream read),
+`GET /api/ships` and `GET /api/ships/{symbol}` (both from the store), and
+counts the upstream requests each one costs:
+
+    python -m benchmarks.bench_fleet_store --ships 100 --latency-ms 50
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from .common import configure_live_backend, free_port, run_server, summarize
+
+async def measure(client: httpx.AsyncClient, route: str, requests: int, stub) -> tuple:
+    samples = []
+    before = stub.state.request_count
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get(route)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return summarize(samples), (stub.state.request_count - before) / requests
+
+async def run(stub, requests: int):
+    from backend.main import app
+    from backend.utilities import fleet_store
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend", timeout=60) as client:
+            while fleet_store.synced_at is None:
+                await asyncio.sleep(0.01)
+            symbol = fleet_store.all()[-1]["symbol"]
+            print(f"{'route':<28} {'p50 ms':>8} {'p99 ms':>8} {'upstream/req':>13}")
+            for route in ("/api/ships?refresh=true", "/api/ships", f"/api/ships/{symbol}"):
+                stats, upstream = await measure(client, route, requests, stub)
+                print(f"{route:<28} {stats['p50']:>8.2f} {stats['p99']:>8.2f} {upstream:>13.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ships", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    # Keep the background sync out of the measurement window
+    os.environ.setdefault("FLEET_SYNC_INTERVAL", "3600")
+    from .stub_upstream import create_stub_app
+    stub = create_stub_app(fleet_size=args.ships, latency=args.latency_ms / 1000)
+    with run_server(stub, free_port()) as url:
+        configure_live_backend(url)
+        asyncio.run(run(stub, args.requests))
+
+if __name__ == "__main__":
+    main()
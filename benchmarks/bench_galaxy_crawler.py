@@ -0,0 +1,80 @@
+"""Measure galaxy crawl throughput (pages per second) against a local stub.
+
+The stub serves a paginated `/systems` with a fixed per-page latency. The crawl
+is run at several concurrency levels, then interrupted part-way and resumed to
+show that only the missing pages are fetched again:
+
+    python -m benchmarks.bench_galaxy_crawler --systems 4000 --latency-ms 25
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+
+from fastapi import FastAPI
+
+from .common import configure_live_backend, free_port, run_server
+
+def create_systems_stub(system_count: int, latency: float) -> FastAPI:
+    app = FastAPI()
+    systems = [
+        {"symbol": f"X1-S{i}", "sectorSymbol": "X1", "type": "RED_STAR", "x": i % 500, "y": i // 500,
+         "waypoints": [], "factions": []}
+        for i in range(system_count)
+    ]
+
+    @app.get("/systems")
+    async def list_systems(page: int = 1, limit: int = 20):
+        await asyncio.sleep(latency)
+        start = (page - 1) * limit
+        return {"data": systems[start:start + limit], "meta": {"total": system_count, "page": page, "limit": limit}}
+
+    return app
+
+async def crawl_once(client, url: str, db_path: str, concurrency: int, interrupt_after: int = 0):
+    from backend.galaxy_crawler import GalaxyCrawler
+    from backend.galaxy_store import GalaxyStore
+
+    crawler = GalaxyCrawler(GalaxyStore(db_path), url, "benchmark-token", concurrency=concurrency)
+    crawler.start(client)
+    if interrupt_after:
+        while crawler.pages_fetched < interrupt_after:
+            await asyncio.sleep(0.005)
+        await crawler.stop()
+    else:
+        await crawler.task
+    return crawler.status()
+
+async def run(url: str, concurrency_levels, workdir: str):
+    from backend.upstream import create_upstream_client
+
+    async with create_upstream_client() as client:
+        await run_crawls(client, url, concurrency_levels, workdir)
+
+async def run_crawls(client, url: str, concurrency_levels, workdir: str):
+    print(f"{'concurrency':>11} {'pages':>6} {'seconds':>8} {'pages/s':>8}")
+    for concurrency in concurrency_levels:
+        status = await crawl_once(client, url, os.path.join(workdir, f"crawl-{concurrency}.sqlite3"), concurrency)
+        print(f"{concurrency:>11} {status['pagesFetched']:>6} {status['elapsedSeconds']:>8.2f} {status['pagesPerSecond']:>8.1f}")
+
+    db_path = os.path.join(workdir, "resume.sqlite3")
+    first = await crawl_once(client, url, db_path, concurrency_levels[-1], interrupt_after=20)
+    second = await crawl_once(client, url, db_path, concurrency_levels[-1])
+    print(f"resume: interrupted after {first['pagesFetched']} pages ({first['state']}), "
+          f"resumed run fetched {second['pagesFetched']} more, "
+          f"{second['pagesCompleted']}/{second['pagesTotal']} pages and {second['systemsStored']} systems stored")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--systems", type=int, default=4000)
+    parser.add_argument("--latency-ms", type=float, default=25.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    with run_server(create_systems_stub(args.systems, args.latency_ms / 1000), free_port()) as url:
+        configure_live_backend(url)
+        with tempfile.TemporaryDirectory() as workdir:
+            asyncio.run(run(url, args.concurrency, workdir))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Time market history appends and downsampled chart queries at millions of observations.
+
+Fills the store with `--polls` polls of `--markets` markets trading `--goods`
+goods each (bulk-loaded, as from a saved file), times `record()` on market
+responses as the ingester appends them, then asks for `--queries` random
+(market, good) histories downsampled to `--points` points, over the whole
+series and over its last tenth. The baseline keeps the same columns as one
+flat table and masks it per query, as a single-array store would; the rows as
+Python dicts are sized for comparison. Both must agree on every bucket:
+
+    python -m benchmarks.bench_market_history --markets 2000 --goods 10 --polls 100
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backend.market_history import COLUMNS, MarketHistory
+from backend.mock_galaxy import TRADE_GOODS
+
+def make_columns(rng: np.random.Generator, markets: int, goods: int, polls: int, start: float, period: float) -> tuple:
+    """Every market polled every `period` seconds, in poll order, with each good's price wandering"""
+    rows = markets * goods * polls
+    market = np.tile(np.repeat(np.arange(markets, dtype=np.int32), goods), polls)
+    good = np.tile(np.arange(goods, dtype=np.int16), markets * polls)
+    base = np.array(list(TRADE_GOODS.values()) * (goods // len(TRADE_GOODS) + 1))[:goods]
+    walk = np.cumsum(rng.normal(0, 0.02, (polls, markets * goods)), axis=0).ravel()
+    purchase = np.maximum(1, base[good] * np.exp(walk)).astype(np.int32)
+    values = {
+        "time": start + np.repeat(np.arange(polls) * period, markets * goods) + rng.uniform(0, period / 2, rows),
+        "purchasePrice": purchase,
+        "sellPrice": (purchase * 0.9).astype(np.int32),
+        "tradeVolume": rng.choice([10, 20, 40, 60, 100], rows).astype(np.int32),
+        "supply": rng.integers(0, 5, rows).astype(np.int8),
+    }
+    # The time jitter can reorder a series' rows within a poll; keep each in order
+    order = np.lexsort((values["time"], good, market))
+    return market[order], good[order], {name: column[order] for name, column in values.items()}
+
+class FlatTable:
+    """All observations as one set of columns; a query masks every row"""
+
+    def __init__(self, market: np.ndarray, good: np.ndarray, values: dict):
+        self.market, self.good, self.values = market, good, values
+
+    def history(self, market: int, good: int, start: float, end: float, points: int) -> np.ndarray:
+        t = self.values["time"]
+        rows = np.flatnonzero((self.market == market) & (self.good == good) & (t >= start) & (t <= end))
+        rows = rows[np.argsort(t[rows], kind="stable")]
+        times = t[rows]
+        if len(rows) <= points:
+            return self.values["purchasePrice"][rows].astype(np.float64)
+        edges = np.linspace(times[0], times[-1], points + 1)[1:-1]
+        buckets = np.searchsorted(edges, times, "right")
+        counts = np.bincount(buckets, minlength=points)
+        sums = np.bincount(buckets, self.values["purchasePrice"][rows], minlength=points)
+        return sums[counts > 0] / counts[counts > 0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--markets", type=int, default=2000)
+    parser.add_argument("--goods", type=int, default=10, help="goods traded at each market")
+    parser.add_argument("--polls", type=int, default=100, help="observations of each good at each market")
+    parser.add_argument("--period", type=float, default=300, help="seconds between polls of a market")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--points", type=int, default=50)
+    parser.add_argument("--records", type=int, default=5000, help="market responses to append one by one")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    start = 1.7e9
+    market, good, values = make_columns(rng, args.markets, args.goods, args.polls, start, args.period)
+    market_symbols = [f"X1-M{m}-A1" for m in range(args.markets)]
+    good_symbols = list(TRADE_GOODS)[:args.goods] + [f"GOOD_{g}" for g in range(len(TRADE_GOODS), args.goods)]
+
+    store = MarketHistory()
+    began = time.perf_counter()
+    store.extend(market_symbols, good_symbols, market, good, values)
+    elapsed = time.perf_counter() - began
+    stats = store.stats()
+    row_bytes = sum(np.dtype(dtype).itemsize for dtype in COLUMNS.values())
+    sample = {"market": "X1-M0-A1", "good": "FUEL", "time": start, "purchasePrice": 72, "sellPrice": 65,
+              "tradeVolume": 100, "supply": "MODERATE"}
+    dict_bytes = sys.getsizeof(sample) + sum(sys.getsizeof(value) for value in sample.values())
+    print(f"loaded {len(store)} observations of {stats['series']} series in {elapsed * 1000:.0f} ms; "
+          f"{stats['bytes'] / 2 ** 20:.0f} MiB allocated ({row_bytes} B/observation, "
+          f"~{dict_bytes * len(store) / 2 ** 20:.0f} MiB as dicts)")
+
+    end = start + args.polls * args.period
+    responses = []
+    for i in range(args.records):
+        m = i % args.markets
+        responses.append({"symbol": market_symbols[m], "tradeGoods": [
+            {"symbol": symbol, "purchasePrice": 100, "sellPrice": 90, "tradeVolume": 20, "supply": "HIGH"}
+            for symbol in good_symbols]})
+    began = time.perf_counter()
+    for i, response in enumerate(responses):
+        store.record(response, end + i)
+    elapsed = time.perf_counter() - began
+    print(f"record(): {args.records} market responses ({args.records * args.goods} observations) in "
+          f"{elapsed * 1000:.0f} ms ({elapsed / args.records * 1e6:.1f} us/response)")
+
+    flat = FlatTable(market, good, values)
+    picks = random.Random(2)
+    queries = [(picks.randrange(args.markets), picks.randrange(args.goods)) for _ in range(args.queries)]
+    for label, since in (("whole series", start), ("last tenth", end - (end - start) / 10)):
+        for m, g in queries[:50]:
+            a = [point["purchasePrice"] for point in store.history(market_symbols[m], good_symbols[g], since, end, args.points)]
+            b = flat.history(m, g, since, end, args.points)
+            assert np.allclose(a, np.round(b, 1), atol=0.051), (m, g)
+        for name, query in (
+            ("market history", lambda m, g: store.history(market_symbols[m], good_symbols[g], since, end, args.points)),
+            ("flat table", lambda m, g: flat.history(m, g, since, end, args.points)),
+        ):
+            began = time.perf_counter()
+            for m, g in queries:
+                query(m, g)
+            elapsed = time.perf_counter() - began
+            print(f"{name:<14} {label:<12} {args.queries} queries: {elapsed * 1000:.0f} ms "
+                  f"({elapsed / args.queries * 1000:.3f} ms/query)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "market_history.npz")
+        began = time.perf_counter()
+        store.save(path)
+        saved = time.perf_counter() - began
+        began = time.perf_counter()
+        loaded = MarketHistory(path)
+        loaded.load()
+        elapsed = time.perf_counter() - began
+        assert len(loaded) == len(store)
+        print(f"save {saved * 1000:.0f} ms, load {elapsed * 1000:.0f} ms ({os.path.getsize(path) / 2 ** 20:.0f} MiB file)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure what the /metrics instrumentation adds to each request.
+
+Calls a do-nothing ASGI app directly, with and without `MetricsMiddleware`
+in front of it, and a do-nothing httpx transport with and without
+`MetricsTransport`, so the difference is the instrumentation alone. Labels
+are spread over a realistic number of routes and ship symbols, then one
+scrape of the result is rendered:
+
+    python -m benchmarks.bench_metrics --requests 200000
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+
+from backend.metrics import MetricsMiddleware, MetricsRegistry, MetricsTransport
+
+ROUTES = [f"/api/ships/{{ship_symbol}}/action{i}" for i in range(60)]
+
+class _Route:
+    def __init__(self, path: str, endpoint):
+        self.path = path
+        self.endpoint = endpoint
+
+class _App:
+    """Stands in for the FastAPI app: routing has already put the matched endpoint in the scope"""
+
+    def __init__(self):
+        self.routes = [_Route(path, object()) for path in ROUTES]
+
+    async def __call__(self, scope, receive, send):
+        scope["endpoint"] = self.routes[scope["i"] % len(self.routes)].endpoint
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+class _Transport(httpx.AsyncBaseTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200)
+
+async def _receive():
+    return {"type": "http.request"}
+
+async def _send(message):
+    pass
+
+async def time_app(app, root, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "app": root}
+    start = time.perf_counter()
+    for i in range(requests):
+        scope["i"] = i
+        await app(scope, _receive, _send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+async def time_transport(transport, requests: List[httpx.Request]) -> float:
+    start = time.perf_counter()
+    for request in requests:
+        await transport.handle_async_request(request)
+    return (time.perf_counter() - start) / len(requests) * 1e6
+
+async def run(args):
+    registry = MetricsRegistry()
+    app = _App()
+    bare_us = await time_app(app, app, args.requests)
+    instrumented_us = await time_app(MetricsMiddleware(app, registry), app, args.requests)
+    print(f"{'middleware':<12}{bare_us:>8.2f} us bare  {instrumented_us:>8.2f} us instrumented  "
+          f"(+{instrumented_us - bare_us:.2f} us/request)")
+
+    base = "https://api.spacetraders.io/v2"
+    requests = [httpx.Request("GET", f"{base}/my/ships/SHIP-{i % args.ships}/cooldown") for i in range(args.requests)]
+    bare_us = await time_transport(_Transport(), requests)
+    instrumented_us = await time_transport(MetricsTransport(_Transport(), registry, base_url=base), requests)
+    print(f"{'transport':<12}{bare_us:>8.2f} us bare  {instrumented_us:>8.2f} us instrumented  "
+          f"(+{instrumented_us - bare_us:.2f} us/call)")
+
+    start = time.perf_counter()
+    lines = registry.render()
+    print(f"{'scrape':<12}{(time.perf_counter() - start) * 1000:>8.2f} ms for {len(lines)} lines")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--ships", type=int, default=500, help="distinct ship symbols in upstream paths")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
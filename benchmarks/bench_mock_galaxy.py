@@ -0,0 +1,62 @@
+"""Show demo-mode startup staying flat as the procedural mock galaxy grows.
+
+Times what utilities.py does at import in demo mode (build the generator and
+fleet, attach it to an in-memory galaxy store) against eagerly generating
+every system and saving all waypoints into the store, as the static mock data
+used to be seeded, then the first read of one system and a nearest-market
+query through the lazily filled store:
+
+    python -m benchmarks.bench_mock_galaxy --systems 2000 --waypoints 50 --ships 500
+"""
+import argparse
+import time
+
+from backend.galaxy_store import GalaxyStore
+from backend.mock_galaxy import MockGalaxy
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--systems", type=int, default=2000)
+    parser.add_argument("--waypoints", type=int, default=50, help="waypoints per generated system")
+    parser.add_argument("--ships", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    def lazy():
+        galaxy = MockGalaxy(args.seed, args.systems, args.waypoints, args.ships)
+        return galaxy, GalaxyStore(":memory:", source=galaxy)
+
+    def eager():
+        galaxy = MockGalaxy(args.seed, args.systems, args.waypoints, args.ships)
+        store = GalaxyStore(":memory:")
+        store.save_systems(galaxy.systems())
+        for symbol in galaxy.system_symbols:
+            store.save_waypoints(galaxy.waypoints(symbol))
+        return galaxy, store
+
+    (galaxy, store), lazy_ms = timed(lazy)
+    (_, eager_store), eager_ms = timed(eager)
+    print(f"galaxy: {args.systems} systems, {galaxy.waypoint_total} waypoints, {args.ships} ships")
+    print(f"{'lazy startup':<28}{lazy_ms:>10.1f} ms")
+    print(f"{'eager startup':<28}{eager_ms:>10.1f} ms  ({eager_store.waypoint_count()} waypoints stored)")
+
+    symbol = galaxy.system_symbols[len(galaxy.system_symbols) // 2]
+    _, first_ms = timed(lambda: store.waypoint_index(symbol))
+    _, query_ms = timed(lambda: store.nearest_waypoints(symbol, 0, 0, limit=3, trait="MARKETPLACE"))
+    _, walk_ms = timed(galaxy.systems)
+    print(f"{'first read of a system':<28}{first_ms:>10.1f} ms")
+    print(f"{'nearest markets after that':<28}{query_ms:>10.3f} ms")
+    print(f"{'generate every system':<28}{walk_ms:>10.1f} ms")
+
+    # Same seed, same galaxy
+    again = MockGalaxy(args.seed, args.systems, args.waypoints, args.ships)
+    assert again.waypoints(symbol) == galaxy.waypoints(symbol)
+    assert again.ships() == galaxy.ships()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare CPU per request of passthrough responses against response model validation.
+
+Runs the backend in live mode against the OpenAPI stand-in server, fills the
+fleet store with `--ships` ships and the galaxy store with `--systems`
+systems (copies of the stub's payloads), then times the event loop thread's
+CPU for `GET /api/ships`, `GET /api/systems` and an upstream-proxied waypoint
+page (served from the response cache after the first read) with
+`RESPONSE_PASSTHROUGH` on and off. Both modes must return the same data:
+
+    python -m benchmarks.bench_passthrough --ships 10 100 1000 5000 --systems 10000
+"""
+import argparse
+import asyncio
+import copy
+import os
+import time
+
+import httpx
+
+from .common import configure_live_backend, free_port, run_server
+
+async def cpu_ms(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    """Event loop thread CPU per request, in milliseconds"""
+    await client.get(path)
+    start = time.thread_time()
+    for _ in range(requests):
+        response = await client.get(path)
+        response.raise_for_status()
+    return (time.thread_time() - start) / requests * 1000
+
+async def run(args, url: str):
+    from backend.main import app
+    from backend.models import Ship, System, Waypoint
+    from backend.routers import core, ships
+    from backend.utilities import fleet_store, galaxy_store
+
+    def passthrough(enabled: bool) -> None:
+        core.RESPONSE_PASSTHROUGH = ships.RESPONSE_PASSTHROUGH = enabled
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://backend", timeout=60) as client:
+        async with httpx.AsyncClient(headers={"Authorization": "Bearer benchmark-token"}) as upstream:
+            template_ship = (await upstream.get(f"{url}/my/ships")).json()["data"][0]
+            template_system = (await upstream.get(f"{url}/systems")).json()["data"][0]
+        system_symbol = template_system["symbol"]
+        galaxy_store.save_systems(dict(copy.deepcopy(template_system), symbol=f"X1-B{n}", x=n, y=-n)
+                                  for n in range(args.systems))
+
+        routes = [(f"GET /api/ships ({size} ships)", "/api/ships", Ship, size) for size in args.ships] + [
+            (f"GET /api/systems ({args.systems} systems)", "/api/systems", System, args.systems),
+            ("GET /api/systems/{symbol}/waypoints (upstream page)", f"/api/systems/{system_symbol}/waypoints", Waypoint, 1),
+        ]
+        print(f"{'route':<52} {'validated ms':>13} {'passthrough ms':>15} {'speedup':>8}")
+        for label, path, model, size in routes:
+            if path == "/api/ships":
+                fleet_store.replace(dict(copy.deepcopy(template_ship), symbol=f"SHIP-{n}") for n in range(size))
+            # Fewer requests for the bigger payloads
+            requests = max(5, args.requests * 100 // max(100, size))
+            passthrough(False)
+            validated = await cpu_ms(client, path, requests)
+            expected = (await client.get(path)).json()
+            passthrough(True)
+            fast = await cpu_ms(client, path, requests)
+            actual = (await client.get(path)).json()
+            # Passthrough keeps the fields the models don't declare (a ship's fuel and cooldown, ...)
+            assert [model.model_validate(item).model_dump(mode="json") for item in actual] == expected, label
+            print(f"{label:<52} {validated:>13.3f} {fast:>15.3f} {validated / fast:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ships", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--systems", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route at 100 ships or fewer")
+    args = parser.parse_args()
+
+    os.environ["GALAXY_DB_PATH"] = ":memory:"
+    os.environ["FLEET_SYNC_INTERVAL"] = "3600"
+    from .openapi_stub import create_openapi_stub_app
+
+    with run_server(create_openapi_stub_app(), free_port()) as url:
+        configure_live_backend(url)
+        asyncio.run(run(args, url))
+
+if __name__ == "__main__":
+    main()
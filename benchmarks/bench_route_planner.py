@@ -0,0 +1,106 @@
+"""Time fuel-aware route planning on a synthetic 10k-waypoint system.
+
+Scatters N waypoints (a share of them MARKETPLACEs) over one system, times
+building the system's market graph once, then plans routes between random
+pairs for a ship whose tank can't cross the system in one hop, and checks each
+route's duration against a plain heap-based Dijkstra over the same hop costs:
+
+    python -m benchmarks.bench_route_planner --waypoints 10000 --market-share 0.1
+"""
+import argparse
+import heapq
+import random
+import time
+
+import numpy as np
+
+from backend.galaxy_store import GalaxyStore
+from backend.route_planner import FLIGHT_MODES, RoutePlanner, best_hops, summarize_route
+from .common import summarize
+
+def build_system(waypoint_count: int, market_share: float, seed: int):
+    rng = random.Random(seed)
+    return [
+        {"symbol": f"X1-R1-W{i}", "systemSymbol": "X1-R1", "type": "PLANET",
+         "x": rng.randint(-800, 800), "y": rng.randint(-800, 800),
+         "traits": [{"symbol": "MARKETPLACE"}] if rng.random() < market_share else []}
+        for i in range(waypoint_count)
+    ]
+
+def reference_duration(waypoints, origin, destination, fuel, capacity, speed):
+    """Fastest total duration by textbook Dijkstra over origin, destination and markets"""
+    by_symbol = {w["symbol"]: w for w in waypoints}
+    markets = [w for w in waypoints if w["traits"] and w["symbol"] not in (origin, destination)]
+    nodes = [by_symbol[origin], by_symbol[destination]] + markets
+    xs = np.array([w["x"] for w in nodes], dtype=float)
+    ys = np.array([w["y"] for w in nodes], dtype=float)
+    distances = np.hypot(xs[:, None] - xs[None, :], ys[:, None] - ys[None, :])
+    available = np.full((len(nodes), 1), float(capacity))
+    if not nodes[0]["traits"]:
+        available[0] = fuel
+    seconds = best_hops(distances, available, capacity, speed, list(FLIGHT_MODES))[0]
+
+    best = {0: 0.0}
+    heap = [(0.0, 0)]
+    while heap:
+        cost, node = heapq.heappop(heap)
+        if node == 1:
+            return cost
+        if cost > best.get(node, float("inf")):
+            continue
+        for neighbour in range(len(nodes)):
+            step = seconds[node, neighbour]
+            if np.isfinite(step) and cost + step < best.get(neighbour, float("inf")):
+                best[neighbour] = cost + step
+                heapq.heappush(heap, (cost + step, neighbour))
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--waypoints", type=int, default=10000)
+    parser.add_argument("--market-share", type=float, default=0.1)
+    parser.add_argument("--routes", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=400)
+    parser.add_argument("--speed", type=int, default=30)
+    parser.add_argument("--check", type=int, default=10, help="routes to verify against the reference Dijkstra")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    waypoints = build_system(args.waypoints, args.market_share, args.seed)
+    store = GalaxyStore(":memory:")
+    store.save_waypoints(waypoints)
+    planner = RoutePlanner(store)
+    markets = sum(1 for w in waypoints if w["traits"])
+    print(f"{len(waypoints)} waypoints, {markets} marketplaces, tank {args.capacity}, engine speed {args.speed}")
+
+    store.waypoint_index("X1-R1", "MARKETPLACE")
+    start = time.perf_counter()
+    planner.graph("X1-R1", args.capacity, args.speed, list(FLIGHT_MODES))
+    print(f"market graph build (once per system and ship profile): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    pairs = [tuple(rng.sample(waypoints, 2)) for _ in range(args.routes)]
+    timings, routes = [], []
+    for origin, destination in pairs:
+        start = time.perf_counter()
+        hops = planner.plan(origin, destination, args.capacity // 2, args.capacity, args.speed)
+        timings.append((time.perf_counter() - start) * 1000)
+        routes.append(hops)
+
+    stats = summarize(timings)
+    reachable = [summarize_route(hops) for hops in routes if hops is not None]
+    print(f"plan_route: p50 {stats['p50']:.1f} ms, p95 {stats['p95']:.1f} ms, p99 {stats['p99']:.1f} ms")
+    if reachable:
+        print(f"routes: {len(reachable)}/{len(routes)} reachable, "
+              f"avg {sum(len(r['hops']) for r in reachable) / len(reachable):.1f} hops, "
+              f"avg {sum(r['refuelStops'] for r in reachable) / len(reachable):.1f} refuel stops")
+
+    for (origin, destination), hops in list(zip(pairs, routes))[:args.check]:
+        expected = reference_duration(waypoints, origin["symbol"], destination["symbol"],
+                                      args.capacity // 2, args.capacity, args.speed)
+        got = None if hops is None else summarize_route(hops)["totalDuration"]
+        assert got == expected, (origin["symbol"], destination["symbol"], got, expected)
+    print(f"first {args.check} routes match the reference Dijkstra")
+
+if __name__ == "__main__":
+    main()
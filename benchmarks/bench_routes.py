@@ -0,0 +1,385 @@
+"""Load-test every backend route and fail on regressions against a stored baseline.
+
+Drives each API route of every router in `backend/routers/` through the ASGI
+app at a fixed concurrency and reports throughput, p50/p95/p99 latency, the
+error rate and upstream calls per request. `--mode demo` serves the mock
+galaxy. `--mode live` makes the backend use its real SpaceTraders code
+path. Both modes point the backend at the OpenAPI stand-in server
+(`benchmarks.openapi_stub`), so demo mode's few upstream reads stay local,
+and count the requests it receives.
+
+Results are compared with `benchmarks/baselines/routes_<mode>.json`. The run
+exits non-zero when a route's p95 or throughput worsens by more than
+`--tolerance`, or when its error rate or upstream calls per request rise:
+
+    python -m benchmarks.bench_routes --mode demo --requests 200 --concurrency 16
+    python -m benchmarks.bench_routes --mode live --latency uniform:0.005,0.02
+    python -m benchmarks.bench_routes --mode demo --save-baseline   # after an intended change
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Union
+
+import httpx
+
+from .common import configure_live_backend, free_port, run_server, summarize
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Routes deliberately left out, and why
+EXCLUDED = {
+    ("GET", "/api/ships/stream"): "an SSE stream that never completes",
+    ("POST", "/api/systems/crawl"): "starts a background crawl that would skew every other route",
+}
+
+class Scenario:
+    """Requests for one route. `{ship}`-style placeholders are filled from the run context.
+
+    When `path` or `body` is a list, request i uses entry i modulo its length,
+    e.g. to move cargo back and forth between two ships.
+    """
+
+    def __init__(self, method: str, route: str, path: Union[str, List[str]], body=None,
+                 expect: Sequence[int] = (200,)):
+        self.method = method
+        self.route = route
+        self.paths = path if isinstance(path, list) else [path]
+        self.bodies = body if isinstance(body, list) else [body]
+        self.expect = set(expect)
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}"
+
+    def request(self, i: int, context: Dict[str, str]):
+        return self.method, _fill(self.paths[i % len(self.paths)], context), _fill(self.bodies[i % len(self.bodies)], context)
+
+def _fill(value, context: Dict[str, str]):
+    if isinstance(value, str):
+        return value.format(**context)
+    if isinstance(value, dict):
+        return {key: _fill(item, context) for key, item in value.items()}
+    return value
+
+DEACTIVATE = {"action": "deactivate"}
+SHIPS = "/api/ships/{ship}"
+
+# Ordered so ship actions leave the ship in the state the next one needs (dock before refuel)
+SCENARIOS = [
+    # core
+    Scenario("GET", "/", "/"),
+    Scenario("GET", "/api/status", "/api/status"),
+    Scenario("GET", "/api/info", "/api/info"),
+    Scenario("GET", "/api/agent", "/api/agent"),
+    Scenario("GET", "/api/factions", "/api/factions"),
+    Scenario("GET", "/api/systems", "/api/systems"),
+    Scenario("GET", "/api/systems/{system_symbol}", "/api/systems/{system}"),
+    Scenario("GET", "/api/systems/{system_symbol}/waypoints", "/api/systems/{system}/waypoints"),
+    Scenario("GET", "/api/systems/crawl", "/api/systems/crawl"),
+    # galaxy and route
+    Scenario("GET", "/api/galaxy/stats", "/api/galaxy/stats"),
+    Scenario("GET", "/api/galaxy/waypoints/{waypoint_symbol}", "/api/galaxy/waypoints/{waypoint}"),
+    Scenario("GET", "/api/galaxy/waypoints/nearest", "/api/galaxy/waypoints/nearest?waypoint={waypoint}&limit=5"),
+    Scenario("GET", "/api/galaxy/systems/nearest", "/api/galaxy/systems/nearest?system={system}&limit=5"),
+    Scenario("GET", "/api/route", "/api/route?origin={waypoint}&to={waypoint2}&capacity=100&speed=30", expect=(200, 422)),
+    # fleet
+    Scenario("GET", "/api/ships", "/api/ships"),
+    Scenario("GET", "/api/ships/{ship_symbol}", SHIPS),
+    Scenario("POST", "/api/ships/{ship_symbol}/navigate", SHIPS + "/navigate", {"waypointSymbol": "{waypoint2}"}),
+    Scenario("POST", "/api/ships/{ship_symbol}/orbit", SHIPS + "/orbit"),
+    Scenario("POST", "/api/ships/{ship_symbol}/dock", SHIPS + "/dock"),
+    Scenario("POST", "/api/ships/{ship_symbol}/refuel", SHIPS + "/refuel", {}),
+    Scenario("GET", "/api/ships/{ship_symbol}/repair", SHIPS + "/repair"),
+    Scenario("POST", "/api/ships/{ship_symbol}/repair", SHIPS + "/repair"),
+    Scenario("POST", "/api/ships/{ship_symbol}/transfer",
+             [SHIPS + "/transfer", "/api/ships/{ship2}/transfer"],
+             [{"tradeSymbol": "{cargo}", "units": 1, "shipSymbol": "{ship2}"},
+              {"tradeSymbol": "{cargo}", "units": 1, "shipSymbol": "{ship}"}]),
+    Scenario("POST", "/api/ships/batch", "/api/ships/batch",
+             {"actions": [{"shipSymbol": "{ship}", "action": "orbit"}, {"shipSymbol": "{ship2}", "action": "orbit"}]}),
+    # In orbit at waypoint2's deposits; extracting fills the hold (400 once full) and the ship isn't docked at a market
+    Scenario("POST", "/api/ships/{ship_symbol}/extract", SHIPS + "/extract", {}, expect=(200, 400)),
+    Scenario("POST", "/api/ships/{ship_symbol}/jettison", SHIPS + "/jettison", {"symbol": "{cargo}", "units": 1}, expect=(200, 400)),
+    Scenario("POST", "/api/ships/{ship_symbol}/sell", SHIPS + "/sell", {"symbol": "{cargo}", "units": 1}, expect=(200, 400)),
+    Scenario("POST", "/api/ships/{ship_symbol}/purchase", SHIPS + "/purchase", {"symbol": "{cargo}", "units": 1}, expect=(200, 400)),
+    # security
+    Scenario("GET", "/api/ships/{ship_symbol}/security/status", SHIPS + "/security/status"),
+    Scenario("GET", "/api/ships/security/status", "/api/ships/security/status?symbols={ship},{ship2}"),
+    *[
+        Scenario("POST", f"/api/ships/{{ship_symbol}}/security/{system}", f"{SHIPS}/security/{system}", DEACTIVATE)
+        for system in ("cloaking", "jamming", "electronic-warfare", "stealth-mode", "countermeasures", "encryption")
+    ],
+    Scenario("POST", "/api/ships/{ship_symbol}/security/recharge-countermeasures", SHIPS + "/security/recharge-countermeasures"),
+    # scanning
+    Scenario("POST", "/api/ships/{ship_symbol}/scan/systems", SHIPS + "/scan/systems"),
+    Scenario("POST", "/api/ships/{ship_symbol}/scan/waypoints", SHIPS + "/scan/waypoints"),
+    Scenario("POST", "/api/ships/{ship_symbol}/scan/ships", SHIPS + "/scan/ships"),
+    Scenario("POST", "/api/ships/{ship_symbol}/survey", SHIPS + "/survey"),
+    Scenario("GET", "/api/ships/{ship_symbol}/cooldown", SHIPS + "/cooldown", expect=(200, 204)),
+    # surveys: the survey scenario stored some of waypoint2, where the ship is
+    Scenario("GET", "/api/surveys", "/api/surveys"),
+    Scenario("GET", "/api/surveys/best", "/api/surveys/best?waypoint={waypoint2}", expect=(200, 404)),
+    Scenario("GET", "/api/surveys/stats", "/api/surveys/stats"),
+    # markets: polling one market records its prices for the reads; background polling is stopped right away
+    Scenario("POST", "/api/markets/{waypoint_symbol}/poll", "/api/markets/{waypoint}/poll", expect=(200, 404)),
+    Scenario("GET", "/api/markets", "/api/markets"),
+    Scenario("GET", "/api/markets/{waypoint_symbol}", "/api/markets/{waypoint}", expect=(200, 404)),
+    Scenario("GET", "/api/markets/{waypoint_symbol}/history", "/api/markets/{waypoint}/history?good={cargo}", expect=(200, 404)),
+    Scenario("POST", "/api/markets/poll", "/api/markets/poll"),
+    Scenario("GET", "/api/markets/poll", "/api/markets/poll"),
+    Scenario("DELETE", "/api/markets/poll", "/api/markets/poll"),
+    # trade: across every system with prices, then from the ship
+    Scenario("GET", "/api/trade/routes", ["/api/trade/routes?units=40&speed=30&fuelCapacity=400",
+                                          "/api/trade/routes?ship={ship}"]),
+    # contracts: demo deliveries are refused (the ship holds none of the goods); the first start begins a
+    # delivery job (later ones are 409s) that the stop scenario ends
+    Scenario("GET", "/api/contracts", "/api/contracts"),
+    Scenario("GET", "/api/contracts/plans", ["/api/contracts/plans", "/api/contracts/plans?ship={ship}&timeValue=3600"]),
+    Scenario("GET", "/api/contracts/deliveries", "/api/contracts/deliveries"),
+    Scenario("GET", "/api/contracts/{contract_id}", "/api/contracts/{contract}"),
+    Scenario("GET", "/api/contracts/{contract_id}/plan", "/api/contracts/{contract}/plan?ship={ship}"),
+    Scenario("POST", "/api/contracts/{contract_id}/accept", "/api/contracts/{contract}/accept", expect=(200, 400)),
+    Scenario("POST", "/api/contracts/{contract_id}/deliver", "/api/contracts/{contract}/deliver",
+             {"shipSymbol": "{ship}", "tradeSymbol": "{cargo}", "units": 1}, expect=(200, 400)),
+    Scenario("POST", "/api/contracts/{contract_id}/fulfill", "/api/contracts/{contract}/fulfill", expect=(200, 400)),
+    Scenario("POST", "/api/contracts/{contract_id}/start", "/api/contracts/{contract}/start", {"shipSymbol": "{ship2}"},
+             expect=(200, 409)),
+    Scenario("POST", "/api/contracts/{contract_id}/stop", "/api/contracts/{contract}/stop"),
+    Scenario("GET", "/api/contracts/{contract_id}/delivery", "/api/contracts/{contract}/delivery"),
+    # scheduler: queueing real actions would keep firing them for the rest of the run, so only the error paths
+    Scenario("POST", "/api/ships/{ship_symbol}/schedule", SHIPS + "/schedule", {"action": "unknown"}, expect=(400,)),
+    Scenario("GET", "/api/ships/{ship_symbol}/schedule", SHIPS + "/schedule"),
+    Scenario("DELETE", "/api/ships/{ship_symbol}/schedule/{action_id}", SHIPS + "/schedule/0", expect=(404,)),
+    Scenario("GET", "/api/scheduler/stats", "/api/scheduler/stats"),
+    # mining: the first start begins a loop (later ones are 409s) that the stop scenario ends
+    Scenario("POST", "/api/mining/{ship_symbol}/start", "/api/mining/{ship}/start", {"marketWaypoint": "{market}"},
+             expect=(200, 409)),
+    Scenario("GET", "/api/mining/{ship_symbol}/status", "/api/mining/{ship}/status"),
+    Scenario("POST", "/api/mining/{ship_symbol}/stop", "/api/mining/{ship}/stop"),
+    Scenario("GET", "/api/mining/status", "/api/mining/status"),
+    # resources
+    Scenario("GET", "/api/ships/{ship_symbol}/resources", SHIPS + "/resources"),
+    Scenario("POST", "/api/ships/{ship_symbol}/resources/{action}", SHIPS + "/resources/balance-power", {"mode": "normal"}),
+    Scenario("GET", "/api/ships/{ship_symbol}/resource-efficiency", SHIPS + "/resource-efficiency"),
+    Scenario("POST", "/api/ships/{ship_symbol}/emergency-protocol", SHIPS + "/emergency-protocol"),
+    # crew
+    Scenario("GET", "/api/crew/available", "/api/crew/available"),
+    Scenario("GET", "/api/ships/{ship_symbol}/crew", SHIPS + "/crew"),
+    # The upstream API (and so the stub) has no crew endpoints: live mode passes on its 404 for hire and dismiss
+    Scenario("POST", "/api/ships/{ship_symbol}/crew/hire", SHIPS + "/crew/hire", {"hireableCrewId": "hire_001"},
+             expect=(200, 404)),
+    Scenario("POST", "/api/ships/{ship_symbol}/crew/{crew_symbol}/dismiss", SHIPS + "/crew/CREW_001/dismiss",
+             expect=(200, 404)),
+    # combat
+    *[
+        Scenario("POST", f"/api/ships/{{ship_symbol}}/combat/{system}", f"{SHIPS}/combat/{system}", {"action": action, "target": "{ship2}"})
+        for system, action in (("weapons", "arm"), ("shields", "raise"), ("target", "acquire"), ("evasive", "engage"),
+                               ("point-defense", "activate"), ("missiles", "launch"))
+    ],
+    Scenario("GET", "/api/ships/{ship_symbol}/combat/status", SHIPS + "/combat/status"),
+    # modifications: each install is undone by a later remove, so the ship doesn't grow without bound
+    Scenario("GET", "/api/equipment", "/api/equipment"),
+    Scenario("GET", "/api/equipment/{component_type}", "/api/equipment/modules"),
+    Scenario("GET", "/api/ships/{ship_symbol}/modification-info", SHIPS + "/modification-info"),
+    Scenario("POST", "/api/ships/{ship_symbol}/install", SHIPS + "/install",
+             {"shipSymbol": "{ship}", "componentType": "modules", "componentSymbol": "MODULE_CARGO_HOLD_I", "action": "install"}),
+    Scenario("POST", "/api/ships/{ship_symbol}/remove", SHIPS + "/remove",
+             {"shipSymbol": "{ship}", "componentType": "modules", "componentSymbol": "MODULE_CARGO_HOLD_I", "action": "remove"}),
+    Scenario("POST", "/api/ships/{ship_symbol}/customize", SHIPS + "/customize", {"shipSymbol": "{ship}", "color": "red"}),
+    # upstream
+    Scenario("GET", "/api/upstream/stats", "/api/upstream/stats"),
+    Scenario("GET", "/metrics", "/metrics"),
+    Scenario("GET", "/api/debug/traces", "/api/debug/traces"),
+    Scenario("GET", "/api/debug/traces/{trace_id}", "/api/debug/traces/0", expect=(404,)),
+]
+
+def uncovered_routes(app) -> List[str]:
+    """API routes from backend/routers (and main) with no scenario and no exclusion"""
+    from fastapi.routing import APIRoute
+
+    covered = {(scenario.method, scenario.route) for scenario in SCENARIOS} | set(EXCLUDED)
+    missing = []
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            for method in sorted(route.methods):
+                if (method, route.path) not in covered:
+                    missing.append(f"{method} {route.path}")
+    return missing
+
+async def discover(client: httpx.AsyncClient, mode: str) -> Dict[str, str]:
+    """Ship, system, waypoint and cargo symbols the scenarios act on"""
+    if mode == "demo":
+        return {"ship": "DEMO_SHIP_1", "ship2": "DEMO_SHIP_2", "system": "X1-DF55",
+                "waypoint": "X1-DF55-20250X", "waypoint2": "X1-DF55-20250Y", "cargo": "FUEL",
+                "contract": "demo-contract-1", "market": "X1-DF55-20250X"}
+    ships = (await client.get("/api/ships")).json()
+    system = ships[0]["nav"]["systemSymbol"]
+    # Reading the waypoints also fills the local galaxy store for the galaxy and route scenarios
+    waypoints = (await client.get(f"/api/systems/{system}/waypoints")).json()
+    cargo = next((item["symbol"] for item in ships[0]["cargo"]["inventory"]), "FUEL")
+    contract = (await client.get("/api/contracts")).json()["data"][0]["id"]
+    await store_stub_system(system)
+    return {"ship": ships[0]["symbol"], "ship2": ships[1]["symbol"], "system": system,
+            "waypoint": waypoints[0]["symbol"], "waypoint2": waypoints[1]["symbol"], "cargo": cargo,
+            "contract": contract, "market": await stub_marketplace(system)}
+
+async def store_stub_system(system: str) -> None:
+    """Put the ship's system in the local galaxy store, which live mode only fills from a crawl (never run here)"""
+    from backend.utilities import galaxy_store
+    headers = {"Authorization": f"Bearer {os.environ['SPACETRADERS_TOKEN']}"}
+    async with httpx.AsyncClient(base_url=os.environ["SPACETRADERS_API_URL"], headers=headers) as stub:
+        data = (await stub.get(f"/systems/{system}")).json()["data"]
+    # The stub's payloads are random, so its symbol is set to the one asked for
+    galaxy_store.save_systems([dict(data, symbol=system)])
+
+async def stub_marketplace(system: str) -> str:
+    """A waypoint the stub upstream reports a marketplace at (its traits are random per path), for mining to sell at"""
+    headers = {"Authorization": f"Bearer {os.environ['SPACETRADERS_TOKEN']}"}
+    async with httpx.AsyncClient(base_url=os.environ["SPACETRADERS_API_URL"], headers=headers) as stub:
+        for n in range(1000):
+            symbol = f"{system}-M{n}"
+            waypoint = (await stub.get(f"/systems/{system}/waypoints/{symbol}")).json()["data"]
+            if any(trait["symbol"] == "MARKETPLACE" for trait in waypoint["traits"]):
+                return symbol
+    raise RuntimeError(f"stub upstream reports no marketplace in {system}")
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, context: Dict[str, str],
+                requests: int, concurrency: int, upstream_count) -> dict:
+    samples: List[float] = []
+    errors: Dict[int, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        method, path, body = scenario.request(i, context)
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            samples.append((time.perf_counter() - start) * 1000)
+        if response.status_code not in scenario.expect:
+            errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+    before = upstream_count()
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    stats = summarize(samples)
+    return {
+        "rps": round(requests / elapsed, 1),
+        "p50": round(stats["p50"], 3),
+        "p95": round(stats["p95"], 3),
+        "p99": round(stats["p99"], 3),
+        "errorRate": round(sum(errors.values()) / requests, 4),
+        "errors": {str(code): count for code, count in sorted(errors.items())},
+        "upstreamPerRequest": round((upstream_count() - before) / requests, 3),
+    }
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float, slack_ms: float) -> List[str]:
+    """Regressions of `results` against `baseline`, as messages; a route the baseline lacks counts as one"""
+    regressions = []
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            regressions.append(f"{name}: not in the baseline (save one with --save-baseline)")
+            continue
+        if now["p95"] > before["p95"] * (1 + tolerance) + slack_ms:
+            regressions.append(f"{name}: p95 {before['p95']:.2f} -> {now['p95']:.2f} ms")
+        if now["rps"] * (1 + tolerance) < before["rps"] and now["p95"] > slack_ms:
+            regressions.append(f"{name}: throughput {before['rps']:.0f} -> {now['rps']:.0f} req/s")
+        if now["errorRate"] > before["errorRate"] + 0.01:
+            regressions.append(f"{name}: error rate {before['errorRate']:.1%} -> {now['errorRate']:.1%} {now['errors']}")
+        if now["upstreamPerRequest"] > before["upstreamPerRequest"] + 0.01:
+            regressions.append(f"{name}: upstream calls/request {before['upstreamPerRequest']} -> {now['upstreamPerRequest']}")
+    return regressions
+
+async def run(args, upstream_count) -> Dict[str, dict]:
+    from backend.main import app
+
+    missing = uncovered_routes(app)
+    if missing:
+        print("routes without a scenario: " + ", ".join(missing))
+    # Keep purchase routes (install, customize, hire) from running the demo agent dry; the
+    # modification routes charge it in live mode too
+    from backend.mock_data import MOCK_AGENT
+    MOCK_AGENT["credits"] = 10 ** 12
+
+    scenarios = [s for s in SCENARIOS if not args.routes or any(part in s.name for part in args.routes)]
+    results = {}
+    async with app.router.lifespan_context(app):
+        # A handler that raises shows up as a 500 for that route instead of ending the run
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend", timeout=60) as client:
+            context = await discover(client, args.mode)
+            for scenario in scenarios:
+                # One warm-up request, then the measured run
+                method, path, body = scenario.request(0, context)
+                await client.request(method, path, json=body)
+                # Keep the best of several runs so one stall (e.g. a cache entry expiring) isn't read as a regression
+                runs = [await drive(client, scenario, context, args.requests, args.concurrency, upstream_count)
+                        for _ in range(args.repeat)]
+                results[scenario.name] = min(runs, key=lambda stats: stats["p95"])
+    return results
+
+def report(results: Dict[str, dict]) -> None:
+    width = max(len(name) for name in results)
+    print(f"{'route':<{width}} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'up/req':>7}")
+    for name, stats in results.items():
+        print(f"{name:<{width}} {stats['rps']:>9.0f} {stats['p50']:>8.2f} {stats['p95']:>8.2f} {stats['p99']:>8.2f} "
+              f"{stats['errorRate']:>7.1%} {stats['upstreamPerRequest']:>7.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["demo", "live"], default="demo")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per route; the best is reported")
+    parser.add_argument("--routes", nargs="*", help="only routes whose name contains one of these")
+    parser.add_argument("--latency", default="0", help="stub upstream latency (see benchmarks.openapi_stub)")
+    parser.add_argument("--baseline", type=Path, help="defaults to benchmarks/baselines/routes_<mode>.json")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="allowed relative p95/throughput regression (1.0 = twice as slow)")
+    parser.add_argument("--slack-ms", type=float, default=2.0, help="absolute p95 slack for sub-millisecond routes")
+    args = parser.parse_args()
+    baseline_path = args.baseline or BASELINE_DIR / f"routes_{args.mode}.json"
+
+    # Two ships are needed to transfer cargo; an in-memory galaxy store keeps runs independent
+    os.environ["MOCK_GALAXY_SHIPS"] = "2"
+    os.environ["GALAXY_DB_PATH"] = ":memory:"
+    # A periodic fleet re-read mid-run would replace the ship that install/remove just changed
+    os.environ["FLEET_SYNC_INTERVAL"] = "3600"
+    from .openapi_stub import create_openapi_stub_app, parse_latency
+
+    stub = create_openapi_stub_app(latency=parse_latency(args.latency))
+    with run_server(stub, free_port()) as url:
+        configure_live_backend(url)
+        if args.mode == "demo":
+            os.environ["SPACETRADERS_TOKEN"] = "demo_token_for_testing"
+        results = asyncio.run(run(args, lambda: stub.state.request_count))
+
+    report(results)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(exist_ok=True)
+        routes = results
+        if args.routes and baseline_path.exists():
+            # A run limited with --routes updates those routes and keeps the rest of the baseline
+            routes = dict(json.loads(baseline_path.read_text())["routes"], **results)
+        baseline_path.write_text(json.dumps({"mode": args.mode, "requests": args.requests,
+                                             "concurrency": args.concurrency, "routes": routes}, indent=2) + "\n")
+        print(f"baseline saved to {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --save-baseline to create one")
+        return
+    regressions = compare(results, json.loads(baseline_path.read_text())["routes"], args.tolerance, args.slack_ms)
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    if regressions:
+        sys.exit(1)
+    print(f"no regressions against {baseline_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Show the security engine costing nothing between reads, against a per-second tick loop.
+
+Gives `--ships` ships timed cloaks, countermeasures and stealth, then times
+what a tick loop counting every ship's cooldowns and effects down once a
+second spends per tick (as the old static `cloakingCooldown` would need to
+mean anything), against the engine, which only stores expiry times and
+works status out on read. Also times single and batched status reads:
+
+    python -m benchmarks.bench_security_engine --ships 100000 --batch 100
+"""
+import argparse
+import random
+import time
+
+from backend.security_engine import SecurityEngine
+
+def tick(statuses: dict) -> None:
+    """One second of a tick loop over per-ship counters"""
+    for status in statuses.values():
+        if status["cloakingRemaining"] > 0:
+            status["cloakingRemaining"] -= 1
+            if status["cloakingRemaining"] == 0:
+                status["cloakingActive"] = False
+                status["cloakingCooldown"] = 120
+                status["energyConsumption"] -= 25
+        elif status["cloakingCooldown"]:
+            status["cloakingCooldown"] -= 1
+        if status["countermeasuresRemaining"] > 0:
+            status["countermeasuresRemaining"] -= 1
+            status["countermeasuresActive"] = status["countermeasuresRemaining"] > 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ships", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--reads", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    clock = [0.0]
+    engine = SecurityEngine(clock=lambda: clock[0])
+    symbols = [f"SHIP-{n}" for n in range(args.ships)]
+    start = time.perf_counter()
+    for symbol in symbols:
+        engine.cloaking(symbol, True, rng.randint(60, 600))
+        engine.countermeasures(symbol, True)
+        engine.stealth_mode(symbol, True)
+    setup_us = (time.perf_counter() - start) / args.ships * 1e6
+    statuses = {symbol: {"cloakingActive": True, "cloakingRemaining": rng.randint(60, 600), "cloakingCooldown": None,
+                         "countermeasuresActive": True, "countermeasuresRemaining": 180, "energyConsumption": 35}
+                for symbol in symbols}
+
+    start = time.perf_counter()
+    tick(statuses)
+    tick_ms = (time.perf_counter() - start) * 1000
+    print(f"{args.ships} ships with active effects (activating three systems: {setup_us:.1f} us per ship)")
+    print(f"tick loop: {tick_ms:.1f} ms of every second ({tick_ms / 10:.1f}% of a core); engine: nothing between reads")
+
+    clock[0] = 300.0
+    sample = rng.sample(symbols, min(args.reads, args.ships))
+    start = time.perf_counter()
+    for symbol in sample:
+        engine.status(symbol)
+    single_us = (time.perf_counter() - start) / len(sample) * 1e6
+    batches = [sample[i:i + args.batch] for i in range(0, len(sample), args.batch)]
+    start = time.perf_counter()
+    for batch in batches:
+        engine.statuses(batch)
+    batch_us = (time.perf_counter() - start) / len(batches) * 1e6
+    print(f"status read: {single_us:.2f} us; batch of {args.batch}: {batch_us:.0f} us ({batch_us / args.batch:.2f} us per ship)")
+
+    # Reads worked out from the stored times agree with the clock
+    symbol = symbols[0]
+    until = engine.ships[symbol].cloaking_until
+    clock[0] = until + 1
+    status = engine.status(symbol)
+    assert not status["cloakingActive"] and status["cloakingCooldown"] == 119, status
+    assert len(engine.ships) == args.ships
+
+if __name__ == "__main__":
+    main()
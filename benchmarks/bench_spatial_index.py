@@ -0,0 +1,88 @@
+"""Time nearest-waypoint and nearest-system queries against a galaxy-sized store.
+
+Builds a temporary GalaxyStore with N systems of M waypoints each (a share of
+them MARKETPLACEs), then times warm grid-index lookups and checks each answer
+against a brute-force scan:
+
+    python -m benchmarks.bench_spatial_index --systems 10000 --waypoints 50
+"""
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+
+from backend.galaxy_store import GalaxyStore
+
+def build_store(path: str, system_count: int, waypoints_per_system: int, seed: int) -> GalaxyStore:
+    rng = random.Random(seed)
+    store = GalaxyStore(path)
+    systems, waypoints = [], []
+    for i in range(system_count):
+        symbol = f"X1-S{i}"
+        systems.append({"symbol": symbol, "sectorSymbol": "X1", "type": "RED_STAR",
+                        "x": rng.randint(-40000, 40000), "y": rng.randint(-40000, 40000), "waypoints": [], "factions": []})
+        for j in range(waypoints_per_system):
+            traits = [{"symbol": "MARKETPLACE"}] if rng.random() < 0.2 else []
+            waypoints.append({"symbol": f"{symbol}-W{j}", "systemSymbol": symbol, "type": "PLANET",
+                              "x": rng.randint(-800, 800), "y": rng.randint(-800, 800), "traits": traits})
+    store.save_systems(systems)
+    store.save_waypoints(waypoints)
+    return store
+
+def brute_force(points, x, y, limit):
+    return sorted(math.hypot(px - x, py - y) for px, py in points)[:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--systems", type=int, default=10000)
+    parser.add_argument("--waypoints", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        store = build_store(os.path.join(workdir, "galaxy.sqlite3"), args.systems, args.waypoints, args.seed)
+        print(f"loaded {store.system_count()} systems / {store.waypoint_count()} waypoints "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        symbols = store.system_symbols()
+        sample = rng.sample(symbols, min(len(symbols), 200))
+        start = time.perf_counter()
+        for symbol in sample:
+            store.waypoint_index(symbol)
+        print(f"cold waypoint index build: {(time.perf_counter() - start) / len(sample) * 1e6:.0f} us per system")
+        start = time.perf_counter()
+        store.system_index()
+        print(f"system index build: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        queries = [(rng.choice(sample), rng.randint(-800, 800), rng.randint(-800, 800)) for _ in range(args.queries)]
+        start = time.perf_counter()
+        for system, x, y in queries:
+            store.nearest_waypoints(system, x, y, limit=args.limit, trait="MARKETPLACE")
+        per_query = (time.perf_counter() - start) / len(queries) * 1e6
+        print(f"nearest {args.limit} MARKETPLACE waypoints: {per_query:.1f} us per query")
+
+        origins = [(rng.randint(-40000, 40000), rng.randint(-40000, 40000)) for _ in range(args.queries)]
+        start = time.perf_counter()
+        for x, y in origins:
+            store.nearest_systems(x, y, limit=args.limit)
+        per_query = (time.perf_counter() - start) / len(origins) * 1e6
+        print(f"nearest {args.limit} systems: {per_query:.1f} us per query")
+
+        for system, x, y in queries[:200]:
+            markets = [(w.x, w.y) for w in store.waypoint_index(system).items() if "MARKETPLACE" in w.traits]
+            got = [round(d, 6) for d, _ in store.nearest_waypoints(system, x, y, limit=args.limit, trait="MARKETPLACE")]
+            assert got == [round(d, 6) for d in brute_force(markets, x, y, args.limit)]
+        all_systems = [(s["x"], s["y"]) for s in store.systems()]
+        for x, y in origins[:50]:
+            got = [round(d, 6) for d, _ in store.nearest_systems(x, y, limit=args.limit)]
+            assert got == [round(d, 6) for d in brute_force(all_systems, x, y, args.limit)]
+        print("results match brute force")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Time picking the best survey of a waypoint from the survey store against scanning a list.
+
+Fills `--waypoints` waypoints with `--surveys` surveys each, spread over the
+next `--lifetime` seconds of expirations (some already inside the expiry
+margin), then picks the best survey of a random waypoint `--picks` times,
+first at fixed prices, then with a price change every `--reprice` picks
+(which has the store re-rank the waypoints holding that good). The scan
+baseline keeps every survey in a list per waypoint and, like the mining loop
+did, drops expired ones and takes the max by value on each pick. Both must
+agree on the pick:
+
+    python -m benchmarks.bench_survey_store --waypoints 200 --surveys 500
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from backend.cooldown_scheduler import cooldown_deadline
+from backend.mock_galaxy import DEPOSIT_GOODS, TRADE_GOODS
+from backend.survey_store import SurveyStore
+
+def make_surveys(rng: random.Random, waypoints: int, per_waypoint: int, lifetime: float) -> list:
+    goods = sorted({good for deposit in DEPOSIT_GOODS.values() for good in deposit})
+    now = datetime.now(timezone.utc)
+    surveys = []
+    for w in range(waypoints):
+        for s in range(per_waypoint):
+            expiration = now + timedelta(seconds=rng.uniform(0, lifetime))
+            surveys.append({
+                "signature": f"W{w}-S{s}",
+                "symbol": f"X1-TEST-W{w}",
+                "deposits": [{"symbol": rng.choice(goods)} for _ in range(rng.randint(3, 7))],
+                "expiration": expiration.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+                "size": rng.choice(["SMALL", "MODERATE", "LARGE"]),
+            })
+    return surveys
+
+def run(args, pick, reprice: int) -> float:
+    rng = random.Random(2)
+    start = time.perf_counter()
+    for i in range(args.picks):
+        if reprice and i % reprice == 0:
+            symbol = rng.choice(sorted(TRADE_GOODS))
+            pick.set_price(symbol, TRADE_GOODS[symbol] * rng.uniform(0.7, 1.4))
+        pick.best(f"X1-TEST-W{rng.randrange(args.waypoints)}")
+    return time.perf_counter() - start
+
+class ScanPicker:
+    """Surveys in a plain list per waypoint; every pick filters and scans"""
+
+    def __init__(self, surveys: list, margin: float):
+        self.margin = margin
+        self.prices = {}
+        self.surveys = {}
+        for survey in surveys:
+            self.surveys.setdefault(survey["symbol"], []).append(survey)
+
+    def set_price(self, symbol: str, price: float) -> None:
+        self.prices[symbol] = price
+
+    def value(self, survey: dict) -> float:
+        deposits = survey["deposits"]
+        return sum(self.prices.get(deposit["symbol"], 1.0) for deposit in deposits) / len(deposits)
+
+    def best(self, waypoint_symbol: str):
+        held = self.surveys.get(waypoint_symbol, [])
+        cutoff = time.monotonic() + self.margin
+        held[:] = [survey for survey in held if cooldown_deadline({"expiration": survey["expiration"]}) > cutoff]
+        return max(held, key=self.value, default=None)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--waypoints", type=int, default=200)
+    parser.add_argument("--surveys", type=int, default=500, help="surveys per waypoint")
+    parser.add_argument("--picks", type=int, default=20000)
+    parser.add_argument("--reprice", type=int, default=100, help="picks between price changes")
+    parser.add_argument("--lifetime", type=float, default=3600, help="expirations spread over this many seconds")
+    parser.add_argument("--margin", type=float, default=30)
+    args = parser.parse_args()
+
+    surveys = make_surveys(random.Random(1), args.waypoints, args.surveys, args.lifetime)
+    store = SurveyStore(args.margin)
+    start = time.perf_counter()
+    store.add(surveys)
+    print(f"stored {len(store)} of {len(surveys)} surveys in {(time.perf_counter() - start) * 1000:.0f} ms")
+    scan = ScanPicker(surveys, args.margin)
+
+    # The two must pick surveys of the same value
+    rng = random.Random(3)
+    for _ in range(200):
+        waypoint = f"X1-TEST-W{rng.randrange(args.waypoints)}"
+        a, b = store.best(waypoint), scan.best(waypoint)
+        assert (a is None) == (b is None) and (a is None or abs(store.value(a) - scan.value(b)) < 1e-9), waypoint
+
+    for reprice in (0, args.reprice):
+        prices = f"a price change every {reprice} picks" if reprice else "fixed prices"
+        for name, pick in (("survey store", store), ("list scan", scan)):
+            elapsed = run(args, pick, reprice)
+            print(f"{name:<12} {args.picks} picks, {prices}: {elapsed * 1000:.0f} ms ({elapsed / args.picks * 1e6:.1f} us/pick)")
+    print(f"store: {store.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Time ranking trade routes over thousands of markets with recorded prices.
+
+Scatters `--markets` marketplaces over `--systems` systems, records a price
+for a random selection of `--goods` goods at each, then times
+`TradeRouteFinder.find` for the top `--limit` trades galaxy-wide and within
+the largest system, cold (building each system's market graph) and warm.
+A cold galaxy-wide query is then served as the API does, graphs built in a
+worker thread first, while a ticker task records the longest stretch the
+event loop went without running it.
+A nested-loop search over every (buy, sell, good) triple checks the top trade
+of a few small systems and shows what the vectorized matrix replaces:
+
+    python -m benchmarks.bench_trade_routes --markets 3000 --systems 3
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+
+from backend.galaxy_store import GalaxyStore
+from backend.market_history import MarketHistory
+from backend.mock_galaxy import TRADE_GOODS
+from backend.route_planner import FLIGHT_MODES, best_hops
+from backend.trade_routes import FUEL_PER_UNIT, TradeRouteFinder
+
+from .common import summarize
+
+def build(markets: int, systems: int, goods: int, seed: int):
+    rng = random.Random(seed)
+    symbols = list(TRADE_GOODS)[:goods] + [f"GOOD_{g}" for g in range(len(TRADE_GOODS), goods)]
+    base = {symbol: TRADE_GOODS.get(symbol, rng.randint(20, 400)) for symbol in symbols}
+    store, history = GalaxyStore(":memory:"), MarketHistory()
+    waypoints = []
+    for i in range(markets):
+        system = f"X1-T{i % systems}"
+        waypoints.append({"symbol": f"{system}-M{i}", "systemSymbol": system, "type": "PLANET",
+                          "x": rng.randint(-800, 800), "y": rng.randint(-800, 800),
+                          "traits": [{"symbol": "MARKETPLACE"}]})
+        traded = ["FUEL"] + rng.sample(symbols[1:], rng.randint(3, min(8, len(symbols) - 1)))
+        trade_goods = []
+        for symbol in traded:
+            price = max(1, round(base[symbol] * rng.uniform(0.6, 1.5)))
+            trade_goods.append({"symbol": symbol, "purchasePrice": price, "sellPrice": max(1, round(price * 0.92)),
+                                "tradeVolume": 20, "supply": "MODERATE"})
+        history.record({"symbol": waypoints[-1]["symbol"], "tradeGoods": trade_goods})
+    store.save_waypoints(waypoints)
+    return store, history, waypoints
+
+def reference_best(waypoints, history, units, speed, fuel_capacity):
+    """Most profitable trade by looping over every pair and good"""
+    modes = list(FLIGHT_MODES)
+    prices = {w["symbol"]: {good["symbol"]: good for good in history.latest(w["symbol"])} for w in waypoints}
+    best = None
+    for a in waypoints:
+        held = prices[a["symbol"]]
+        fuel_price = held["FUEL"]["purchasePrice"] / FUEL_PER_UNIT
+        for b in waypoints:
+            if a is b:
+                continue
+            distance = np.hypot(a["x"] - b["x"], a["y"] - b["y"])
+            seconds, _, fuel = best_hops(np.array([distance]), fuel_capacity, fuel_capacity, speed, modes)
+            if not np.isfinite(seconds[0]):
+                continue
+            for symbol, good in held.items():
+                other = prices[b["symbol"]].get(symbol)
+                if other is None:
+                    continue
+                profit = (other["sellPrice"] - good["purchasePrice"]) * units - fuel[0] * fuel_price
+                if best is None or profit > best:
+                    best = profit
+    return best if best is not None and best > 0 else None
+
+def timed(find, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        find()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+async def loop_stall(finder: TradeRouteFinder, systems, units: int, speed: int, fuel_capacity: int, limit: int):
+    """Longest gap (ms) between ticks of a task sharing the loop with a cold `prepare` and `find`, and the total (ms)"""
+    longest, done = 0.0, False
+
+    async def ticker():
+        nonlocal longest
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            longest, last = max(longest, now - last), now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await finder.prepare(systems, speed, fuel_capacity)
+    finder.find(systems, units, speed, fuel_capacity, limit)
+    total = time.perf_counter() - start
+    done = True
+    await task
+    return longest * 1000, total * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--markets", type=int, default=3000)
+    parser.add_argument("--systems", type=int, default=3)
+    parser.add_argument("--goods", type=int, default=15)
+    parser.add_argument("--units", type=int, default=40, help="cargo capacity")
+    parser.add_argument("--speed", type=int, default=30)
+    parser.add_argument("--fuel-capacity", type=int, default=400)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    # The nested loops only finish in reasonable time on small systems
+    small_store, small_history, small = build(240, 4, args.goods, args.seed)
+    small_finder = TradeRouteFinder(small_history, small_store)
+    for system in small_finder.systems():
+        waypoints = [w for w in small if w["systemSymbol"] == system]
+        routes = small_finder.find([system], args.units, args.speed, args.fuel_capacity, 1)
+        expected = reference_best(waypoints, small_history, args.units, args.speed, args.fuel_capacity)
+        assert (not routes and expected is None) or abs(routes[0]["profit"] - expected) <= 1, (system, routes, expected)
+    start = time.perf_counter()
+    reference_best(small[::4], small_history, args.units, args.speed, args.fuel_capacity)
+    print(f"nested loops, one {len(small) // 4}-market system: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    store, history, waypoints = build(args.markets, args.systems, args.goods, args.seed)
+    finder = TradeRouteFinder(history, store)
+    systems = finder.systems()
+    largest = max(systems, key=lambda system: sum(1 for w in waypoints if w["systemSymbol"] == system))
+    size = sum(1 for w in waypoints if w["systemSymbol"] == largest)
+    for label, scope in ((f"galaxy ({args.markets} markets, {len(systems)} systems)", systems),
+                         (f"largest system ({size} markets)", [largest])):
+        find = lambda: finder.find(scope, args.units, args.speed, args.fuel_capacity, args.limit)
+        start = time.perf_counter()
+        routes = find()
+        cold = (time.perf_counter() - start) * 1000
+        warm = timed(find, args.repeat)
+        print(f"{label}: cold {cold:.0f} ms, warm p50 {warm['p50']:.1f} ms p95 {warm['p95']:.1f} ms; "
+              f"best {routes[0]['good']} {routes[0]['buyMarket']} -> {routes[0]['sellMarket']} +{routes[0]['profit']}")
+
+    finder = TradeRouteFinder(history, store)
+    longest, total = asyncio.run(loop_stall(finder, systems, args.units, args.speed, args.fuel_capacity, args.limit))
+    print(f"galaxy, cold with graphs built off the loop: {total:.0f} ms, longest event loop stall {longest:.1f} ms")
+
+if __name__ == "__main__":
+    main()
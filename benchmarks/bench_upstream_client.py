@@ -0,0 +1,76 @@
+"""Compare per-request httpx clients against the shared pooled upstream client.
+
+Runs a local stub of the SpaceTraders API, points the backend at it and times
+`/api/ships` and `/api/agent` through the ASGI app in both modes:
+
+    python -m benchmarks.bench_upstream_client --requests 500
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from .common import configure_live_backend, free_port, run_server, summarize
+
+# `refresh` makes /api/ships read upstream instead of answering from the fleet store
+ROUTES = ["/api/ships?refresh=true", "/api/agent"]
+
+async def legacy_client():
+    """The old dependency: a brand-new client (and connection) per request"""
+    async with httpx.AsyncClient() as client:
+        yield client
+
+async def measure(app, route: str, requests: int, concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(route)
+                samples.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+        await client.get(route)  # Warm-up
+        await asyncio.gather(*(one() for _ in range(requests)))
+    return summarize(samples)
+
+async def run(requests: int, concurrency: int):
+    from backend.main import app
+    from backend.utilities import get_httpx_client
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        for mode in ("per-request", "pooled"):
+            if mode == "per-request":
+                app.dependency_overrides[get_httpx_client] = legacy_client
+            else:
+                app.dependency_overrides.clear()
+            for route in ROUTES:
+                results[(mode, route)] = await measure(app, route, requests, concurrency)
+
+    print(f"{'route':<24} {'mode':<12} {'p50 ms':>8} {'p99 ms':>8}")
+    for route in ROUTES:
+        for mode in ("per-request", "pooled"):
+            stats = results[(mode, route)]
+            print(f"{route:<24} {mode:<12} {stats['p50']:>8.2f} {stats['p99']:>8.2f}")
+        before, after = results[("per-request", route)], results[("pooled", route)]
+        print(f"{route:<24} {'gain':<12} {before['p50'] / after['p50']:>7.1f}x {before['p99'] / after['p99']:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    # Measure connection reuse, not response caching
+    os.environ.setdefault("CACHE_TTL_SHIPS", "0")
+    from .stub_upstream import create_stub_app
+    with run_server(create_stub_app(), free_port()) as url:
+        configure_live_backend(url)
+        asyncio.run(run(args.requests, args.concurrency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence
+
+import uvicorn
+
+def free_port() -> int:
+    """Ask the OS for an unused localhost TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def configure_live_backend(api_url: str) -> None:
+    """Point the backend at a stub upstream; must run before importing backend modules"""
+    os.environ["SPACETRADERS_TOKEN"] = "benchmark-token"
+    os.environ["SPACETRADERS_API_URL"] = api_url
+    # Benchmarks measure the backend itself, so lift the upstream rate limit
+    os.environ.setdefault("UPSTREAM_RATE_LIMIT_PER_SECOND", "1000000")
+    os.environ.setdefault("UPSTREAM_RATE_LIMIT_BURST", "1000000")
+
+@contextmanager
+def run_server(app, port: int):
+    """Serve an ASGI app with uvicorn on a background thread for the duration of the block"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean summary of latency samples in milliseconds"""
+    return {
+        "count": len(samples_ms),
+        "mean": sum(samples_ms) / len(samples_ms) if samples_ms else 0.0,
+        "p50": percentile(samples_ms, 50),
+        "p95": percentile(samples_ms, 95),
+        "p99": percentile(samples_ms, 99),
+    }
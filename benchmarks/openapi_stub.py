@@ -0,0 +1,335 @@
+"""Local SpaceTraders stand-in generated from `spacetraders_openapi.json`.
+
+Every path and method in the spec is served with a payload built from its
+success response schema, so the live code path (a real-looking token and
+`SPACETRADERS_API_URL` pointed here) can be exercised offline. Payloads are
+deterministic per request path (and page), paginated lists honour
+`page`/`limit` against a configurable total, and a path's own symbol (e.g.
+`shipSymbol`) is echoed into the payload. Latency, rate limiting (429s with
+the same headers as the real API) and error rates are configurable:
+
+    python -m benchmarks.openapi_stub --port 8001 --latency lognormal:0.15,0.5 --rate-limit 2 --burst 10 --error-rate 0.01
+    SPACETRADERS_TOKEN=stub SPACETRADERS_API_URL=http://127.0.0.1:8001 ./start.sh
+
+`--check` generates one payload per operation and validates it against the spec.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import string
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+SPEC_PATH = Path(__file__).resolve().parent.parent / "spacetraders_openapi.json"
+METHODS = ("get", "post", "put", "patch", "delete")
+MAX_DEPTH = 12
+
+Sampler = Callable[[random.Random], float]
+
+def parse_latency(spec: str) -> Sampler:
+    """Latency sampler from "0.1" (fixed), "uniform:LOW,HIGH" or "lognormal:MEDIAN,SIGMA" (seconds)"""
+    kind, _, args = spec.partition(":")
+    if not args:
+        fixed = float(kind)
+        return lambda rng: fixed
+    a, b = (float(value) for value in args.split(","))
+    if kind == "uniform":
+        return lambda rng: rng.uniform(a, b)
+    if kind == "lognormal":
+        mu = math.log(a)
+        return lambda rng: rng.lognormvariate(mu, b)
+    raise ValueError(f"Unknown latency distribution: {kind}")
+
+def load_spec(path: Path = SPEC_PATH) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def operations(spec: dict) -> Iterator[Tuple[str, str, str, Optional[dict]]]:
+    """(path, method, success status, response schema) for every operation in the spec"""
+    for path, item in spec["paths"].items():
+        for method in METHODS:
+            operation = item.get(method)
+            if operation is None:
+                continue
+            status = next((code for code in operation["responses"] if code.startswith("2")), "200")
+            content = operation["responses"].get(status, {}).get("content", {})
+            schema = content.get("application/json", {}).get("schema")
+            yield path, method, status, schema
+
+class PayloadGenerator:
+    """Builds values that satisfy a spec schema (the subset the SpaceTraders spec uses)"""
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def resolve(self, schema: dict) -> dict:
+        while "$ref" in schema:
+            node = self.spec
+            for part in schema["$ref"].lstrip("#/").split("/"):
+                node = node[part]
+            schema = node
+        return schema
+
+    def generate(self, schema: dict, rng: random.Random, hints: Dict[str, str], name: str = "", depth: int = 0):
+        schema = self.resolve(schema)
+        if "allOf" in schema:
+            parts = [self.generate(part, rng, hints, name, depth) for part in schema["allOf"]]
+            if not all(isinstance(part, dict) for part in parts):
+                # allOf wrapping a single non-object schema, e.g. a $ref to an enum
+                return parts[0]
+            return {key: value for part in parts for key, value in part.items()}
+        for key in ("oneOf", "anyOf"):
+            if key in schema:
+                return self.generate(schema[key][0], rng, hints, name, depth)
+        if "enum" in schema:
+            return rng.choice(schema["enum"])
+
+        kind = schema.get("type", "object" if "properties" in schema else "string")
+        if kind == "object":
+            if depth >= MAX_DEPTH:
+                return {}
+            return {
+                prop: self.generate(sub, rng, hints, prop, depth + 1)
+                for prop, sub in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            count = max(schema.get("minItems", 0), rng.randint(1, 3) if depth < MAX_DEPTH else 0)
+            return [self.generate(schema.get("items", {}), rng, hints, name, depth + 1) for _ in range(count)]
+        if kind == "integer":
+            low = schema.get("minimum", 0)
+            return rng.randint(low, schema.get("maximum", low + 1000))
+        if kind == "number":
+            low = schema.get("minimum", 0)
+            return round(rng.uniform(low, schema.get("maximum", low + 1000)), 3)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        return self._string(schema, rng, hints, name)
+
+    def _string(self, schema: dict, rng: random.Random, hints: Dict[str, str], name: str) -> str:
+        fmt = schema.get("format")
+        if fmt == "date-time":
+            moment = self.now + timedelta(seconds=rng.randint(-3600, 3600))
+            return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        if fmt == "uri":
+            return "https://spacetraders.io"
+        if name in hints:
+            value = hints[name]
+        elif name.lower().endswith("symbol") or name == "signature":
+            value = "X1-" + "".join(rng.choices(string.ascii_uppercase + string.digits, k=4))
+        else:
+            value = f"{name or 'value'}-{rng.randint(1, 9999)}"
+        if "pattern" in schema:
+            value = re.sub(r"[^a-zA-Z0-9_-]", "-", value)
+        value = value[:schema.get("maxLength", len(value))]
+        return value.ljust(schema.get("minLength", 0), "X")
+
+    def validate(self, schema: dict, value, where: str = "$") -> List[str]:
+        """Ways `value` breaks `schema`; empty when it conforms"""
+        schema = self.resolve(schema)
+        if "allOf" in schema:
+            return [error for part in schema["allOf"] for error in self.validate(part, value, where)]
+        for key in ("oneOf", "anyOf"):
+            if key in schema:
+                if any(not self.validate(option, value, where) for option in schema[key]):
+                    return []
+                return [f"{where}: matches none of {key}"]
+        if value is None and schema.get("nullable"):
+            return []
+        if "enum" in schema:
+            return [] if value in schema["enum"] else [f"{where}: {value!r} not in enum"]
+
+        kind = schema.get("type", "object" if "properties" in schema else None)
+        checks = {
+            "object": lambda v: isinstance(v, dict), "array": lambda v: isinstance(v, list),
+            "string": lambda v: isinstance(v, str), "boolean": lambda v: isinstance(v, bool),
+            "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+            "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+        }
+        if kind in checks and not checks[kind](value):
+            return [f"{where}: expected {kind}, got {type(value).__name__}"]
+        errors = []
+        if kind == "object":
+            errors += [f"{where}: missing {prop}" for prop in schema.get("required", []) if prop not in value]
+            for prop, sub in schema.get("properties", {}).items():
+                if prop in value:
+                    errors += self.validate(sub, value[prop], f"{where}.{prop}")
+        elif kind == "array":
+            if len(value) < schema.get("minItems", 0):
+                errors.append(f"{where}: fewer than {schema['minItems']} items")
+            for i, item in enumerate(value):
+                errors += self.validate(schema.get("items", {}), item, f"{where}[{i}]")
+        elif kind in ("integer", "number"):
+            if value < schema.get("minimum", -math.inf) or value > schema.get("maximum", math.inf):
+                errors.append(f"{where}: {value} out of range")
+        elif kind == "string":
+            if not schema.get("minLength", 0) <= len(value) <= schema.get("maxLength", math.inf):
+                errors.append(f"{where}: length {len(value)} out of range")
+            if "pattern" in schema and not re.search(schema["pattern"], value):
+                errors.append(f"{where}: {value!r} doesn't match {schema['pattern']}")
+        return errors
+
+def _error(status: int, message: str, code: int, data: Optional[dict] = None, headers: Optional[dict] = None) -> Response:
+    body = {"error": {"message": message, "code": code}}
+    if data:
+        body["error"]["data"] = data
+    return Response(json.dumps(body), status_code=status, media_type="application/json", headers=headers)
+
+def create_openapi_stub_app(
+    spec: Optional[dict] = None,
+    seed: int = 1,
+    latency: Sampler = lambda rng: 0.0,
+    rate_limit: float = 0.0,
+    burst: float = 10.0,
+    error_rate: float = 0.0,
+    list_total: int = 40,
+) -> FastAPI:
+    """Serve every operation in the spec; `rate_limit` 0 disables throttling.
+
+    `app.state` counts requests, throttled (429) and injected error responses.
+    """
+    spec = spec or load_spec()
+    generator = PayloadGenerator(spec)
+    faults = random.Random(seed)
+    app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+    app.state.request_count = 0
+    app.state.throttled = 0
+    app.state.errors = 0
+    bucket = {"tokens": burst, "at": time.monotonic()}
+
+    def throttle() -> Optional[Response]:
+        """Token bucket matching the real API's 429 body and x-ratelimit-* headers"""
+        if rate_limit <= 0:
+            return None
+        now = time.monotonic()
+        bucket["tokens"] = min(burst, bucket["tokens"] + (now - bucket["at"]) * rate_limit)
+        bucket["at"] = now
+        if bucket["tokens"] >= 1:
+            bucket["tokens"] -= 1
+            return None
+        retry_after = (1 - bucket["tokens"]) / rate_limit
+        reset = datetime.now(timezone.utc) + timedelta(seconds=retry_after)
+        headers = {
+            "retry-after": f"{retry_after:.3f}",
+            "x-ratelimit-type": "IP_ADDRESS",
+            "x-ratelimit-limit-per-second": str(rate_limit),
+            "x-ratelimit-limit-burst": str(burst),
+            "x-ratelimit-remaining": "0",
+            "x-ratelimit-reset": reset.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        }
+        data = {"type": "IP_ADDRESS", "retryAfter": retry_after, "limitBurst": burst,
+                "limitPerSecond": rate_limit, "remaining": 0, "reset": headers["x-ratelimit-reset"]}
+        return _error(429, "You have reached your API limit.", 429, data, headers)
+
+    @lru_cache(maxsize=4096)
+    def payload(template: str, method: str, path: str, page: int, limit: int) -> bytes:
+        """Encoded body for one request; cached since it only depends on the path and page"""
+        _, _, _, schema = routes[(template, method)]
+        params = dict(zip(re.findall(r"{(\w+)}", template), path_values(template, path)))
+        rng = random.Random(f"{seed}:{method}:{path}:{page}")
+        body = generator.generate(schema, rng, params)
+        data = body.get("data") if isinstance(body, dict) else None
+        data_schema = generator.resolve(generator.resolve(schema).get("properties", {}).get("data", {}))
+        if isinstance(data, dict) and params:
+            echo(data, data_schema, list(params.values())[-1])
+        if isinstance(body, dict) and isinstance(body.get("meta"), dict) and isinstance(data, list):
+            # A real page of `list_total` items: the right count, unique symbols
+            count = max(0, min(limit, list_total - (page - 1) * limit))
+            items_schema = data_schema["items"]
+            items = []
+            for i in range(count):
+                item = generator.generate(items_schema, rng, params)
+                if isinstance(item, dict):
+                    echo(item, generator.resolve(items_schema), f"STUB-{(page - 1) * limit + i + 1}")
+                items.append(item)
+            body["data"] = items
+            body["meta"] = {"total": list_total, "page": page, "limit": limit}
+        return json.dumps(body).encode()
+
+    def echo(item: dict, item_schema: dict, symbol: str) -> None:
+        """Use `symbol` as the item's own symbol where its schema allows (enum symbols don't)"""
+        symbol_schema = item_schema.get("properties", {}).get("symbol")
+        if "symbol" in item and symbol_schema is not None and not generator.validate(symbol_schema, symbol):
+            item["symbol"] = symbol
+
+    def path_values(template: str, path: str) -> List[str]:
+        pattern = "^" + re.sub(r"{\w+}", "([^/]+)", template) + "$"
+        match = re.match(pattern, path)
+        return list(match.groups()) if match else []
+
+    routes: Dict[Tuple[str, str], Tuple[str, str, str, Optional[dict]]] = {}
+
+    def make_handler(template: str, method: str, status: str):
+        async def handler(request: Request) -> Response:
+            app.state.request_count += 1
+            limited = throttle()
+            if limited is not None:
+                app.state.throttled += 1
+                return limited
+            await asyncio.sleep(latency(faults))
+            if error_rate and faults.random() < error_rate:
+                app.state.errors += 1
+                return _error(500, "Injected upstream error", 500)
+            if template.startswith("/my/") and not request.headers.get("authorization"):
+                return _error(401, "Missing or invalid Authorization header", 4100)
+            if routes[(template, method)][3] is None:
+                return Response(status_code=int(status))
+            page = int(request.query_params.get("page", 1))
+            limit = int(request.query_params.get("limit", 10))
+            body = payload(template, method, request.url.path, page, limit)
+            return Response(body, status_code=int(status), media_type="application/json")
+        return handler
+
+    for path, method, status, schema in operations(spec):
+        routes[(path, method)] = (path, method, status, schema)
+        app.add_api_route(path, make_handler(path, method, status), methods=[method.upper()], include_in_schema=False)
+    return app
+
+def check(spec: dict) -> int:
+    """Generate one payload per operation and report any that break their schema"""
+    generator = PayloadGenerator(spec)
+    failures = 0
+    for path, method, status, schema in operations(spec):
+        if schema is None:
+            continue
+        errors = generator.validate(schema, generator.generate(schema, random.Random(path), {}))
+        if errors:
+            failures += 1
+            print(f"{method.upper()} {path}: {errors[:3]}")
+    print(f"{sum(1 for _ in operations(spec))} operations checked, {failures} invalid")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--spec", type=Path, default=SPEC_PATH)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency", default="0", help='"0.1", "uniform:0.05,0.2" or "lognormal:0.15,0.5" (seconds)')
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests per second before 429s (0 = unlimited)")
+    parser.add_argument("--burst", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 500")
+    parser.add_argument("--list-total", type=int, default=40, help="items reported by paginated lists")
+    parser.add_argument("--check", action="store_true", help="validate generated payloads against the spec and exit")
+    args = parser.parse_args()
+
+    spec = load_spec(args.spec)
+    if args.check:
+        raise SystemExit(1 if check(spec) else 0)
+    app = create_openapi_stub_app(
+        spec, seed=args.seed, latency=parse_latency(args.latency), rate_limit=args.rate_limit,
+        burst=args.burst, error_rate=args.error_rate, list_total=args.list_total,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
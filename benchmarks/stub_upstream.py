@@ -0,0 +1,71 @@
+import asyncio
+import copy
+
+from fastapi import FastAPI, HTTPException
+
+from backend.mock_data import MOCK_AGENT, MOCK_SHIPS
+
+def create_stub_app(fleet_size: int = 10, latency: float = 0.0) -> FastAPI:
+    """Minimal stand-in for api.spacetraders.io serving the agent and fleet endpoints.
+
+    Fleet reads and ship commands (dock, orbit, navigate) wait `latency`
+    seconds to mimic the round trip to the real API.
+    """
+    app = FastAPI()
+    app.state.request_count = 0
+
+    @app.middleware("http")
+    async def count_requests(request, call_next):
+        app.state.request_count += 1
+        return await call_next(request)
+
+    template = MOCK_SHIPS[0]
+    ships = [dict(copy.deepcopy(template), symbol=f"STUB_SHIP_{i}") for i in range(fleet_size)]
+    by_symbol = {ship["symbol"]: ship for ship in ships}
+
+    def find_ship(ship_symbol: str) -> dict:
+        if ship_symbol not in by_symbol:
+            raise HTTPException(status_code=404, detail="Ship not found")
+        return by_symbol[ship_symbol]
+
+    @app.get("/")
+    async def status():
+        return {"status": "SpaceTraders is currently online and available to play"}
+
+    @app.get("/my/agent")
+    async def agent():
+        return {"data": MOCK_AGENT}
+
+    @app.get("/my/ships")
+    async def ships_list(page: int = 1, limit: int = 20):
+        await asyncio.sleep(latency)
+        start = (page - 1) * limit
+        return {"data": ships[start:start + limit], "meta": {"total": len(ships), "page": page, "limit": limit}}
+
+    @app.get("/my/ships/{ship_symbol}")
+    async def ship_detail(ship_symbol: str):
+        return {"data": find_ship(ship_symbol)}
+
+    @app.post("/my/ships/{ship_symbol}/dock")
+    async def dock(ship_symbol: str):
+        await asyncio.sleep(latency)
+        ship = find_ship(ship_symbol)
+        ship["nav"]["status"] = "DOCKED"
+        return {"data": {"nav": ship["nav"]}}
+
+    @app.post("/my/ships/{ship_symbol}/orbit")
+    async def orbit(ship_symbol: str):
+        await asyncio.sleep(latency)
+        ship = find_ship(ship_symbol)
+        ship["nav"]["status"] = "IN_ORBIT"
+        return {"data": {"nav": ship["nav"]}}
+
+    @app.post("/my/ships/{ship_symbol}/navigate")
+    async def navigate(ship_symbol: str, payload: dict):
+        await asyncio.sleep(latency)
+        ship = find_ship(ship_symbol)
+        ship["nav"]["status"] = "IN_TRANSIT"
+        ship["nav"]["waypointSymbol"] = payload["waypointSymbol"]
+        return {"data": {"nav": ship["nav"], "fuel": ship["fuel"]}}
+
+    return app
@@ -18,6 +18,26 @@ const Map = ({ selectedShip, onShipUpdate }) => {
   
   const svgRef = useRef(null);
   const containerRef = useRef(null);
+  const selectedShipRef = useRef(selectedShip);
+  const onShipUpdateRef = useRef(onShipUpdate);
+
+  useEffect(() => {
+    selectedShipRef.current = selectedShip;
+    onShipUpdateRef.current = onShipUpdate;
+  }, [selectedShip, onShipUpdate]);
+
+  // The backend pushes ship changes after every action, so nothing here refetches the fleet
+  useEffect(() => {
+    const source = new EventSource('/api/ships/stream');
+    source.addEventListener('ship', (event) => {
+      const { symbol, changes } = JSON.parse(event.data);
+      const ship = selectedShipRef.current;
+      if (ship && ship.symbol === symbol && onShipUpdateRef.current) {
+        onShipUpdateRef.current({ ...ship, ...changes });
+      }
+    });
+    return () => source.close();
+  }, []);
 
   const fetchSystemData = useCallback(async () => {
     if (!selectedShip?.nav?.systemSymbol) return;
@@ -81,14 +101,6 @@ const Map = ({ selectedShip, onShipUpdate }) => {
       await axios.post(`/api/ships/${selectedShip.symbol}/navigate`, {
         waypointSymbol: waypoint.symbol
       });
-      
-      if (onShipUpdate) {
-        // Fetch updated ship data
-        const shipResponse = await axios.get('/api/ships');
-        const updatedShip = shipResponse.data.find(ship => ship.symbol === selectedShip.symbol);
-        onShipUpdate(updatedShip);
-      }
-      
     } catch (err) {
       alert(err.response?.data?.detail || 'Navigation failed');
     } finally {
@@ -102,12 +114,6 @@ const Map = ({ selectedShip, onShipUpdate }) => {
     try {
       setNavigating(true);
       await axios.post(`/api/ships/${selectedShip.symbol}/dock`);
-      
-      if (onShipUpdate) {
-        const shipResponse = await axios.get('/api/ships');
-        const updatedShip = shipResponse.data.find(ship => ship.symbol === selectedShip.symbol);
-        onShipUpdate(updatedShip);
-      }
     } catch (err) {
       alert(err.response?.data?.detail || 'Dock failed');
     } finally {
@@ -121,12 +127,6 @@ const Map = ({ selectedShip, onShipUpdate }) => {
     try {
       setNavigating(true);
       await axios.post(`/api/ships/${selectedShip.symbol}/orbit`);
-      
-      if (onShipUpdate) {
-        const shipResponse = await axios.get('/api/ships');
-        const updatedShip = shipResponse.data.find(ship => ship.symbol === selectedShip.symbol);
-        onShipUpdate(updatedShip);
-      }
     } catch (err) {
       alert(err.response?.data?.detail || 'Orbit failed');
     } finally {
@@ -5,12 +5,14 @@ import sys
 import asyncio
 import httpx
 
-# Add the backend directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+# Add the repository root to the path so the backend package imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Import the main app and endpoints
-from main import app, navigate_ship, create_survey, HAS_VALID_TOKEN, SPACETRADERS_TOKEN
-from main import NavigateRequest, MOCK_SHIPS
+# Import the endpoints from the routers that define them
+from backend.config import HAS_VALID_TOKEN, SPACETRADERS_TOKEN
+from backend.models import NavigateRequest
+from backend.routers.ships import navigate_ship
+from backend.routers.scanning import create_survey
 
 async def test_navigate_endpoint():
     """Test the navigate endpoint with mock data"""
@@ -24,6 +26,9 @@ async def test_navigate_endpoint():
     try:
         async with httpx.AsyncClient() as client:
             result = await navigate_ship("DEMO_SHIP_1", request, client)
+            nav = result["data"]["nav"]
+            assert nav["waypointSymbol"] == "X1-DF55-20250Y", nav
+            assert nav["status"] == "IN_TRANSIT", nav
             print("Navigate endpoint SUCCESS:")
             print(f"Result: {result}")
             return True
@@ -38,6 +43,7 @@ async def test_survey_endpoint():
     try:
         async with httpx.AsyncClient() as client:
             result = await create_survey("DEMO_SHIP_1", client)
+            assert result["data"]["surveys"], result
             print("Survey endpoint SUCCESS:")
             print(f"Result: {result}")
             return True